@@ -1,12 +1,25 @@
 """FastAPI backend: /query, /health, /metrics, document updates, ingest, and optional frontend serving."""
 
+import asyncio
+import functools
+import hashlib
+import mimetypes
+import multiprocessing
 import os
+import re
 import secrets
+import threading
 import time
 import uuid
-from contextlib import asynccontextmanager
+from collections.abc import Awaitable, Callable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from email.utils import formatdate
 from pathlib import Path
+from types import MappingProxyType
+from typing import Annotated, Any, BinaryIO
 
+import langsmith as ls
 from dotenv import load_dotenv
 from fastapi import (
     APIRouter,
@@ -17,27 +30,53 @@ from fastapi import (
     Form,
     HTTPException,
     Request,
+    Response,
     UploadFile,
 )
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import (
     FileResponse,
     HTMLResponse,
-    JSONResponse,
     PlainTextResponse,
 )
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
-
+from pydantic import BaseModel, Field
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.middleware.gzip import DEFAULT_EXCLUDED_CONTENT_TYPES
+
+import build_document_sources
+import document_updates
+from api.query_cache import QueryCache
 from api.rate_limit import enforce_rate_limit, env_float, env_int
+from graph.i18n import detect_language, get_label_sources_incl_web
+from graph.llm_factory import (
+    ALLOWED_PROVIDERS,
+    APIKeyError,
+    get_cached_llm,
+    get_embedding_provider,
+    get_embeddings,
+)
 
 load_dotenv()
 
+_LLM_KEY_ENV_VARS = ("MISTRAL_API_KEY", "GOOGLE_API_KEY", "OPENAI_API_KEY")
+
+
+def _server_has_llm_key() -> bool:
+    return any((os.getenv(name) or "").strip() for name in _LLM_KEY_ENV_VARS)
+
+
 app_state: dict = {
     "graph": None,
     "ingest_status": "idle",
     "started_at": time.time(),
     "rate_limit_store": {},
+    # mtime of _INDEX_GENERATION_PATH when this process last synced its caches
+    "index_generation": None,
+    # Env does not change while the process runs; refreshed in lifespan
+    "server_has_llm_key": _server_has_llm_key(),
     "request_metrics": {
         "total": 0,
         "errors": 0,
@@ -53,16 +92,36 @@ _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 _FRONTEND_DIST = _PROJECT_ROOT / "frontend" / "dist"
 
 
+def _testing() -> bool:
+    return os.getenv("TESTING", "").lower() in ("true", "1")
+
+
+def _load_graph():
+    from graph.graph import app as graph_app
+
+    return graph_app
+
+
+# Import the graph (and its heavy dependencies) at module load: with gunicorn's
+# preload_app this happens once in the master and is shared copy-on-write by all
+# workers. Vector store clients are still created lazily per worker process.
+_preloaded_graph = None if _testing() else _load_graph()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Load graph on startup (skipped when TESTING=true)."""
+    """Attach graph on startup (skipped when TESTING=true)."""
     app_state["started_at"] = time.time()
-    if os.getenv("TESTING", "").lower() not in ("true", "1"):
-        from graph.graph import app as graph_app
-
-        app_state["graph"] = graph_app
+    app_state["server_has_llm_key"] = _server_has_llm_key()
+    # Semaphores bind to the running loop; recreate them for this server's loop
+    app_state.pop("llm_semaphores", None)
+    app_state["index_generation"] = _read_index_generation()
+    if not _testing():
+        app_state["graph"] = _preloaded_graph or _load_graph()
     yield
     app_state["graph"] = None
+    if _ingest_pool is not None:
+        _ingest_pool.shutdown(wait=False, cancel_futures=True)
 
 
 app = FastAPI(
@@ -81,6 +140,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Compress JSON answers and frontend bundles for clients sending Accept-Encoding: gzip.
+# PDFs are already compressed internally: gzipping them burns CPU on up to 50 MB per
+# download for almost no gain and turns off Content-Length/Range support.
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=1000,
+    compresslevel=5,
+    exclude_content_types=(*DEFAULT_EXCLUDED_CONTENT_TYPES, "application/pdf"),
+)
 
 
 @app.middleware("http")
@@ -129,15 +197,27 @@ async def request_observability_middleware(request: Request, call_next):
             response.headers[_REQUEST_ID_HEADER] = request_id
 
 
-class QueryRequest(BaseModel):
-    """Request body for /query."""
+# Input limits (security / DoS prevention), enforced by pydantic-core while parsing
+_MAX_QUESTION_LEN = 10_000
+_MAX_CHAT_HISTORY_LEN = 20
+_MAX_CHAT_MESSAGE_LEN = 20_000
+_MAX_API_KEY_LEN = 256
 
-    question: str
-    chat_history: list[list[str]] | None = None  # [[q,a],[q,a],...] for follow-ups
+
+class QueryRequest(BaseModel):
+    """Request body for /query. Oversized fields are rejected with 422."""
+
+    question: Annotated[str, Field(max_length=_MAX_QUESTION_LEN)]
+    # [[q,a],[q,a],...] for follow-ups
+    chat_history: Annotated[
+        list[list[Annotated[str, Field(max_length=_MAX_CHAT_MESSAGE_LEN)]]] | None,
+        Field(max_length=_MAX_CHAT_HISTORY_LEN),
+    ] = None
     model: str | None = None  # "mistral" | "gemini" | "openai"
     model_variant: str | None = None  # e.g. "gemini-2.5-flash-lite", "gpt-4o-mini"
-    api_keys: dict[str, str] | None = (
-        None  # {"mistral": "...", "gemini": "...", "openai": "..."}
+    # {"mistral": "...", "gemini": "...", "openai": "..."}
+    api_keys: dict[str, Annotated[str, Field(max_length=_MAX_API_KEY_LEN)]] | None = (
+        None
     )
 
 
@@ -153,7 +233,11 @@ class QueryResponse(BaseModel):
 
     answer: str
     sources: list[SourceInfo]
-    chat_history: list[list[str]]  # [[q,a],[q,a],...] including new turn
+    new_turn: list[str] = (
+        []
+    )  # [question, answer] of this turn; clients append it locally
+    # Deprecated: full [[q,a],...] history incl. new turn, only with ?include_history=true
+    chat_history: list[list[str]] = []
     warning: str | None = (
         None  # When web search or retrieval didn't help (in question's language)
     )
@@ -229,22 +313,103 @@ def require_admin(request: Request) -> None:
         )
 
 
-def _run_ingest() -> None:
-    """Run ingestion and clear retriever cache. Updates app_state ingest_status."""
-    app_state["ingest_status"] = "running"
+_ingest_lock = threading.Lock()
+
+
+def _claim_ingest() -> bool:
+    """Atomically mark ingestion as running; False if it already is."""
+    with _ingest_lock:
+        if app_state["ingest_status"] == "running":
+            return False
+        app_state["ingest_status"] = "running"
+        return True
+
+
+def _invalidate_query_cache() -> None:
+    """Drop cached /query answers after the collection changed."""
+    cache = app_state.get("query_cache")
+    if cache is not None:
+        cache.clear()
+
+
+# Ingestion in one worker process must reach the caches of all others: every change
+# to the collection rewrites this stamp, and each process compares its mtime per query.
+_INDEX_GENERATION_PATH = _PROJECT_ROOT / ".chroma" / "index_generation"
+
+
+def _read_index_generation() -> int | None:
+    try:
+        return _INDEX_GENERATION_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _bump_index_generation() -> None:
+    """Stamp a collection change so other processes drop their caches on their next query."""
+    try:
+        _INDEX_GENERATION_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _INDEX_GENERATION_PATH.write_text(str(time.time_ns()), encoding="utf-8")
+    except OSError:
+        return
+    app_state["index_generation"] = _read_index_generation()
+
+
+def _sync_index_generation() -> None:
+    """Clear this process's retriever and answer caches if another process changed the collection."""
+    generation = _read_index_generation()
+    if generation == app_state.get("index_generation"):
+        return
+    app_state["index_generation"] = generation
+    import ingestion
+
+    ingestion.clear_retrievers_cache()
+    _invalidate_query_cache()
+
+
+_ingest_pool: ProcessPoolExecutor | None = None
+
+
+def _ingest_executor() -> ProcessPoolExecutor:
+    """Single-worker process pool for ingestion, created on first use.
+
+    A separate process keeps CPU-heavy PDF parsing off the GIL that serves requests,
+    lets ingestion install its SIGINT handler (only allowed in a main thread), and a
+    crash there cannot take down the API. "spawn" avoids forking a threaded server;
+    one task per child returns docling's memory to the OS after each run.
+    """
+    global _ingest_pool
+    if _ingest_pool is None:
+        _ingest_pool = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=1,
+        )
+    return _ingest_pool
+
+
+async def _run_ingest() -> None:
+    """Run ingestion in the worker process, then clear the retriever and answer caches here and stamp the change for other processes."""
     try:
         import ingestion
 
-        ingestion.ingest()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_ingest_executor(), ingestion.ingest)
         ingestion.clear_retrievers_cache()
+        _invalidate_query_cache()
+        _bump_index_generation()
     finally:
         app_state["ingest_status"] = "idle"
 
 
-@api_router.get("/health")
-def health() -> dict:
-    """Health check."""
-    return {"status": "ok", "graph_loaded": app_state["graph"] is not None}
+@api_router.get("/health", response_model=None)
+def health(request: Request, response: Response) -> dict | Response:
+    """Health check. Frequent pollers can revalidate with If-None-Match and get a 304."""
+    graph_loaded = app_state["graph"] is not None
+    headers = {"ETag": '"1"' if graph_loaded else '"0"', "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return {"status": "ok", "graph_loaded": graph_loaded}
 
 
 @api_router.get("/metrics", response_class=PlainTextResponse)
@@ -331,23 +496,16 @@ def metrics() -> str:
 
 
 @api_router.get("/config")
-def config():
+def config() -> dict:
     """Return client-relevant config; e.g. whether server has LLM keys so the client can hide the API-key hint."""
-    server_has_llm_key = bool(
-        (os.getenv("MISTRAL_API_KEY") or "").strip()
-        or (os.getenv("GOOGLE_API_KEY") or "").strip()
-        or (os.getenv("OPENAI_API_KEY") or "").strip()
-    )
-    return {"server_has_llm_key": server_has_llm_key}
+    return {"server_has_llm_key": app_state["server_has_llm_key"]}
 
 
 @api_router.get("/documents/check-updates")
-def documents_check_updates():
+def documents_check_updates() -> dict:
     """Return list of registered sources with current/remote version and update availability."""
     try:
-        from document_updates import check_updates
-
-        sources = check_updates()
+        sources = document_updates.check_updates()
         return {"sources": sources, "recent_iaea": []}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -356,72 +514,64 @@ def documents_check_updates():
 @api_router.patch("/documents/source/{source_id}/url")
 def documents_set_source_url(
     source_id: str, body: SetSourceUrlBody, _admin: None = Depends(require_admin)
-):
+) -> dict:
     """Set or update a document source URL manually. URL must be from retsinformation.dk, sst.dk, or iaea.org."""
     url = (body.url or "").strip()
     if not url:
         raise HTTPException(status_code=400, detail="url is required")
-    try:
-        from document_updates import (
-            _allowed_url,
-            load_registry_raw,
-            update_registry_url,
-        )
-    except ImportError:
-        raise HTTPException(
-            status_code=500, detail="document_updates not available"
-        ) from None
-    if not _allowed_url(url):
+    if not document_updates._allowed_url(url):
         raise HTTPException(
             status_code=400,
             detail="URL must be from retsinformation.dk, sst.dk, or iaea.org.",
         )
-    raw = load_registry_raw()
+    raw = document_updates.load_registry_raw()
     if not any((s.get("id") or "").strip() == source_id.strip() for s in raw):
         raise HTTPException(status_code=404, detail=f"Source '{source_id}' not found")
-    update_registry_url(source_id, url)
+    document_updates.update_registry_url(source_id, url)
     return {"ok": True, "message": "URL updated."}
 
 
 @api_router.get("/documents/source/{source_id}/file")
 def documents_get_source_file(source_id: str):
     """Serve the local PDF for a document source. Returns 404 if source not found or no local file."""
-    try:
-        from document_updates import _load_registry, get_local_pdf_path
-    except ImportError:
-        raise HTTPException(
-            status_code=500, detail="document_updates not available"
-        ) from None
-    registry = _load_registry()
+    registry = document_updates._load_registry()
     source = next(
         (s for s in registry if (s.id or "").strip() == source_id.strip()), None
     )
     if not source:
         raise HTTPException(status_code=404, detail=f"Source '{source_id}' not found")
-    path = get_local_pdf_path(source)
-    if not path or not path.exists():
+    path = document_updates.get_local_pdf_path(source)
+    try:
+        # One stat serves both the existence check and FileResponse's headers
+        stat_result = path.stat() if path else None
+    except OSError:
+        stat_result = None
+    if path is None or stat_result is None:
         raise HTTPException(status_code=404, detail="No local file for this source")
-    return FileResponse(path, media_type="application/pdf", filename=path.name)
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=path.name,
+        stat_result=stat_result,
+    )
 
 
 @api_router.post("/documents/source/{source_id}/lookup-url")
-def documents_lookup_source_url(source_id: str, _admin: None = Depends(require_admin)):
+def documents_lookup_source_url(
+    source_id: str, _admin: None = Depends(require_admin)
+) -> dict:
     """Try to find the document URL (Danish: sst.dk or retsinformation.dk via Brave/probe; IAEA: search). If found, update registry and return URL."""
-    try:
-        from document_updates import lookup_source_url, update_registry_url
-    except ImportError:
-        raise HTTPException(
-            status_code=500, detail="document_updates not available"
-        ) from None
-    url, error = lookup_source_url(source_id)
+    url, error = document_updates.lookup_source_url(source_id)
     if not url:
         raise HTTPException(status_code=404, detail=error or "URL not found")
-    update_registry_url(source_id, url)
+    document_updates.update_registry_url(source_id, url)
     return {"url": url, "updated": True}
 
 
 @api_router.post("/documents/source/{source_id}/download-update")
-def documents_download_update(source_id: str, _admin: None = Depends(require_admin)):
+def documents_download_update(
+    source_id: str, _admin: None = Depends(require_admin)
+) -> dict:
     """Download the new version for this source and backup the old one. Requires update_available."""
     try:
         import ingestion
@@ -437,37 +587,29 @@ def documents_download_update(source_id: str, _admin: None = Depends(require_adm
 @api_router.post("/documents/sync-danish")
 def documents_sync_danish(
     apply_updates: bool = False, _admin: None = Depends(require_admin)
-):
+) -> dict:
     """Run incremental Danish legislation sync via Harvest + ELI graph."""
     try:
-        from document_updates import sync_danish_legislation
-    except ImportError:
-        raise HTTPException(
-            status_code=500, detail="document_updates not available"
-        ) from None
-    try:
-        report = sync_danish_legislation(apply_updates=apply_updates)
+        report: dict = document_updates.sync_danish_legislation(
+            apply_updates=apply_updates
+        )
         return report
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
 @api_router.post("/documents/build-from-local")
-def documents_build_from_local(_admin: None = Depends(require_admin)):
+def documents_build_from_local(_admin: None = Depends(require_admin)) -> dict:
     """Discover local PDFs, extract versions, optionally confirm URLs, write document_sources.yaml. Returns new sources list."""
     try:
-        from build_document_sources import build_sources, write_document_sources_yaml
-
-        sources = build_sources(confirm_urls=True)
+        sources = build_document_sources.build_sources(confirm_urls=True)
         if not sources:
             return {
                 "sources": [],
                 "message": "No documents discovered in documents/IAEA, IAEA_other, or Bekendtgørelse.",
             }
-        write_document_sources_yaml(sources)
-        from document_updates import check_updates
-
-        updated = check_updates()
+        build_document_sources.write_document_sources_yaml(sources)
+        updated = document_updates.check_updates()
         return {
             "sources": updated,
             "message": f"Wrote {len(sources)} source(s) to document_sources.yaml.",
@@ -478,6 +620,75 @@ def documents_build_from_local(_admin: None = Depends(require_admin)):
 
 _MAX_PDF_UPLOAD_BYTES = 50 * 1024 * 1024  # 50 MB
 _ALLOWED_ADD_PDF_FOLDERS = frozenset({"IAEA", "IAEA_other"})
+_UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Keep letters/digits (incl. æøå etc.) and "._- "; \w is str.isalnum() plus "_"
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w. -]+")
+
+
+def _save_pdf_upload(src: BinaryIO, dest: Path) -> None:
+    """Copy an upload to dest in chunks, enforcing the size cap and PDF magic bytes.
+
+    Writes to a .part file first so a rejected upload never replaces an existing PDF.
+    Raises ValueError for uploads that are too large or not a PDF.
+    """
+    part = dest.with_name(dest.name + ".part")
+    total = 0
+    try:
+        with part.open("wb") as out:
+            while chunk := src.read(_UPLOAD_CHUNK_BYTES):
+                if total == 0 and not chunk.startswith(b"%PDF-"):
+                    raise ValueError("File is not a PDF.")
+                total += len(chunk)
+                if total > _MAX_PDF_UPLOAD_BYTES:
+                    raise ValueError(
+                        f"PDF must be at most {_MAX_PDF_UPLOAD_BYTES // (1024*1024)} MB."
+                    )
+                out.write(chunk)
+        if total == 0:
+            raise ValueError("File is not a PDF.")
+        part.replace(dest)
+    finally:
+        part.unlink(missing_ok=True)
+
+
+def _ingest_uploaded_pdf(dest: Path, folder: str, safe_name: str) -> dict:
+    """Extract metadata, register the source and add a saved upload to the collection (blocking)."""
+    import ingestion
+
+    title, version = build_document_sources._extract_pdf_title_and_version(dest)
+    display_name = (title or safe_name).strip() or safe_name
+    search_terms = build_document_sources._extract_iaea_search_terms(Path(dest))
+    url = document_updates._lookup_iaea_publication_url_multi(search_terms)
+    source_id = (
+        f"iaea-{build_document_sources._slug(display_name)}"
+        if folder == "IAEA"
+        else f"iaea-other-{build_document_sources._slug(display_name)}"
+    )
+    document_updates.append_source_to_registry(
+        source_id=source_id,
+        name=display_name,
+        url=url,
+        folder=folder,
+        filename_hint=safe_name,
+        version=version,
+    )
+    chunks = ingestion.add_single_pdf_to_collection(
+        dest, folder=folder, source_label=display_name
+    )
+    ingestion.clear_retrievers_cache()
+    _invalidate_query_cache()
+    _bump_index_generation()
+    msg = f"Added PDF to collection ({chunks} chunks)."
+    if url:
+        msg += f" URL: {url}"
+    else:
+        msg += " No publication URL found (try Build list from local PDFs to refresh)."
+    return {
+        "message": msg,
+        "chunks_added": chunks,
+        "url_found": bool(url),
+        "url": url or None,
+    }
 
 
 @api_router.post("/documents/add-pdf")
@@ -485,7 +696,7 @@ async def documents_add_pdf(
     file: UploadFile = File(...),  # noqa: B008
     folder: str = Form("IAEA_other"),
     _admin: None = Depends(require_admin),
-):
+) -> dict:
     """Upload a PDF from retsinformation.dk or IAEA: add to collection, extract title/version, look up URL, append to registry."""
     if folder not in _ALLOWED_ADD_PDF_FOLDERS:
         raise HTTPException(
@@ -494,94 +705,44 @@ async def documents_add_pdf(
         )
     if not (file.filename and file.filename.lower().endswith(".pdf")):
         raise HTTPException(status_code=400, detail="Please upload a PDF file.")
-    content = await file.read()
-    if len(content) > _MAX_PDF_UPLOAD_BYTES:
-        raise HTTPException(
-            status_code=400,
-            detail=f"PDF must be at most {_MAX_PDF_UPLOAD_BYTES // (1024*1024)} MB.",
-        )
-    safe_name = (
-        "".join(c for c in file.filename if c.isalnum() or c in "._- ").strip()
-        or "uploaded.pdf"
-    )
+    safe_name = _UNSAFE_FILENAME_RE.sub("", file.filename).strip() or "uploaded.pdf"
     if not safe_name.lower().endswith(".pdf"):
         safe_name += ".pdf"
     docs_dir = _PROJECT_ROOT / "documents" / folder
     docs_dir.mkdir(parents=True, exist_ok=True)
     dest = docs_dir / safe_name
     try:
-        dest.write_bytes(content)
+        # Stream from Starlette's spooled temp file instead of holding the whole PDF in memory
+        await asyncio.to_thread(_save_pdf_upload, file.file, dest)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except OSError as e:
         raise HTTPException(status_code=500, detail=f"Could not save file: {e}") from e
     try:
-        import ingestion
-        from build_document_sources import (
-            _extract_iaea_search_terms,
-            _extract_pdf_title_and_version,
-            _slug,
-        )
-        from document_updates import (
-            _lookup_iaea_publication_url_multi,
-            append_source_to_registry,
-        )
-
-        title, version = _extract_pdf_title_and_version(dest)
-        display_name = (title or safe_name).strip() or safe_name
-        search_terms = _extract_iaea_search_terms(Path(dest))
-        url = _lookup_iaea_publication_url_multi(search_terms)
-        source_id = (
-            f"iaea-{_slug(display_name)}"
-            if folder == "IAEA"
-            else f"iaea-other-{_slug(display_name)}"
-        )
-        append_source_to_registry(
-            source_id=source_id,
-            name=display_name,
-            url=url,
-            folder=folder,
-            filename_hint=safe_name,
-            version=version,
-        )
-        chunks = ingestion.add_single_pdf_to_collection(
-            dest, folder=folder, source_label=display_name
-        )
-        ingestion.clear_retrievers_cache()
-        msg = f"Added PDF to collection ({chunks} chunks)."
-        if url:
-            msg += f" URL: {url}"
-        else:
-            msg += (
-                " No publication URL found (try Build list from local PDFs to refresh)."
-            )
-        return {
-            "message": msg,
-            "chunks_added": chunks,
-            "url_found": bool(url),
-            "url": url or None,
-        }
+        # PDF parsing, IAEA lookups and embedding block for seconds: keep them off the event loop
+        return await asyncio.to_thread(_ingest_uploaded_pdf, dest, folder, safe_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
-@api_router.post("/ingest")
+@api_router.post("/ingest", status_code=202)
 def ingest_trigger(
     background_tasks: BackgroundTasks, _admin: None = Depends(require_admin)
-):
+) -> dict:
     """Start ingestion in the background. Returns immediately."""
-    if app_state["ingest_status"] == "running":
+    # Claimed here, not in the task: two triggers could both pass a plain check
+    # before the first background task starts.
+    if not _claim_ingest():
         raise HTTPException(status_code=409, detail="Ingestion already running.")
     background_tasks.add_task(_run_ingest)
-    return JSONResponse(
-        status_code=202,
-        content={
-            "status": "accepted",
-            "message": "Ingestion started; this may take several minutes.",
-        },
-    )
+    return {
+        "status": "accepted",
+        "message": "Ingestion started; this may take several minutes.",
+    }
 
 
 @api_router.get("/ingest/status")
-def ingest_status():
+def ingest_status() -> dict:
     """Return current ingestion status: idle or running."""
     return {"status": app_state["ingest_status"]}
 
@@ -598,10 +759,10 @@ def _to_lists(history: list[tuple[str, str]]) -> list[list[str]]:
     return [[q, a] for q, a in history]
 
 
-# Input limits (security / DoS prevention)
-_MAX_QUESTION_LEN = 10_000
-_MAX_CHAT_HISTORY_LEN = 20
-_MAX_API_KEY_LEN = 256
+# Citations shown per answer (UX cap: documents are ranked, nobody reads 50 sources)
+_MAX_SOURCES = 10
+# Shared read-only fallback for documents without metadata (no per-document dict)
+_EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
 
 # Phrases that do not require RAG retrieval (cost savings, no DB/LLM calls)
 _NON_QUESTION_PATTERNS = frozenset(
@@ -624,39 +785,22 @@ _NON_QUESTION_PATTERNS = frozenset(
         "got it",
     }
 )
+# Exact phrases are a frozenset hash lookup; the letter/digit check is one C-level scan
+_HAS_ALNUM = re.compile(r"[^\W_]").search
 
 
 def _is_non_question(text: str) -> bool:
     """Return True if the input looks like a greeting/acknowledgment, not a real question."""
     t = text.strip().lower()
-    if len(t) < 3:
-        return True
-    if t in _NON_QUESTION_PATTERNS:
-        return True
-    if not any(c.isalnum() for c in t):
+    if len(t) < 3 or t in _NON_QUESTION_PATTERNS:
         return True
-    return False
+    return _HAS_ALNUM(t) is None
 
 
-def _validate_query_request(req: QueryRequest) -> None:
-    """Validate request inputs; raise HTTPException on violation."""
-    if len(req.question) > _MAX_QUESTION_LEN:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Question exceeds maximum length of {_MAX_QUESTION_LEN} characters.",
-        )
-    if req.chat_history and len(req.chat_history) > _MAX_CHAT_HISTORY_LEN:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Chat history exceeds maximum of {_MAX_CHAT_HISTORY_LEN} entries.",
-        )
-    if req.api_keys:
-        for k, v in req.api_keys.items():
-            if v and len(str(v)) > _MAX_API_KEY_LEN:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"API key for {k} exceeds maximum length.",
-                )
+# Server default provider, resolved once at import (LLM_PROVIDER from env/.env)
+_DEFAULT_PROVIDER = (os.getenv("LLM_PROVIDER") or "gemini").strip().lower()
+if _DEFAULT_PROVIDER not in ALLOWED_PROVIDERS:
+    _DEFAULT_PROVIDER = "gemini"
 
 
 def _resolve_model_and_key(
@@ -664,20 +808,103 @@ def _resolve_model_and_key(
     api_keys: dict[str, str] | None,
 ) -> tuple[str, str | None]:
     """Resolve model (whitelist) and api_key for the request. Returns (model, api_key)."""
-    from graph.llm_factory import ALLOWED_PROVIDERS
-
-    provider_from_env = (os.getenv("LLM_PROVIDER") or "gemini").strip()
-    prov = (model or provider_from_env).lower()
+    prov = model.lower() if model else _DEFAULT_PROVIDER
     if prov not in ALLOWED_PROVIDERS:
         prov = "gemini"
-    key = None
-    if api_keys and isinstance(api_keys, dict):
-        key = api_keys.get(prov) or api_keys.get(prov.strip())
-    return prov, key if key else None
+    key = api_keys.get(prov) if api_keys else None
+    return prov, key or None
+
+
+def _api_key_fingerprint(api_key: str | None) -> str:
+    """Hash of a client-supplied API key ('' for the server key) so runs and cached answers never cross keys."""
+    if not api_key:
+        return ""
+    return hashlib.blake2b(api_key.encode(), digest_size=16).hexdigest()
+
+
+def _get_query_cache() -> QueryCache | None:
+    """Return the process-local /query cache, or None when QUERY_CACHE_ENABLED is off."""
+    if (os.getenv("QUERY_CACHE_ENABLED") or "true").strip().lower() not in _TRUE_VALUES:
+        return None
+    cache = app_state.get("query_cache")
+    if cache is None:
+        cache = QueryCache(
+            max_entries=env_int("QUERY_CACHE_MAX_ENTRIES", 1024),
+            ttl_seconds=env_float("QUERY_CACHE_TTL_SEC", 3600.0),
+        )
+        app_state["query_cache"] = cache
+    return cache
+
+
+async def _embed_question(question: str, embedding_provider: str) -> list[float] | None:
+    """Embed question for semantic cache lookup; None if embeddings are unavailable."""
+    try:
+        embedding = await get_embeddings(embedding_provider).aembed_query(question)
+    except Exception:
+        return None
+    return list(embedding)
+
+
+# Identical questions in flight share one graph run (single-flight coalescing)
+_inflight_queries: dict[tuple, asyncio.Task] = {}
+
+
+async def _single_flight(key: tuple, start: Callable[[], Awaitable[Any]]) -> Any:
+    """Await the running task for key, or start one.
+
+    Shielded so a disconnecting client does not cancel the run others are waiting on.
+    """
+    task = _inflight_queries.get(key)
+    if task is None:
+        task = asyncio.ensure_future(start())
+        _inflight_queries[key] = task
+
+        def _forget(done: asyncio.Task) -> None:
+            if _inflight_queries.get(key) is done:
+                del _inflight_queries[key]
+
+        task.add_done_callback(_forget)
+    return await asyncio.shield(task)
+
+
+# Provider quota/rate-limit errors (HTTP 429, Gemini RESOURCE_EXHAUSTED, "quota")
+_is_provider_rate_limit = re.compile(
+    r"429|RESOURCE_EXHAUSTED|quota", re.IGNORECASE
+).search
+
+
+# Concurrent graph runs per provider and worker, sized to typical provider rate tiers.
+# Excess requests wait here instead of piling onto the provider and hitting 429s.
+_LLM_CONCURRENCY_DEFAULTS = {"mistral": 50, "gemini": 30, "openai": 50, "ollama": 4}
+
+
+def _llm_semaphore(provider: str) -> asyncio.Semaphore:
+    """Per-provider semaphore, limit from LLM_MAX_CONCURRENCY_<PROVIDER> (e.g. _GEMINI)."""
+    semaphores: dict[str, asyncio.Semaphore] = app_state.setdefault(
+        "llm_semaphores", {}
+    )
+    semaphore = semaphores.get(provider)
+    if semaphore is None:
+        limit = env_int(
+            f"LLM_MAX_CONCURRENCY_{provider.upper()}",
+            _LLM_CONCURRENCY_DEFAULTS.get(provider, 30),
+        )
+        semaphore = semaphores[provider] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+async def _run_limited(provider: str, run: Awaitable[Any]) -> Any:
+    async with _llm_semaphore(provider):
+        return await run
 
 
 @api_router.post("/query", response_model=QueryResponse)
-def query(req: QueryRequest, request: Request):
+async def query(
+    req: QueryRequest,
+    request: Request,
+    response: Response,
+    include_history: bool = False,
+):
     """Run RAG pipeline and return answer with sources."""
     enforce_rate_limit(
         request,
@@ -686,7 +913,6 @@ def query(req: QueryRequest, request: Request):
         window_seconds=env_float("RATE_LIMIT_QUERY_WINDOW_SEC", 60.0),
         app_state=app_state,
     )
-    _validate_query_request(req)
     graph = app_state["graph"]
     if not graph:
         return QueryResponse(
@@ -698,27 +924,31 @@ def query(req: QueryRequest, request: Request):
             used_web_search_label=None,
             privacy_mode=False,
         )
-    chat_history = _to_tuples(req.chat_history)
     model, api_key = _resolve_model_and_key(req.model, req.api_keys)
     model_variant = req.model_variant
     is_ollama = model == "ollama"
 
+    # Greetings never reach the graph: answer before converting chat history
     if _is_non_question(req.question):
         answer = "You're welcome! Ask me anything about radiation safety."
-        updated_history = chat_history + [(req.question, answer)]
+        new_turn = [req.question, answer]
         return QueryResponse(
             answer=answer,
             sources=[],
-            chat_history=_to_lists(updated_history),
+            new_turn=new_turn,
+            chat_history=(
+                [*(req.chat_history or []), new_turn] if include_history else []
+            ),
             warning=None,
             used_web_search=False,
             used_web_search_label=None,
             privacy_mode=is_ollama,
         )
+    chat_history = _to_tuples(req.chat_history)
     try:
-        from graph.llm_factory import APIKeyError, get_embedding_provider, get_llm
-
-        llm = get_llm(provider=model, api_key=api_key, model_variant=model_variant)
+        llm = get_cached_llm(
+            provider=model, api_key=api_key, model_variant=model_variant
+        )
     except APIKeyError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
@@ -728,6 +958,40 @@ def query(req: QueryRequest, request: Request):
             ) from e
         raise
     embedding_provider = get_embedding_provider(model)
+
+    # Response cache only for standalone questions; follow-ups depend on chat history.
+    _sync_index_generation()
+    cache = _get_query_cache() if not chat_history else None
+    # Client-supplied keys get their own scope so their answers never reach other callers
+    cache_scope = f"{model}:{model_variant or ''}:{_api_key_fingerprint(api_key)}"
+    cache_key = ""
+    question_embedding = None
+    if cache is not None:
+        cache_key = cache.make_key(req.question, cache_scope)
+        cached: QueryResponse | None = cache.get(cache_key)
+        similarity = env_float("QUERY_CACHE_SIMILARITY", 0.0)
+        if cached is None and 0 < similarity <= 1:
+            question_embedding = await _embed_question(req.question, embedding_provider)
+            if question_embedding:
+                # Linear scan over cached embeddings: keep it off the event loop
+                cached = await asyncio.to_thread(
+                    cache.get_similar,
+                    question_embedding,
+                    scope=cache_scope,
+                    threshold=similarity,
+                )
+        if cached is not None:
+            response.headers["X-Cache"] = "HIT"
+            return cached.model_copy(
+                update={
+                    "new_turn": [req.question, cached.answer],
+                    "chat_history": (
+                        [[req.question, cached.answer]] if include_history else []
+                    ),
+                }
+            )
+        response.headers["X-Cache"] = "MISS"
+
     try:
         invoke_input = {
             "question": req.question,
@@ -747,20 +1011,29 @@ def query(req: QueryRequest, request: Request):
         disable_tracing = bool(req.api_keys) or is_ollama
         if is_ollama:
             invoke_input["privacy_mode"] = True
-        if disable_tracing:
-            import langsmith as ls
-
-            with ls.tracing_context(enabled=False):
-                result = graph.invoke(invoke_input, config=run_config)
-        else:
-            result = graph.invoke(invoke_input, config=run_config)
+        # callbacks=[] would not stop the env-configured LangSmith tracer, so keep
+        # tracing_context; nullcontext keeps a single invocation site otherwise.
+        trace_ctx = (
+            ls.tracing_context(enabled=False) if disable_tracing else nullcontext()
+        )
+        flight_key = (
+            req.question,
+            tuple(chat_history),
+            model,
+            model_variant or "",
+            _api_key_fingerprint(api_key),
+            disable_tracing,
+        )
+        with trace_ctx:
+            result = await _single_flight(
+                flight_key,
+                lambda: _run_limited(
+                    model, graph.ainvoke(invoke_input, config=run_config)
+                ),
+            )
     except Exception as e:
         err_msg = str(e)
-        if (
-            "429" in err_msg
-            or "RESOURCE_EXHAUSTED" in err_msg
-            or "quota" in err_msg.lower()
-        ):
+        if _is_provider_rate_limit(err_msg):
             raise HTTPException(
                 status_code=429,
                 detail="API rate limit exceeded. Please wait about 30 seconds and try again, or switch to Mistral/OpenAI in Settings.",
@@ -773,21 +1046,25 @@ def query(req: QueryRequest, request: Request):
             status_code=500, detail=err_msg or "Internal server error"
         ) from e
 
-    answer = result.get("generation", "")
+    answer = str(result.get("generation") or "")
     docs = result.get("documents", [])
-    sources = []
-    seen = set()
+    # dict keeps first-seen order of (source, document_type) pairs. Graph nodes only
+    # emit LangChain Documents, so .metadata is read directly.
+    unique_sources: dict[tuple[str, str | None], None] = {}
     for d in docs:
-        meta = getattr(d, "metadata", {}) or {}
-        src = meta.get("source", "retrieved")
-        dtype = meta.get("document_type")
-        key = (src, dtype)
-        if key not in seen:
-            seen.add(key)
-            sources.append(SourceInfo(source=str(src), document_type=dtype))
-    updated_history = result.get("chat_history") or chat_history
+        meta = d.metadata or _EMPTY_METADATA
+        unique_sources.setdefault(
+            (str(meta.get("source", "retrieved")), meta.get("document_type")), None
+        )
+        if len(unique_sources) >= _MAX_SOURCES:
+            break
+    # Graph output is trusted internal data: skip per-object validation.
+    sources = [
+        SourceInfo.model_construct(source=src, document_type=dtype)
+        for src, dtype in unique_sources
+    ]
     warning = result.get("retrieval_warning")
-    used_web_search = result.get("web_search_attempted", False)
+    used_web_search = bool(result.get("web_search_attempted", False))
     if used_web_search:
         req_metrics = app_state.setdefault("request_metrics", {})
         req_metrics["query_web_search_attempts"] = (
@@ -795,8 +1072,6 @@ def query(req: QueryRequest, request: Request):
         )
     used_web_search_label = None
     if used_web_search:
-        from graph.i18n import detect_language, get_label_sources_incl_web
-
         used_web_search_label = get_label_sources_incl_web(
             detect_language(req.question)
         )
@@ -805,20 +1080,32 @@ def query(req: QueryRequest, request: Request):
         req_metrics = app_state.setdefault("request_metrics", {})
         by_outcome = req_metrics.setdefault("query_outcomes_total", {})
         by_outcome[outcome] = int(by_outcome.get(outcome, 0)) + 1
-    return QueryResponse(
+    query_response = QueryResponse.model_construct(
         answer=answer,
         sources=sources,
-        chat_history=_to_lists(updated_history),
+        new_turn=[req.question, answer],
+        chat_history=(
+            _to_lists(result.get("chat_history") or chat_history)
+            if include_history
+            else []
+        ),
         warning=warning,
         used_web_search=used_web_search,
         used_web_search_label=used_web_search_label,
         privacy_mode=is_ollama,
     )
+    # Only cache clean answers; warnings usually signal transient retrieval issues.
+    if cache is not None and answer and not warning:
+        cache.put(
+            cache_key, query_response, scope=cache_scope, embedding=question_embedding
+        )
+    return query_response
 
 
 app.include_router(api_router, prefix="/api")
-# Expose same routes at root (e.g. /health, /query) for direct API access
-app.include_router(api_router)
+# Same routes at root: the Vite dev proxy and frontend nginx strip the /api prefix.
+# Kept out of the OpenAPI schema so docs list each operation once.
+app.include_router(api_router, include_in_schema=False)
 
 
 def _root_html() -> str:
@@ -839,27 +1126,145 @@ def _root_html() -> str:
 """
 
 
-@app.get("/", response_class=HTMLResponse)
-def root():
-    """Serve frontend if built, else show instructions."""
-    index_html = _FRONTEND_DIST / "index.html"
-    if index_html.exists():
-        return FileResponse(index_html)
-    return HTMLResponse(_root_html())
+# index.html must be revalidated so new builds pick up new hashed asset names
+_INDEX_HTML_HEADERS = {"Cache-Control": "no-cache"}
+
+
+# Content encodings precompressed at build time (frontend/vite.config.ts), best first
+_PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _accepted_precompressed(accept_encoding: str) -> list[tuple[str, str]]:
+    accepted = {
+        part.split(";")[0].strip() for part in accept_encoding.lower().split(",")
+    }
+    return [
+        (enc, suffix) for enc, suffix in _PRECOMPRESSED_ENCODINGS if enc in accepted
+    ]
 
 
-# Serve static assets and SPA fallback when frontend is built
+class _PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves the build's .br/.gz siblings when the client accepts them."""
+
+    async def get_response(self, path: str, scope):
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        for encoding, suffix in _accepted_precompressed(accept_encoding):
+            try:
+                response = await super().get_response(path + suffix, scope)
+            except StarletteHTTPException:
+                continue
+            media_type = mimetypes.guess_type(path)[0]
+            if media_type:
+                response.headers["Content-Type"] = media_type
+            response.headers["Content-Encoding"] = encoding
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+        return await super().get_response(path, scope)
+
+
+class _ImmutableStaticFiles(_PrecompressedStaticFiles):
+    """Vite's content-hashed assets: cached for a year."""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+# The frontend build does not change while the server runs (restart after npm run build),
+# so index.html is read once instead of stat-ing and opening it on every page load.
+_INDEX_HTML_PATH = _FRONTEND_DIST / "index.html"
+try:
+    _INDEX_HTML_STAT: os.stat_result | None = _INDEX_HTML_PATH.stat()
+    _INDEX_HTML_BYTES: bytes | None = _INDEX_HTML_PATH.read_bytes()
+except OSError:
+    _INDEX_HTML_STAT = None
+    _INDEX_HTML_BYTES = None
+_INDEX_HTML_PRECOMPRESSED: dict[str, bytes] = {
+    enc: (_FRONTEND_DIST / f"index.html{suffix}").read_bytes()
+    for enc, suffix in _PRECOMPRESSED_ENCODINGS
+    if (_FRONTEND_DIST / f"index.html{suffix}").is_file()
+}
+_ROOT_HTML_BYTES = _root_html().encode("utf-8")
+
+
+# bytes cache their hash, so repeat lookups for the same preloaded body are O(1)
+@functools.lru_cache(maxsize=8)
+def _body_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+_INDEX_HTML_LAST_MODIFIED = (
+    formatdate(_INDEX_HTML_STAT.st_mtime, usegmt=True) if _INDEX_HTML_STAT else None
+)
+
+
+def _index_html_response(index_html: bytes, request: Request) -> Response:
+    """index.html, precompressed when the build has a variant the client accepts.
+
+    Returns 304 when If-None-Match matches the ETag of the body that would be sent.
+    """
+    body, encoding = index_html, None
+    accept_encoding = request.headers.get("accept-encoding", "")
+    for candidate, _suffix in _accepted_precompressed(accept_encoding):
+        if candidate in _INDEX_HTML_PRECOMPRESSED:
+            body, encoding = _INDEX_HTML_PRECOMPRESSED[candidate], candidate
+            break
+    headers = {**_INDEX_HTML_HEADERS, "ETag": _body_etag(body)}
+    if _INDEX_HTML_LAST_MODIFIED:
+        headers["Last-Modified"] = _INDEX_HTML_LAST_MODIFIED
+    if _INDEX_HTML_PRECOMPRESSED:
+        headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    if_none_match = request.headers.get("if-none-match", "")
+    if headers["ETag"] in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(body, headers=headers)
+
+
+@app.get("/", response_class=HTMLResponse)
+def root(request: Request):
+    """Serve frontend if built, else show instructions."""
+    if _INDEX_HTML_BYTES is not None:
+        return _index_html_response(_INDEX_HTML_BYTES, request)
+    return HTMLResponse(_ROOT_HTML_BYTES)
+
+
+class _SpaStaticFiles(_PrecompressedStaticFiles):
+    """Top-level build files (favicon, public/ assets); unknown paths fall back to index.html.
+
+    Starlette handles ETag/Last-Modified/Range for real files; client-side routes get
+    the preloaded index.html. Paths under api stay 404 so API typos are not masked.
+    """
+
+    async def get_response(self, path: str, scope):
+        # Client-side routes have no file extension (build files all do): answer them
+        # from memory instead of probing .br/.gz/plain on disk first.
+        is_client_route = "." not in path.rsplit("/", 1)[-1]
+        if is_client_route and not path.startswith("api") and _INDEX_HTML_BYTES:
+            # Same method check as StaticFiles: POST etc. to a client route stays 405
+            if scope["method"] not in ("GET", "HEAD"):
+                raise StarletteHTTPException(status_code=405)
+            return _index_html_response(_INDEX_HTML_BYTES, Request(scope))
+        try:
+            return await super().get_response(path, scope)
+        except StarletteHTTPException as exc:
+            if exc.status_code != 404 or path.startswith("api"):
+                raise
+        if _INDEX_HTML_BYTES is None:
+            raise StarletteHTTPException(status_code=404)
+        return _index_html_response(_INDEX_HTML_BYTES, Request(scope))
+
+
+# Serve static assets and SPA fallback when frontend is built. Mounted last so the
+# API routes (at / and /api) take precedence over the catch-all "/" mount.
 if _FRONTEND_DIST.exists():
     assets_dir = _FRONTEND_DIST / "assets"
     if assets_dir.exists():
-        app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="assets")
-
-    @app.get("/{path:path}", response_class=HTMLResponse)
-    def serve_spa(path: str):
-        """SPA fallback: serve index.html for client-side routes."""
-        if path.startswith("api") or path == "api":
-            raise HTTPException(404)
-        index_html = _FRONTEND_DIST / "index.html"
-        if index_html.exists():
-            return FileResponse(index_html)
-        raise HTTPException(404)
+        app.mount(
+            "/assets", _ImmutableStaticFiles(directory=str(assets_dir)), name="assets"
+        )
+    app.mount(
+        "/", _SpaStaticFiles(directory=str(_FRONTEND_DIST), html=True), name="spa"
+    )
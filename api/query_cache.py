@@ -0,0 +1,125 @@
+"""In-process /query response cache: exact-question fast path plus optional semantic lookup."""
+
+import hashlib
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation for exact-match keys."""
+    return _WHITESPACE_RE.sub(" ", question.strip().lower()).rstrip(" ?!.")
+
+
+def _unit_vector(values: Sequence[float]) -> tuple[float, ...] | None:
+    norm = math.sqrt(sum(v * v for v in values))
+    if not norm:
+        return None
+    return tuple(v / norm for v in values)
+
+
+@dataclass
+class _Entry:
+    created: float
+    scope: str
+    value: Any
+    embedding: tuple[float, ...] | None = None
+
+
+class QueryCache:
+    """Thread-safe LRU cache with TTL, keyed by normalized question within a scope.
+
+    The scope separates answers per model/variant so e.g. Privacy Mode (Ollama)
+    never receives an answer generated by a cloud model and vice versa.
+    """
+
+    def __init__(self, *, max_entries: int = 1024, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(question: str, scope: str) -> str:
+        raw = f"{scope}\x1f{normalize_question(question)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return now - entry.created > self.ttl_seconds
+
+    def get(self, key: str) -> Any | None:
+        """Return cached value for an exact key, or None on miss/expiry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry, now):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def get_similar(
+        self, embedding: Sequence[float], *, scope: str, threshold: float
+    ) -> Any | None:
+        """Return the value whose question embedding has cosine >= threshold, if any."""
+        query_vec = _unit_vector(embedding)
+        if query_vec is None:
+            return None
+        now = time.monotonic()
+        best_key = None
+        best_score = threshold
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if self._expired(entry, now):
+                    del self._entries[key]
+                    continue
+                if entry.scope != scope or entry.embedding is None:
+                    continue
+                if len(entry.embedding) != len(query_vec):
+                    continue
+                score = sum(
+                    a * b for a, b in zip(entry.embedding, query_vec, strict=True)
+                )
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key].value
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        *,
+        scope: str,
+        embedding: Sequence[float] | None = None,
+    ) -> None:
+        """Store value, evicting least recently used entries beyond max_entries."""
+        entry = _Entry(
+            created=time.monotonic(),
+            scope=scope,
+            value=value,
+            embedding=_unit_vector(embedding) if embedding else None,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -4,82 +4,336 @@ optionally confirm URLs on IAEA/retsinformation, and write document_sources.yaml
 Run: uv run python build_document_sources.py
 """
 
+import json
+import multiprocessing
+import os
 import re
+import threading
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+import yaml
 from pypdf import PdfReader
 
+import document_updates
+
+try:
+    # PDFium (C++) via pypdfium2; pypdf is the fallback if it fails to import
+    import pypdfium2
+except ImportError:  # pragma: no cover
+    pypdfium2 = None
+
+try:
+    # libyaml bindings; the pure-Python safe loader/dumper are the fallback
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
 PROJECT_ROOT = Path(__file__).resolve().parent
 DOCS_DIR = PROJECT_ROOT / "documents"
 REGISTRY_PATH = PROJECT_ROOT / "document_sources.yaml"
 REGISTRY_EXAMPLE = PROJECT_ROOT / "document_sources.example.yaml"
 
+# Compiled once at import; checked in order, first match wins
+_IAEA_VERSION_SOURCES = (
+    r"Safety\s+Reports\s+Series\s+No\.\s*(\d+)",
+    r"Safety\s+Standards\s+Series\s+No\.\s*([\w-]+)",
+    r"(SSR-\d+(?:\s*/\s*\d+)?(?:\s*\(Rev\.\s*\d+\))?)",
+    r"(SSG-\d+(?:\s*\(Rev\.\s*\d+\))?)",
+    r"(No\.\s+SS[RGP][-\s]\d+[^.\n]{0,40})",
+    r"IAEA[\s-](\w+)[\s-](\d+)",
+)
+_IAEA_VERSION_PATTERNS = tuple(
+    re.compile(p, re.IGNORECASE) for p in _IAEA_VERSION_SOURCES
+)
+# All patterns as one alternation (group vN = pattern N): one scan finds the
+# leftmost hit, or proves that none of them match
+_IAEA_VERSION_ANY_RE = re.compile(
+    "|".join(f"(?P<v{i}>{p})" for i, p in enumerate(_IAEA_VERSION_SOURCES)),
+    re.IGNORECASE,
+)
+_STI_PUB_RE = re.compile(r"STI/PUB/\s*(\d+(?:-\w+)?)", re.IGNORECASE)
+_TECDOC_RE = re.compile(r"(?:IAEA-)?TECDOC[- ](\d+)", re.IGNORECASE)
+_IAEA_TECDOC_RE = re.compile(r"IAEA-TECDOC-(\d+)", re.IGNORECASE)
+_SS_SERIES_RE = re.compile(r"(SS[RGP][-\s]?\d+(?:\s*\(Rev\.\s*\d+\))?)", re.IGNORECASE)
+_ISBN_RE = re.compile(r"92-0-\d[\d-]{8,14}[Xx\d]")
+_BEK_RE = re.compile(r"BEK\s+nr\s+(\d+)\s+af\s+\d{1,2}/\d{1,2}/(\d{4})", re.IGNORECASE)
+_NON_WORD_RE = re.compile(r"\W+")
+_SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+_SLUG_SEP_RE = re.compile(r"[-\s]+")
+
 
 def _slug(s: str) -> str:
     """Make a short id slug from a title (e.g. for IAEA sources)."""
-    s = re.sub(r"[^\w\s-]", "", s)
-    s = re.sub(r"[-\s]+", "-", s).strip().lower()
+    s = _SLUG_STRIP_RE.sub("", s)
+    s = _SLUG_SEP_RE.sub("-", s).strip().lower()
     return s[:48] or "doc"
 
 
-def _extract_pdf_title_and_version(pdf_path: Path) -> tuple[str | None, str | None]:
-    """Extract title and version-like string from PDF metadata and first page text. Returns (title, version)."""
-    title: str | None = None
-    version: str | None = None
+_PDF_METADATA_FIELDS = ("title", "subject", "keywords", "creator")
+# Identifiers and titles sit at the top of the cover page; keep the regexes bounded
+_PAGE0_TEXT_MAX_CHARS = 4096
+
+
+def _read_pdf_with_pdfium(pdf_path: Path) -> tuple[dict[str, str], str]:
+    pdf = pypdfium2.PdfDocument(str(pdf_path))
+    try:
+        raw = pdf.get_metadata_dict(skip_empty=True)
+        metadata = {k.lower(): v for k, v in raw.items() if isinstance(v, str)}
+        text = ""
+        if len(pdf):
+            page = pdf[0]
+            textpage = page.get_textpage()
+            count = min(textpage.count_chars(), _PAGE0_TEXT_MAX_CHARS)
+            text = textpage.get_text_range(count=count).replace("\r\n", "\n")
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    return metadata, text
+
+
+def _read_pdf_with_pypdf(pdf_path: Path) -> tuple[dict[str, str], str]:
+    reader = PdfReader(str(pdf_path), strict=False)
+    metadata: dict[str, str] = {}
+    if reader.metadata is not None:
+        for attr in _PDF_METADATA_FIELDS:
+            value = getattr(reader.metadata, attr, None)
+            if isinstance(value, str):
+                metadata[attr] = value
+    text = (reader.pages[0].extract_text() or "") if reader.pages else ""
+    return metadata, text[:_PAGE0_TEXT_MAX_CHARS]
+
+
+def _read_pdf_uncached(pdf_path: Path) -> tuple[dict[str, str], str]:
+    if pypdfium2 is not None:
+        try:
+            return _read_pdf_with_pdfium(pdf_path)
+        except FileNotFoundError:
+            return {}, ""
+        except Exception:
+            pass  # e.g. oddly encoded PDFs: retry with pypdf
     try:
-        reader = PdfReader(str(pdf_path))
-        if reader.metadata is not None:
-            title = getattr(reader.metadata, "title", None)
-            if isinstance(title, str):
-                title = title.strip() or None
-        if reader.pages:
-            page0 = reader.pages[0]
-            text = page0.extract_text() or ""
-            # IAEA: common patterns on first page
-            for pattern in [
-                r"Safety\s+Reports\s+Series\s+No\.\s*(\d+)",
-                r"Safety\s+Standards\s+Series\s+No\.\s*([\w-]+)",
-                r"(SSR-\d+(?:\s*/\s*\d+)?(?:\s*\(Rev\.\s*\d+\))?)",
-                r"(SSG-\d+(?:\s*\(Rev\.\s*\d+\))?)",
-                r"(No\.\s+SS[RGP][-\s]\d+[^.\n]{0,40})",
-                r"IAEA[\s-](\w+)[\s-](\d+)",
-            ]:
-                m = re.search(pattern, text, re.IGNORECASE)
-                if m:
-                    version = m.group(0).strip()[:80]
-                    if not title:
-                        title = version
-                    break
-            if not version and not title and len(text) > 20:
-                first_line = text.split("\n")[0].strip()[:100]
-                if first_line:
-                    title = first_line
+        return _read_pdf_with_pypdf(pdf_path)
     except Exception:
+        return {}, ""
+
+
+# PDFs are parsed once per (path, mtime, size): discovery, title extraction and IAEA
+# search-term extraction all ask for the same file within one build_sources() run,
+# and the results are kept in documents/.pdf_extract_cache.json between runs.
+_PdfKey = tuple[str, int, int]
+
+
+def _pdf_cache_key(pdf_path: Path) -> _PdfKey | None:
+    try:
+        st = pdf_path.stat()
+    except OSError:
+        return None
+    return str(pdf_path), st.st_mtime_ns, st.st_size
+
+
+# Not capped: it is what gets persisted, so it must cover the whole corpus. Entries
+# for changed or removed files are pruned on save.
+_pdf_read_cache: dict[_PdfKey, tuple[Mapping[str, str], str]] = {}
+# Bump when extraction changes; the backend and text cap are part of the stamp so
+# switching between PDFium and pypdf never reuses the other's text.
+_PDF_EXTRACT_CACHE_FORMAT = 1
+
+
+def _pdf_extract_cache_version() -> str:
+    backend = "pdfium" if pypdfium2 is not None else "pypdf"
+    return f"{_PDF_EXTRACT_CACHE_FORMAT}:{backend}:{_PAGE0_TEXT_MAX_CHARS}"
+
+
+def _store_pdf_read(
+    key: _PdfKey, metadata: dict[str, str], text: str
+) -> tuple[Mapping[str, str], str]:
+    entry = (MappingProxyType(metadata), text)
+    _pdf_read_cache[key] = entry
+    return entry
+
+
+def _read_pdf_cached(
+    path: str, mtime_ns: int, size: int
+) -> tuple[Mapping[str, str], str]:
+    key = (path, mtime_ns, size)
+    entry = _pdf_read_cache.get(key)
+    if entry is None:
+        entry = _store_pdf_read(key, *_read_pdf_uncached(Path(path)))
+    return entry
+
+
+def _pdf_extract_cache_path() -> Path:
+    return DOCS_DIR / ".pdf_extract_cache.json"
+
+
+def _load_pdf_extract_cache() -> None:
+    """Seed the parse cache from the previous run (entries for changed files never match)."""
+    try:
+        with open(_pdf_extract_cache_path(), encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != _pdf_extract_cache_version():
+            return
+        rows = data.get("pdfs") or []
+    except (OSError, ValueError, AttributeError):
+        return
+    for row in rows:
+        try:
+            path, mtime_ns, size, metadata, text = row
+            key = (str(path), int(mtime_ns), int(size))
+        except (TypeError, ValueError):
+            continue
+        if key not in _pdf_read_cache and isinstance(metadata, dict):
+            _store_pdf_read(key, metadata, str(text))
+
+
+def _save_pdf_extract_cache() -> None:
+    """Persist parse results for PDFs that still exist unchanged, so reruns only parse new/changed files."""
+    if not DOCS_DIR.exists():
+        return
+    stale = [key for key in _pdf_read_cache if _pdf_cache_key(Path(key[0])) != key]
+    for key in stale:
+        _pdf_read_cache.pop(key, None)
+    rows = [
+        [*key, dict(metadata), text]
+        for key, (metadata, text) in list(_pdf_read_cache.items())
+    ]
+    path = _pdf_extract_cache_path()
+    tmp = path.with_suffix(".json.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": _pdf_extract_cache_version(), "pdfs": rows},
+                f,
+                ensure_ascii=False,
+            )
+        tmp.replace(path)
+    except OSError:
         pass
+
+
+# Below this many unparsed PDFs, worker start-up costs more than it saves
+_PARALLEL_MIN_PDFS = 4
+
+
+def _prefetch_pdf_reads(pdf_paths: list[Path]) -> None:
+    """Parse PDFs not yet cached across worker processes (PDF decoding is CPU-bound).
+
+    Uses "spawn" so it is safe from the threaded API server; falls back to the lazy
+    serial path if processes are unavailable.
+    """
+    keys = [
+        key
+        for key in map(_pdf_cache_key, pdf_paths)
+        if key is not None and key not in _pdf_read_cache
+    ]
+    workers = min(len(keys), os.cpu_count() or 1)
+    if len(keys) < _PARALLEL_MIN_PDFS or workers < 2:
+        return
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results = list(
+                executor.map(
+                    _read_pdf_uncached, [Path(k[0]) for k in keys], chunksize=4
+                )
+            )
+    except Exception:
+        return
+    for key, (metadata, text) in zip(keys, results, strict=True):
+        _store_pdf_read(key, metadata, text)
+
+
+def _extract_pdf_title_and_version(pdf_path: Path) -> tuple[str | None, str | None]:
+    """Extract title and version-like string from PDF metadata and first page text. Returns (title, version)."""
+    key = _pdf_cache_key(pdf_path)
+    if key is None:
+        return _title_and_version(pdf_path, MappingProxyType({}), "")
+    return _title_and_version_cached(*key)
+
+
+@lru_cache(maxsize=1024)
+def _title_and_version_cached(
+    path: str, mtime_ns: int, size: int
+) -> tuple[str | None, str | None]:
+    return _title_and_version(Path(path), *_read_pdf_cached(path, mtime_ns, size))
+
+
+_MIN_PAGE_TEXT_CHARS = 20
+
+
+def _search_iaea_version(text: str) -> re.Match[str] | None:
+    """First _IAEA_VERSION_PATTERNS entry (in priority order) that matches text.
+
+    The fused regex returns the leftmost hit, which is also that pattern's own
+    first match; only higher-priority patterns still need their own search.
+    """
+    m = _IAEA_VERSION_ANY_RE.search(text)
+    if m is None or m.lastgroup is None:
+        return None
+    hit = int(m.lastgroup[1:])
+    for pattern in _IAEA_VERSION_PATTERNS[:hit]:
+        earlier = pattern.search(text)
+        if earlier:
+            return earlier
+    return m
+
+
+def _title_and_version(
+    pdf_path: Path, metadata: Mapping[str, str], text: str
+) -> tuple[str | None, str | None]:
+    version: str | None = None
+    title: str | None = (metadata.get("title") or "").strip() or None
+    # Scanned/image-only first pages yield (almost) no text: skip the regexes
+    if len(text.strip()) >= _MIN_PAGE_TEXT_CHARS:
+        # IAEA: common patterns on first page
+        m = _search_iaea_version(text)
+        if m:
+            version = m.group(0).strip()[:80]
+            if not title:
+                title = version
+        if not version and not title:
+            first_line = text.split("\n")[0].strip()[:100]
+            if first_line:
+                title = first_line
     if not title:
         title = pdf_path.stem.replace("_", " ").replace("-", " ")
     return title, version or title
 
 
+_MIN_PHRASE_TITLE_CHARS = 12
+# Each term can cost an IAEA site search (and Brave for the first three)
+_MAX_IAEA_SEARCH_TERMS = 5
+
+
 def _extract_iaea_search_terms(pdf_path: Path) -> list[str]:
     """Extract an ordered list of search terms from a PDF for IAEA URL lookup (STI/PUB, TECDOC, series, title words)."""
     seen: set[str] = set()
     terms: list[str] = []
-    title, version = _extract_pdf_title_and_version(pdf_path)
+    # One stat + one (cached) parse feeds both the title/version and the term regexes
+    key = _pdf_cache_key(pdf_path)
+    if key is None:
+        metadata: Mapping[str, str] = MappingProxyType({})
+        page0_text = ""
+        title, version = _title_and_version(pdf_path, metadata, page0_text)
+    else:
+        metadata, page0_text = _read_pdf_cached(*key)
+        title, version = _title_and_version_cached(*key)
     text = ""
-    try:
-        reader = PdfReader(str(pdf_path))
-        if reader.metadata is not None:
-            for attr in ("title", "subject", "keywords", "creator"):
-                v = getattr(reader.metadata, attr, None)
-                if isinstance(v, str) and len(v) > 2:
-                    text += " " + v
-        if reader.pages:
-            text += " " + (reader.pages[0].extract_text() or "")
-    except Exception:
-        pass
-    text = " " + (version or "") + " " + (title or "") + " " + pdf_path.stem
+    for attr in _PDF_METADATA_FIELDS:
+        v = metadata.get(attr)
+        if v and len(v) > 2:
+            text += " " + v
+    text += " " + page0_text
+    text += " " + (version or "") + " " + (title or "") + " " + pdf_path.stem
 
     def add(s: str) -> None:
         s = (s or "").strip()[:80]
@@ -88,58 +342,73 @@ def _extract_iaea_search_terms(pdf_path: Path) -> list[str]:
             terms.append(s)
 
     # STI/PUB/1234 or STI/PUB/1234-VOL2 (and space variant for search engines that split on /)
-    for m in re.finditer(r"STI/PUB/\s*(\d+(?:-\w+)?)", text, re.IGNORECASE):
+    for m in _STI_PUB_RE.finditer(text):
         num = m.group(1)
         add("STI/PUB/" + num)
         add("STI PUB " + num)
+    # A publication id is the strongest term: later ones would only add queries
+    if terms:
+        return terms[:_MAX_IAEA_SEARCH_TERMS]
     # IAEA-TECDOC-1234 or TECDOC-1234 or TECDOC 1234
-    for m in re.finditer(r"(?:IAEA-)?TECDOC[- ](\d+)", text, re.IGNORECASE):
+    for m in _TECDOC_RE.finditer(text):
         add("TECDOC " + m.group(1))
-    for m in re.finditer(r"IAEA-TECDOC-(\d+)", text, re.IGNORECASE):
+    for m in _IAEA_TECDOC_RE.finditer(text):
         add("IAEA-TECDOC-" + m.group(1))
     # Series: SSG-20, SSR-3, SSG-20 (Rev. 1), No. SSG-20
-    for m in re.finditer(
-        r"(SS[RGP][-\s]?\d+(?:\s*\(Rev\.\s*\d+\))?)", text, re.IGNORECASE
-    ):
+    for m in _SS_SERIES_RE.finditer(text):
         add(m.group(1).strip())
     # ISBN (IAEA often 92-0-xxxxxx-x)
-    for m in re.finditer(r"92-0-\d[\d-]{8,14}[Xx\d]", text):
+    for m in _ISBN_RE.finditer(text):
         add(m.group(0))
     # Version/title from extract (if not already added)
     if version:
         add(version)
     if title:
         add(title)
-        words = [w for w in re.split(r"\W+", title) if len(w) > 2][:5]
-        if len(words) > 2:
-            add(" ".join(words))
+        # Titles this short cannot yield a phrase different from the title itself
+        if len(title) > _MIN_PHRASE_TITLE_CHARS:
+            words = [w for w in _NON_WORD_RE.split(title) if len(w) > 2][:5]
+            if len(words) > 2:
+                add(" ".join(words))
     if not terms:
         add(pdf_path.stem.replace("_", " ").replace("-", " "))
-    return terms
+    return terms[:_MAX_IAEA_SEARCH_TERMS]
+
+
+def _iter_pdfs(base: Path) -> Iterator[Path]:
+    """Yield *.pdf files under base (recursive); os.walk avoids rglob's per-entry Path work."""
+    for root, _dirs, files in os.walk(base):
+        for name in files:
+            if name.endswith(".pdf"):
+                yield Path(root, name)
 
 
 def _discover_iaea_pdfs() -> list[dict[str, Any]]:
     """Find all PDFs in IAEA and IAEA_other; extract title and version from each."""
     out: list[dict[str, Any]] = []
-    for folder in ("IAEA", "IAEA_other"):
-        base = DOCS_DIR / folder
-        if not base.exists():
-            continue
-        for pdf_path in sorted(base.rglob("*.pdf")):
-            title, version = _extract_pdf_title_and_version(pdf_path)
-            slug = _slug(title or pdf_path.stem)
-            source_id = f"iaea-{slug}" if folder == "IAEA" else f"iaea-other-{slug}"
-            out.append(
-                {
-                    "id": source_id,
-                    "name": title or pdf_path.stem,
-                    "url": None,
-                    "folder": folder,
-                    "filename_hint": pdf_path.name,
-                    "version": version or None,
-                    "_path": str(pdf_path),
-                }
-            )
+    found = [
+        (folder, pdf_path)
+        for folder in ("IAEA", "IAEA_other")
+        if (DOCS_DIR / folder).exists()
+        for pdf_path in sorted(_iter_pdfs(DOCS_DIR / folder))
+    ]
+    _prefetch_pdf_reads([pdf_path for _folder, pdf_path in found])
+    for folder, pdf_path in found:
+        title, version = _extract_pdf_title_and_version(pdf_path)
+        name = title or pdf_path.stem
+        slug = _slug(name)
+        source_id = f"iaea-{slug}" if folder == "IAEA" else f"iaea-other-{slug}"
+        out.append(
+            {
+                "id": source_id,
+                "name": name,
+                "url": None,
+                "folder": folder,
+                "filename_hint": pdf_path.name,
+                "version": version or None,
+                "_path": str(pdf_path),
+            }
+        )
     return out
 
 
@@ -163,11 +432,7 @@ def _discover_danish_from_version_files() -> list[dict[str, Any]]:
         # Build ELI URL from version string "BEK nr NNN af DD/MM/YYYY" -> .../eli/lta/YYYY/NNN
         url = None
         if version:
-            m = re.search(
-                r"BEK\s+nr\s+(\d+)\s+af\s+\d{1,2}/\d{1,2}/(\d{4})",
-                version,
-                re.IGNORECASE,
-            )
+            m = _BEK_RE.search(version)
             if m:
                 nr, year = m.group(1), m.group(2)
                 url = f"https://www.retsinformation.dk/eli/lta/{year}/{nr}"
@@ -185,35 +450,43 @@ def _discover_danish_from_version_files() -> list[dict[str, Any]]:
     return out
 
 
-def _discover_danish_pdfs() -> list[dict[str, Any]]:
-    """Discover Danish PDFs in Bekendtgørelse (not yet covered by _version.txt)."""
+def _discover_danish_pdfs(
+    danish_from_version_files: list[dict[str, Any]] | None = None,
+) -> list[dict[str, Any]]:
+    """Discover Danish PDFs in Bekendtgørelse (not yet covered by _version.txt).
+
+    Pass the result of _discover_danish_from_version_files() if already computed.
+    """
     out: list[dict[str, Any]] = []
     bek = DOCS_DIR / "Bekendtgørelse"
     if not bek.exists():
         return out
-    seen_ids = {s["id"] for s in _discover_danish_from_version_files()}
-    for pdf_path in sorted(bek.rglob("*.pdf")):
+    if danish_from_version_files is None:
+        danish_from_version_files = _discover_danish_from_version_files()
+    version_ids = {s["id"] for s in danish_from_version_files}
+    seen_ids: set[str] = set()
+    # Downloads are saved as {source_id}.pdf next to {source_id}_version.txt:
+    # already covered, so skip them before parsing.
+    pdf_paths = [p for p in sorted(_iter_pdfs(bek)) if p.stem not in version_ids]
+    _prefetch_pdf_reads(pdf_paths)
+    for pdf_path in pdf_paths:
         title, version = _extract_pdf_title_and_version(pdf_path)
-        slug = _slug(title or pdf_path.stem)
-        source_id = f"dk-{slug}"
+        name = title or pdf_path.stem
+        source_id = f"dk-{_slug(name)}"
         if source_id in seen_ids:
             continue
         seen_ids.add(source_id)
         # Try to get ELI from "BEK nr NNN af ..." in version
         url = None
         if version:
-            m = re.search(
-                r"BEK\s+nr\s+(\d+)\s+af\s+\d{1,2}/\d{1,2}/(\d{4})",
-                version,
-                re.IGNORECASE,
-            )
+            m = _BEK_RE.search(version)
             if m:
                 nr, year = m.group(1), m.group(2)
                 url = f"https://www.retsinformation.dk/eli/lta/{year}/{nr}"
         out.append(
             {
                 "id": source_id,
-                "name": title or pdf_path.stem,
+                "name": name,
                 "url": url,
                 "folder": "Bekendtgørelse",
                 "filename_hint": pdf_path.name,
@@ -229,33 +502,46 @@ def _load_existing_registry() -> list[dict[str, Any]]:
     path = REGISTRY_PATH if REGISTRY_PATH.exists() else REGISTRY_EXAMPLE
     if not path.exists():
         return []
-    import yaml
-
     with open(path, encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+        data = yaml.load(f, Loader=_YamlLoader) or {}
     return data.get("sources") or []
 
 
+_RegistryIndex = tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]
+
+
+def _index_registry(existing: list[dict[str, Any]]) -> _RegistryIndex:
+    """Index registry entries by id and by stripped name (first entry wins)."""
+    by_id: dict[str, dict[str, Any]] = {}
+    by_name: dict[str, dict[str, Any]] = {}
+    for ex in existing:
+        if not isinstance(ex, dict):
+            continue
+        if ex.get("id"):
+            by_id.setdefault(ex["id"], ex)
+        name = (ex.get("name") or "").strip()
+        if name:
+            by_name.setdefault(name, ex)
+    return by_id, by_name
+
+
 def _merge_url_and_version(
-    discovered: dict[str, Any], existing: list[dict[str, Any]]
+    discovered: dict[str, Any],
+    by_id: dict[str, dict[str, Any]],
+    by_name: dict[str, dict[str, Any]],
 ) -> dict[str, Any]:
     """Fill url from existing registry if we find a match by id or name; keep version from discovery."""
     out = {k: v for k, v in discovered.items() if not k.startswith("_")}
-    for ex in existing:
-        if not isinstance(ex, dict):
-            continue
-        if ex.get("id") == discovered.get("id"):
-            out["url"] = ex.get("url") or out.get("url")
-            if not out.get("version") and ex.get("version"):
-                out["version"] = ex.get("version")
-            break
-        if (
-            ex.get("name")
-            and discovered.get("name")
-            and ex.get("name").strip() == discovered.get("name", "").strip()
-        ):
-            out["url"] = ex.get("url") or out.get("url")
-            break
+    ex = by_id.get(discovered.get("id") or "")
+    if ex is not None:
+        out["url"] = ex.get("url") or out.get("url")
+        if not out.get("version") and ex.get("version"):
+            out["version"] = ex.get("version")
+        return out
+    name = (discovered.get("name") or "").strip()
+    ex = by_name.get(name) if name else None
+    if ex is not None:
+        out["url"] = ex.get("url") or out.get("url")
     return out
 
 
@@ -264,10 +550,8 @@ def _confirm_danish_url(source: dict[str, Any]) -> None:
     if not source.get("url") or "retsinformation" not in (source.get("url") or ""):
         return
     try:
-        from document_updates import _fetch_url, _parse_retsinformation
-
-        html = _fetch_url(source["url"])
-        label, new_url = _parse_retsinformation(html, source["url"])
+        html = document_updates._fetch_url(source["url"])
+        label, new_url = document_updates._parse_retsinformation(html, source["url"])
         if new_url and new_url != source["url"]:
             source["url"] = new_url
             if label:
@@ -276,13 +560,33 @@ def _confirm_danish_url(source: dict[str, Any]) -> None:
         pass
 
 
+# Per-run term -> URL memo: IAEA PDFs sharing a publication id or series number
+# (and concurrent confirm workers) issue each IAEA/Brave lookup only once.
+_iaea_lookup_lock = threading.Lock()
+_iaea_lookup_cache: dict[tuple[str, ...], Future[str | None]] = {}
+
+
+def _lookup_iaea_url_once(terms: tuple[str, ...]) -> str | None:
+    with _iaea_lookup_lock:
+        future = _iaea_lookup_cache.get(terms)
+        owner = future is None
+        if future is None:
+            future = _iaea_lookup_cache[terms] = Future()
+    if owner:
+        try:
+            future.set_result(
+                document_updates._lookup_iaea_publication_url_multi(list(terms))
+            )
+        except Exception as e:
+            future.set_exception(e)
+    return future.result()
+
+
 def _confirm_iaea_url(source: dict[str, Any]) -> None:
     """If IAEA source has no URL, try to look up publication page via IAEA search (multiple terms from PDF)."""
     if source.get("url") or source.get("folder") not in ("IAEA", "IAEA_other"):
         return
     try:
-        from document_updates import _lookup_iaea_publication_url_multi
-
         terms = []
         path = source.get("_path")
         if path:
@@ -295,47 +599,52 @@ def _confirm_iaea_url(source: dict[str, Any]) -> None:
             if name and name not in terms:
                 terms.append(name)
         if terms:
-            url = _lookup_iaea_publication_url_multi(terms)
+            url = _lookup_iaea_url_once(tuple(terms))
             if url:
                 source["url"] = url
     except Exception:
         pass
 
 
+_CONFIRM_MAX_WORKERS = 16
+
+
+def _confirm_urls_concurrently(
+    jobs: list[tuple[Callable[[dict[str, Any]], None], dict[str, Any]]],
+) -> None:
+    """Run URL confirmations in a thread pool; each job mutates its source in place."""
+    if not jobs:
+        return
+    with ThreadPoolExecutor(
+        max_workers=min(_CONFIRM_MAX_WORKERS, len(jobs))
+    ) as executor:
+        list(executor.map(lambda job: job[0](job[1]), jobs))
+
+
 def build_sources(
     *,
     confirm_urls: bool = True,
 ) -> list[dict[str, Any]]:
     """Discover all local documents, extract versions, optionally confirm URLs, merge with existing registry. Returns list of source dicts for YAML."""
-    existing = _load_existing_registry()
-    sources: list[dict[str, Any]] = []
+    by_id, by_name = _index_registry(_load_existing_registry())
+    _load_pdf_extract_cache()
+    danish: list[dict[str, Any]] = []
+    iaea: list[dict[str, Any]] = []
     seen_ids: set[str] = set()
 
-    # Danish from version files (ingested XML)
-    for d in _discover_danish_from_version_files():
-        d = _merge_url_and_version(d, existing)
-        if confirm_urls:
-            _confirm_danish_url(d)
+    # Danish from version files (ingested XML), then Danish PDFs; first id wins.
+    # Ids are checked before merging so dropped duplicates cost nothing.
+    danish_from_version_files = _discover_danish_from_version_files()
+    danish_pdfs = _discover_danish_pdfs(danish_from_version_files)
+    for d in (*danish_from_version_files, *danish_pdfs):
         sid = d.get("id")
-        if sid and sid not in seen_ids:
-            seen_ids.add(sid)
-            sources.append(d)
-
-    # Danish PDFs
-    for d in _discover_danish_pdfs():
-        d = _merge_url_and_version(d, existing)
-        if confirm_urls and d.get("url"):
-            _confirm_danish_url(d)
-        sid = d.get("id")
-        if sid and sid not in seen_ids:
-            seen_ids.add(sid)
-            sources.append(d)
+        if not sid or sid in seen_ids:
+            continue
+        seen_ids.add(sid)
+        danish.append(_merge_url_and_version(d, by_id, by_name))
 
-    # IAEA PDFs (deduplicate ids by appending suffix)
+    # IAEA PDFs (deduplicate ids by appending suffix; merge on the final id)
     for d in _discover_iaea_pdfs():
-        d = _merge_url_and_version(d, existing)
-        if confirm_urls:
-            _confirm_iaea_url(d)
         sid = d.get("id")
         if not sid:
             continue
@@ -346,7 +655,19 @@ def build_sources(
             sid = f"{base_id}-{c}"
         d["id"] = sid
         seen_ids.add(sid)
-        sources.append(d)
+        iaea.append(_merge_url_and_version(d, by_id, by_name))
+    _save_pdf_extract_cache()
+
+    if confirm_urls:
+        with _iaea_lookup_lock:
+            _iaea_lookup_cache.clear()
+        _confirm_urls_concurrently(
+            [
+                *((_confirm_danish_url, d) for d in danish),
+                *((_confirm_iaea_url, d) for d in iaea),
+            ]
+        )
+    sources = [*danish, *iaea]
 
     # Normalise for YAML: no _path, version can be null
     result = []
@@ -367,15 +688,18 @@ def write_document_sources_yaml(
     sources: list[dict[str, Any]], path: Path | None = None
 ) -> None:
     """Write sources to document_sources.yaml (or given path)."""
-    import yaml
-
     path = path or REGISTRY_PATH
     data = {
         "sources": sources,
     }
     with open(path, "w", encoding="utf-8") as f:
         yaml.dump(
-            data, f, default_flow_style=False, allow_unicode=True, sort_keys=False
+            data,
+            f,
+            Dumper=_YamlDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
         )
 
 
@@ -1,39 +1,68 @@
 """Check for updated versions of registered document sources (IAEA, retsinformation.dk)."""
 
+import atexit
+import copy
 import json
 import os
 import re
-import ssl
+import socket
+import sqlite3
 import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
+from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+from contextlib import closing, nullcontext
+from dataclasses import dataclass, field
 from datetime import date, datetime
+from functools import lru_cache, wraps
+from itertools import zip_longest
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
+import urllib3
 import yaml
+from dotenv import load_dotenv
+from urllib3.connection import HTTPConnection
 
 from graph.services.retsinformation_eli import resolve_latest_document
 from graph.services.retsinformation_harvest import run_incremental_harvest
 
-# Brave Search API: min seconds between requests to avoid 429 Too Many Requests
+try:
+    # libyaml bindings; the pure-Python safe loader/dumper are the fallback
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
+# RETSINFO_RESOLVER_MODE is read at import; api.main imports this module before its own load_dotenv()
+load_dotenv()
+
+# Brave Search API: min seconds between requests to avoid 429 Too Many Requests.
+# Token bucket refilled at 1 / BRAVE_REQUEST_DELAY_SECONDS, holding up to
+# BRAVE_BURST tokens; callers reserve a slot under the lock and sleep outside it.
 BRAVE_REQUEST_DELAY_SECONDS = 4
+BRAVE_BURST = 1.0
 _brave_throttle_lock = threading.Lock()
-_brave_last_request_time: list[float] = [0.0]
+_brave_tokens = BRAVE_BURST
+_brave_tokens_at = time.monotonic()
 
 
 def _brave_throttle() -> None:
     """Wait so at least BRAVE_REQUEST_DELAY_SECONDS have passed since the last Brave API call."""
+    global _brave_tokens, _brave_tokens_at
+    rate = 1.0 / BRAVE_REQUEST_DELAY_SECONDS
     with _brave_throttle_lock:
         now = time.monotonic()
-        elapsed = now - _brave_last_request_time[0]
-        if elapsed < BRAVE_REQUEST_DELAY_SECONDS:
-            time.sleep(BRAVE_REQUEST_DELAY_SECONDS - elapsed)
-        _brave_last_request_time[0] = time.monotonic()
+        # _brave_tokens_at can lie in the future when earlier callers reserved slots
+        tokens = min(BRAVE_BURST, _brave_tokens + (now - _brave_tokens_at) * rate)
+        if tokens >= 1.0:
+            _brave_tokens, _brave_tokens_at = tokens - 1.0, now
+            return
+        wait = (1.0 - tokens) / rate
+        _brave_tokens, _brave_tokens_at = 0.0, now + wait
+    time.sleep(wait)
 
 
 # Paths (aligned with ingestion)
@@ -43,6 +72,7 @@ REGISTRY_PATH = PROJECT_ROOT / "document_sources.yaml"
 REGISTRY_EXAMPLE = PROJECT_ROOT / "document_sources.example.yaml"
 VERSIONS_PATH = PROJECT_ROOT / "document_versions.json"
 RETSINFO_SYNC_STATE_PATH = PROJECT_ROOT / "retsinformation_sync_state.json"
+HTTP_CACHE_PATH = PROJECT_ROOT / "_http_cache.sqlite"
 RETSINFO_RESOLVER_MODE = (
     os.getenv("RETSINFO_RESOLVER_MODE", "shadow").strip().lower() or "shadow"
 )
@@ -60,11 +90,92 @@ ALLOWED_HOSTS = frozenset(
 )
 REQUEST_TIMEOUT = 15
 MAX_BODY_SIZE = 2 * 1024 * 1024  # 2 MB
+READ_CHUNK_SIZE = 64 * 1024
+USER_AGENT = "RadiationSafetyRAG/1.0"
+# One pooled client for all outbound HTTP: TCP/TLS connections to the few hosts we
+# talk to (retsinformation.dk, iaea.org, sst.dk, Brave) are reused across requests
+# TCP keepalive so pooled sockets survive idle gaps (e.g. the Brave throttle);
+# the TCP_KEEP* tuning knobs are Linux-only
+_SOCKET_OPTIONS = [
+    *HTTPConnection.default_socket_options,
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    *(
+        (socket.IPPROTO_TCP, getattr(socket, name), value)
+        for name, value in (
+            ("TCP_KEEPIDLE", 30),
+            ("TCP_KEEPINTVL", 10),
+            ("TCP_KEEPCNT", 3),
+        )
+        if hasattr(socket, name)
+    ),
+]
+_HTTP = urllib3.PoolManager(
+    num_pools=8,
+    maxsize=8,
+    timeout=REQUEST_TIMEOUT,
+    headers={"User-Agent": USER_AGENT},
+    socket_options=_SOCKET_OPTIONS,
+    retries=urllib3.Retry(
+        total=5,
+        connect=2,
+        read=2,
+        status=2,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    ),
+)
+WARM_HOSTS = ("www.retsinformation.dk", "www.iaea.org", "www.sst.dk")
+BRAVE_API_HOST = "api.search.brave.com"
+
+
+def _warm_connections(hosts: tuple[str, ...] = WARM_HOSTS) -> None:
+    """HEAD each host in parallel so DNS and TLS are done before a run's first real request.
+    Best effort: failures are ignored and the run connects normally.
+    """
+
+    def _head(host: str) -> None:
+        try:
+            _HTTP.request("HEAD", f"https://{host}/", retries=False, timeout=5)
+        except Exception:
+            pass
+
+    with ThreadPoolExecutor(max_workers=len(hosts) or 1) as executor:
+        list(executor.map(_head, hosts))
+
 
 # retsinformation.dk eli/lta URL pattern: /eli/lta/YEAR/NR
 _ELI_LTA_RE = re.compile(r"/eli/lta/(\d+)/(\d+)(?:/|$|\?)")
+# Version/name parsing ("BEK nr 1385 af 18/11/2025", "nr 670", "bek-670")
+_BEK_NR_RE = re.compile(r"BEK\s+nr\s+(\d+)", re.IGNORECASE)
+_NR_RE = re.compile(r"(?:BEK\s+)?nr\s+(\d+)", re.IGNORECASE)
+_BEK_ID_RE = re.compile(r"bek[-_]?(\d+)", re.IGNORECASE)
+_YEAR_RE = re.compile(r"\b(20\d{2}|19\d{2})\b")
+_YEAR_20XX_RE = re.compile(r"\b(20\d{2})\b")
+_BEK_YEAR_RE = re.compile(r"BEK\s+nr\s+(\d+)\s+af\s+\d+/\d+/(\d{2,4})", re.IGNORECASE)
+_BEK_DATE_RE = re.compile(
+    r"BEK\s+nr\s+(\d+)\s+af\s+(\d{1,2})/(\d{1,2})/(\d{2,4})", re.IGNORECASE
+)
+_BEK_FULL_DATE_RE = re.compile(
+    r"BEK\s+nr\s+(\d+)\s+af\s+(\d{1,2})/(\d{1,2})/(\d{4})", re.IGNORECASE
+)
+# HTML scraping (retsinformation "Senere ændringer", IAEA search/publication pages)
+_SINGLE_QUOTED_HREF_RE = re.compile(r"href='([^']+)'")
+_SPACED_SINGLE_QUOTED_HREF_RE = re.compile(r"\s+href='([^']+)'")
+_ELI_LTA_HREF_RE = re.compile(r'href="(/eli/lta/(\d+)/(\d+))"')
+_IAEA_PUBLICATION_HREF_RE = re.compile(
+    r'href="(https://www\.iaea\.org/publications/(\d+)/[^"]+)"'
+)
+_IAEA_PUBLICATION_PATH_HREF_RE = re.compile(r'href="(/publications/(\d+)/[^"]+)"')
+_IAEA_PUBLICATION_URL_RE = re.compile(r"https?://www\.iaea\.org/publications/\d+/")
+_IAEA_SUPERSEDED_LINK_RE = re.compile(
+    r'Superseded\s+by\s*:\s*<a\s+href="([^"]+)"[^>]*>([^<]+)</a>',
+    re.IGNORECASE | re.DOTALL,
+)
+_IAEA_SUPERSEDED_TEXT_RE = re.compile(r"Superseded\s+by\s*:\s*([^\n<]+)", re.IGNORECASE)
 
 
+@lru_cache(maxsize=2048)
 def _is_retsinformation_url(url: str) -> bool:
     """True if URL is for www.retsinformation.dk (not api subdomain)."""
     if not url:
@@ -83,9 +194,24 @@ class DocumentSource:
     version: str | None = (
         None  # current version from document_sources.yaml (written after ingest)
     )
+    # Derived from name once per source instead of per predicate call
+    is_sst_by_name: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        name_lower = (self.name or "").lower()
+        # Known SST document names (vejledninger)
+        self.is_sst_by_name = any(
+            marker in name_lower
+            for marker in (
+                "åbne radioaktive",
+                "aabne radioaktive",
+                "radioaktive kilder",
+                "sikkerhedsvurdering",
+            )
+        )
 
 
-@dataclass
+@dataclass(frozen=True)
 class ResolvedUrl:
     """Normalized result for URL resolution steps."""
 
@@ -93,15 +219,59 @@ class ResolvedUrl:
     url: str | None = None
 
 
+# Parsed registry/versions files, re-read only when mtime or size change
+_file_cache_lock = threading.Lock()
+_file_cache: dict[Path, tuple[tuple[int, int], Any]] = {}
+
+
+def _load_file_cached(path: Path, load: Callable[[Path], Any]) -> Any:
+    """Return load(path), reusing the previous result while the file is unchanged. None if missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _file_cache.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    value = load(path)
+    with _file_cache_lock:
+        _file_cache[path] = (stamp, value)
+    return value
+
+
+def _read_registry_data(path: Path) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
+def _registry_data_for_update() -> dict[str, Any]:
+    """Private copy of the parsed document_sources.yaml for a writer to modify ({} if missing)."""
+    return copy.deepcopy(_load_file_cached(REGISTRY_PATH, _read_registry_data) or {})
+
+
+def _write_registry_data(data: dict[str, Any]) -> None:
+    """Dump data to document_sources.yaml and keep it as the cached parse for the new mtime."""
+    with open(REGISTRY_PATH, "w", encoding="utf-8") as f:
+        yaml.dump(
+            data,
+            f,
+            Dumper=_YamlDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+        )
+    st = REGISTRY_PATH.stat()
+    with _file_cache_lock:
+        _file_cache[REGISTRY_PATH] = ((st.st_mtime_ns, st.st_size), data)
+
+
 def load_registry_raw() -> list[dict[str, Any]]:
     """Load document_sources.yaml (or .example). Returns list of source dicts with id, name, url, folder, filename_hint. Includes sources with null url (e.g. local-only IAEA PDFs)."""
     path = REGISTRY_PATH if REGISTRY_PATH.exists() else REGISTRY_EXAMPLE
-    if not path.exists():
-        return []
-    with open(path, encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
-    sources = data.get("sources") or []
-    return [s for s in sources if s.get("id") and s.get("name")]
+    data = _load_file_cached(path, _read_registry_data) or {}
+    # Copies: callers may modify the dicts, the cached parse must stay intact
+    return [dict(s) for s in data.get("sources") or [] if s.get("id") and s.get("name")]
 
 
 def _load_registry() -> list[DocumentSource]:
@@ -120,28 +290,125 @@ def _load_registry() -> list[DocumentSource]:
     ]
 
 
-def _load_versions() -> dict[str, dict[str, str]]:
-    if not VERSIONS_PATH.exists():
-        return {}
+def _read_versions(path: Path) -> dict[str, dict[str, str]]:
     try:
-        with open(VERSIONS_PATH, encoding="utf-8") as f:
+        with open(path, encoding="utf-8") as f:
             return json.load(f)
     except (json.JSONDecodeError, OSError):
         return {}
 
 
+def _load_versions() -> dict[str, dict[str, str]]:
+    versions = _load_file_cached(VERSIONS_PATH, _read_versions) or {}
+    # Callers update entries in place before _save_versions; hand out copies
+    return {k: dict(v) if isinstance(v, dict) else v for k, v in versions.items()}
+
+
 def _save_versions(versions: dict[str, dict[str, str]]) -> None:
     with open(VERSIONS_PATH, "w", encoding="utf-8") as f:
         json.dump(versions, f, indent=2)
+    with _file_cache_lock:
+        _file_cache.pop(VERSIONS_PATH, None)
 
 
-# Runtime caches (cleared per top-level update run)
+# Runtime caches (cleared per top-level update run). Reads are lock-free: a single
+# dict.get is atomic under the GIL, and a racing duplicate write stores the same
+# value, so the locks only serialise writes and clears.
 _fetch_cache_lock = threading.Lock()
 _fetch_cache: dict[str, str] = {}
 _brave_cache_lock = threading.Lock()
 _brave_cache: dict[tuple[str, int], list[dict[str, Any]]] = {}
 _current_version_cache_lock = threading.Lock()
 _current_version_cache: dict[str, str | None] = {}
+_current_version_key_locks: dict[str, threading.Lock] = {}
+_resolve_cache_lock = threading.Lock()
+_resolve_cache: dict[tuple[str, str, str, str, bool], ResolvedUrl] = {}
+_MISSING: Any = object()  # _current_version_cache stores None for "no version"
+# Page parses keyed on (parser, html, *args); fetched pages are shared via _fetch_cache,
+# so the keys add no copies. str caches its own hash and a hit on the same object
+# compares by identity, so a separate content digest would only add a pass over
+# the page. Tiny pages are cheaper to re-parse than to hash.
+_parse_cache_lock = threading.Lock()
+_parse_cache: dict[tuple[str, ...], tuple[str | None, str | None]] = {}
+_PARSE_CACHE_MIN_CHARS = 512
+
+
+def _cached_per_run(
+    parse: Callable[..., tuple[str | None, str | None]],
+) -> Callable[..., tuple[str | None, str | None]]:
+    """Memoise an HTML parser for the current run (cleared by _reset_runtime_caches)."""
+
+    @wraps(parse)
+    def wrapper(html: str, *args: str) -> tuple[str | None, str | None]:
+        if len(html) < _PARSE_CACHE_MIN_CHARS:
+            return parse(html, *args)
+        key = (parse.__name__, html, *args)
+        cached = _parse_cache.get(key)
+        if cached is None:
+            cached = parse(html, *args)
+            with _parse_cache_lock:
+                _parse_cache[key] = cached
+        return cached
+
+    return wrapper
+
+
+# Persistent conditional-GET cache behind _fetch_cache: (etag, last_modified, body) per URL.
+# ts is the last store or 304 revalidation; rows idle longer than this are evicted, since
+# search-result pages get unique URLs and would otherwise pile up forever.
+HTTP_CACHE_MAX_AGE_SEC = 30 * 24 * 3600
+_http_cache_lock = threading.Lock()
+
+
+def _http_cache_connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(HTTP_CACHE_PATH, timeout=5)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS responses "
+        "(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body TEXT, ts REAL)"
+    )
+    return conn
+
+
+def _http_cache_get(url: str) -> tuple[str | None, str | None, str] | None:
+    """Stored (etag, last_modified, body) for url, or None. Cache errors count as a miss."""
+    try:
+        with _http_cache_lock, closing(_http_cache_connect()) as conn:
+            return conn.execute(
+                "SELECT etag, last_modified, body FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+    except sqlite3.Error:
+        return None
+
+
+def _http_cache_put(
+    url: str, etag: str | None, last_modified: str | None, body: str
+) -> None:
+    """Store a response that carries validators; without them it can never be revalidated."""
+    if not etag and not last_modified:
+        return
+    now = time.time()
+    try:
+        with _http_cache_lock, closing(_http_cache_connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM responses WHERE ts < ?", (now - HTTP_CACHE_MAX_AGE_SEC,)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, now),
+            )
+    except sqlite3.Error:
+        pass
+
+
+def _http_cache_touch(url: str) -> None:
+    """Mark a stored response as revalidated (304) so eviction keeps it."""
+    try:
+        with _http_cache_lock, closing(_http_cache_connect()) as conn, conn:
+            conn.execute(
+                "UPDATE responses SET ts = ? WHERE url = ?", (time.time(), url)
+            )
+    except sqlite3.Error:
+        pass
 
 
 def _reset_runtime_caches() -> None:
@@ -152,6 +419,12 @@ def _reset_runtime_caches() -> None:
         _brave_cache.clear()
     with _current_version_cache_lock:
         _current_version_cache.clear()
+    with _resolve_cache_lock:
+        _resolve_cache.clear()
+    with _dir_listing_lock:
+        _dir_listing_cache.clear()
+    with _parse_cache_lock:
+        _parse_cache.clear()
 
 
 def _resolve_sst_url_via_brave(source_name: str) -> str | None:
@@ -177,20 +450,7 @@ def _resolve_sst_url_via_brave(source_name: str) -> str | None:
 
 def _is_sst_source(source: DocumentSource) -> bool:
     """True if this Danish source is hosted on sst.dk (vejledninger, not retsinformation.dk)."""
-    if (source.url or "").strip():
-        if "sst.dk" in source.url.lower():
-            return True
-    # Known SST document names (vejledninger)
-    name_lower = (source.name or "").lower()
-    if (
-        "åbne radioaktive" in name_lower
-        or "aabne radioaktive" in name_lower
-        or "radioaktive kilder" in name_lower
-    ):
-        return True
-    if "sikkerhedsvurdering" in name_lower:
-        return True
-    return False
+    return source.is_sst_by_name or "sst.dk" in (source.url or "").lower()
 
 
 def _resolve_danish_url_by_search(
@@ -234,73 +494,97 @@ def _resolve_danish_url_to_newest(candidate_url: str) -> tuple[str | None, str |
     return _parse_retsinformation(html, candidate_url)
 
 
+_PROBE_YEARS = 6
+
+
+def _head_ok(url: str) -> bool:
+    """True if a HEAD request to url ends in 2xx after following redirects (like urlopen)."""
+    try:
+        resp = _HTTP.request("HEAD", url)
+    except urllib3.exceptions.HTTPError:
+        return False
+    return 200 <= resp.status < 300
+
+
 def _resolve_danish_url_by_probing(bek_nr: int) -> tuple[str | None, str | None]:
     """Resolve Danish BEK URL by probing eli/lta/YEAR/nr for recent years. Returns (label, url) when page exists. No API needed.
     After finding a live URL, fetches that page and follows 'Senere ændringer' to return the newest consolidated version (e.g. 670 → 1385).
     """
     base = "https://www.retsinformation.dk/eli/lta"
     current_year = date.today().year
-    for year in range(current_year, current_year - 6, -1):
-        url = f"{base}/{year}/{bek_nr}"
-        if not _allowed_url(url):
-            continue
-        req = urllib.request.Request(
-            url, method="HEAD", headers={"User-Agent": "RadiationSafetyRAG/1.0"}
-        )
-        try:
-            with urllib.request.urlopen(
-                req, timeout=REQUEST_TIMEOUT, context=ssl.create_default_context()
-            ) as resp:
-                if 200 <= resp.getcode() < 400:
-                    # Page exists; follow "Senere ændringer" to get newest consolidated version (e.g. 670 → 1385)
-                    newest_label, newest_url = _resolve_danish_url_to_newest(url)
-                    if newest_label and newest_url:
-                        return newest_label, newest_url
-                    label = f"BEK nr {bek_nr} (probing {year})"
-                    return label, url
-        except (urllib.error.HTTPError, urllib.error.URLError):
-            continue
+    candidates = [
+        (year, url)
+        for year in range(current_year, current_year - _PROBE_YEARS, -1)
+        if _allowed_url(url := f"{base}/{year}/{bek_nr}")
+    ]
+    if not candidates:
+        return None, None
+    # HEAD all years at once; newest live year wins without waiting for older ones
+    executor = ThreadPoolExecutor(max_workers=len(candidates))
+    try:
+        probes = [
+            (year, url, executor.submit(_head_ok, url)) for year, url in candidates
+        ]
+        for year, url, probe in probes:
+            if not probe.result():
+                continue
+            # Page exists; follow "Senere ændringer" to get newest consolidated version (e.g. 670 → 1385)
+            newest_label, newest_url = _resolve_danish_url_to_newest(url)
+            if newest_label and newest_url:
+                return newest_label, newest_url
+            label = f"BEK nr {bek_nr} (probing {year})"
+            return label, url
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
     return None, None
 
 
+# URLs, version strings and names recur across sources and resolver steps in a run,
+# so the pure parsers below are memoised
+@lru_cache(maxsize=4096)
+def _regex_int(pattern: re.Pattern[str], text: str) -> int | None:
+    """First group of pattern's first match in text, as int."""
+    m = pattern.search(text)
+    return int(m.group(1)) if m else None
+
+
 def _extract_bek_number(source: DocumentSource) -> int | None:
     """Extract BEK number from source URL, version, current version file, or name/id (e.g. 'nr 670', 'BEK 670'). Returns e.g. 670 or None."""
-    out = None
     # From URL: .../eli/lta/2019/670 or .../eli/lta/2025/1385
-    if source.url:
-        m = _ELI_LTA_RE.search(source.url)
-        if m:
-            out = int(m.group(2))
-    if out is None:
-        for version_str in (source.version, _get_current_version_from_file(source)):
-            if version_str and isinstance(version_str, str):
-                m = re.search(r"BEK\s+nr\s+(\d+)", version_str, re.IGNORECASE)
-                if m:
-                    out = int(m.group(1))
-                    break
-    if out is None:
-        for raw in (source.name, source.id):
-            if not raw or not isinstance(raw, str):
-                continue
-            m = re.search(r"(?:BEK\s+)?nr\s+(\d+)", raw, re.IGNORECASE)
-            if m:
-                out = int(m.group(1))
-                break
-            m = re.search(r"bek[-_]?(\d+)", raw, re.IGNORECASE)
-            if m:
-                out = int(m.group(1))
-                break
-    return out
+    year_nr = _eli_lta_year_nr(source.url or "")
+    if year_nr:
+        return year_nr[1]
+    # Registry version first; the version file on disk is only read when needed
+    for read_version in (
+        lambda: source.version,
+        lambda: _get_current_version_from_file(source),
+    ):
+        version_str = read_version()
+        if version_str and isinstance(version_str, str):
+            nr = _regex_int(_BEK_NR_RE, version_str)
+            if nr is not None:
+                return nr
+    for raw in (source.name, source.id):
+        if not raw or not isinstance(raw, str):
+            continue
+        nr = _regex_int(_NR_RE, raw)
+        if nr is None:
+            nr = _regex_int(_BEK_ID_RE, raw)
+        if nr is not None:
+            return nr
+    return None
 
 
+@lru_cache(maxsize=4096)
 def _extract_year_from_string(s: str) -> int | None:
     """Extract a 4-digit year (19xx or 20xx) from a string (version text or URL path). Returns None if none found."""
     if not (s or "").strip():
         return None
-    m = re.search(r"\b(20\d{2}|19\d{2})\b", s)
+    m = _YEAR_RE.search(s)
     return int(m.group(1)) if m else None
 
 
+@lru_cache(maxsize=4096)
 def _eli_lta_year_nr(url: str) -> tuple[int, int] | None:
     """Parse retsinformation.dk eli/lta URL to (year, nr). Returns None if not an eli/lta URL."""
     m = _ELI_LTA_RE.search(url or "")
@@ -311,18 +595,17 @@ def _eli_lta_year_nr(url: str) -> tuple[int, int] | None:
 
 def _eli_lta_nr(url: str) -> int | None:
     """Parse retsinformation.dk eli/lta URL to BEK number."""
-    m = _ELI_LTA_RE.search(url or "")
-    return int(m.group(2)) if m else None
+    year_nr = _eli_lta_year_nr(url or "")
+    return year_nr[1] if year_nr else None
 
 
+@lru_cache(maxsize=4096)
 def _version_string_to_year_nr(version_str: str) -> tuple[int, int] | None:
     """Parse version history string to (year, nr). E.g. 'BEK nr 1385 af 18/11/2025' -> (2025, 1385)."""
     if not (version_str or "").strip():
         return None
     # "BEK nr 1385 af 18/11/2025" or "BEK nr 1385 af 18/11/25"
-    m = re.search(
-        r"BEK\s+nr\s+(\d+)\s+af\s+\d+/\d+/(\d{2,4})", version_str, re.IGNORECASE
-    )
+    m = _BEK_YEAR_RE.search(version_str)
     if m:
         nr = int(m.group(1))
         year = int(m.group(2))
@@ -330,24 +613,21 @@ def _version_string_to_year_nr(version_str: str) -> tuple[int, int] | None:
             year += 2000 if year < 50 else 1900
         return year, nr
     # "BEK nr 1384 (search)" with year elsewhere, e.g. "2025" in string
-    m = re.search(r"BEK\s+nr\s+(\d+)", version_str, re.IGNORECASE)
+    m = _BEK_NR_RE.search(version_str)
     if m:
         nr = int(m.group(1))
-        year_m = re.search(r"\b(20\d{2})\b", version_str)
+        year_m = _YEAR_20XX_RE.search(version_str)
         if year_m:
             return int(year_m.group(1)), nr
     return None
 
 
+@lru_cache(maxsize=4096)
 def _version_string_to_date_nr(version_str: str) -> tuple[date, int] | None:
     """Parse version string to (issue_date, nr), e.g. 'BEK nr 1385 af 18/11/2025'."""
     if not (version_str or "").strip():
         return None
-    m = re.search(
-        r"BEK\s+nr\s+(\d+)\s+af\s+(\d{1,2})/(\d{1,2})/(\d{2,4})",
-        version_str,
-        re.IGNORECASE,
-    )
+    m = _BEK_DATE_RE.search(version_str)
     if not m:
         return None
     nr = int(m.group(1))
@@ -433,6 +713,17 @@ def _resolve_danish_source(
     reject_older: bool = False,
 ) -> ResolvedUrl:
     """Resolve Danish source URL using unified fallback chain."""
+    # Lookup and update paths resolve the same source; the chain costs Brave quota
+    cache_key = (
+        source.id or "",
+        source.name or "",
+        source.url or "",
+        current_version or "",
+        reject_older,
+    )
+    cached = _resolve_cache.get(cache_key)
+    if cached is not None:
+        return cached
     resolved = ResolvedUrl()
     bek_nr: int | None = None
 
@@ -506,6 +797,8 @@ def _resolve_danish_source(
         except Exception:
             pass
 
+    with _resolve_cache_lock:
+        _resolve_cache[cache_key] = resolved
     return resolved
 
 
@@ -545,49 +838,80 @@ def _resolve_danish_source_via_eli(
     return resolved, evidence
 
 
+# Authority ends at the first "/", so these prefixes pin the host without urlparse
+_ALLOWED_URL_PREFIXES = tuple(f"https://{host}/" for host in sorted(ALLOWED_HOSTS))
+
+
 def _allowed_url(url: str) -> bool:
+    if url.startswith(_ALLOWED_URL_PREFIXES):
+        return True
     try:
-        parsed = urllib.parse.urlparse(url)
-        host = (parsed.netloc or "").lower().removeprefix("www.")
-        if host in ALLOWED_HOSTS:
-            return True
-        if host.endswith(".dk") and "retsinformation" in url:
-            return True
-        return host in {"iaea.org", "www.iaea.org"}
+        host = (urllib.parse.urlparse(url).netloc or "").lower()
     except Exception:
         return False
+    return host in ALLOWED_HOSTS
 
 
 def _fetch_url(url: str) -> str:
     if not _allowed_url(url):
         raise ValueError(f"URL not allowlisted: {url}")
-    with _fetch_cache_lock:
-        cached = _fetch_cache.get(url)
+    cached = _fetch_cache.get(url)
     if cached is not None:
         return cached
-    req = urllib.request.Request(url, headers={"User-Agent": "RadiationSafetyRAG/1.0"})
-    # Prevent SSL issues on some systems
-    ctx = ssl.create_default_context()
+    stored = _http_cache_get(url)
+    headers = dict(_HTTP.headers)
+    if stored:
+        etag, last_modified, _body = stored
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
     try:
-        with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT, context=ctx) as resp:
+        resp = _HTTP.request("GET", url, headers=headers, preload_content=False)
+    except urllib3.exceptions.HTTPError as e:
+        raise ValueError(f"Request failed: {e}") from e
+    # Unread bodies must be drained or the socket closed before it goes back to the pool
+    try:
+        if resp.status == 304 and stored:
+            resp.drain_conn()
+            decoded = stored[2]
+            _http_cache_touch(url)
+        else:
+            if resp.status >= 400:
+                resp.drain_conn()
+                raise ValueError(f"HTTP {resp.status}: {url}")
             if (
                 resp.headers.get("Content-Length")
                 and int(resp.headers.get("Content-Length", 0)) > MAX_BODY_SIZE
             ):
+                resp.close()
                 raise ValueError("Response too large")
-            data = resp.read(MAX_BODY_SIZE + 1)
-            if len(data) > MAX_BODY_SIZE:
-                raise ValueError("Response too large")
-            decoded = data.decode("utf-8", errors="replace")
-            with _fetch_cache_lock:
-                _fetch_cache[url] = decoded
-            return decoded
-    except urllib.error.HTTPError as e:
-        raise ValueError(f"HTTP {e.code}: {url}") from e
-    except urllib.error.URLError as e:
-        raise ValueError(f"Request failed: {e.reason}") from e
+            # Read in chunks so memory follows the actual body, not the size limit
+            chunks: list[bytes] = []
+            total = 0
+            while chunk := resp.read(READ_CHUNK_SIZE):
+                total += len(chunk)
+                if total > MAX_BODY_SIZE:
+                    resp.close()
+                    raise ValueError("Response too large")
+                chunks.append(chunk)
+            decoded = b"".join(chunks).decode("utf-8", errors="replace")
+            _http_cache_put(
+                url,
+                resp.headers.get("ETag"),
+                resp.headers.get("Last-Modified"),
+                decoded,
+            )
+    except urllib3.exceptions.HTTPError as e:
+        raise ValueError(f"Request failed: {e}") from e
+    finally:
+        resp.release_conn()
+    with _fetch_cache_lock:
+        _fetch_cache[url] = decoded
+    return decoded
 
 
+@_cached_per_run
 def _parse_retsinformation(html: str, base_url: str) -> tuple[str | None, str | None]:
     """Parse 'Senere ændringer til forskriften' and return (newest_version_label, newest_url)."""
     base = (
@@ -596,83 +920,67 @@ def _parse_retsinformation(html: str, base_url: str) -> tuple[str | None, str |
         else "https://www.retsinformation.dk"
     )
     # Normalize: single-quoted attributes to double-quoted so regex matches
-    html = re.sub(r"\s+href='([^']+)'", r' href="\1"', html)
-    matches = []
-
-    # Pattern 1: <a href="/eli/lta/YYYY/NNN">...BEK nr NNN af D(M)/D(M)/YYYY</a>
-    # Day/month can be 1 or 2 digits; allow optional nested tags and whitespace
-    for pattern in (
-        re.compile(
-            r'href="(/eli/lta/(\d+)/(\d+))"[^>]*>\s*BEK\s+nr\s+\d+\s+af\s+(\d{1,2})/(\d{1,2})/(\d{4})',
-            re.IGNORECASE,
-        ),
-        re.compile(
-            r'href="(/eli/lta/(\d+)/(\d+))"[^>]*>(?:\s*<[^>]+>[^<]*)*\s*BEK\s+nr\s+\d+\s+af\s+(\d{1,2})/(\d{1,2})/(\d{4})',
-            re.IGNORECASE,
-        ),
-        # Pattern 2: BEK nr NNN af D/M/YYYY anywhere, then find preceding href (same line/block)
-        # Match href then up to 80 chars for the date
-        re.compile(
-            r'href="(/eli/lta/(\d+)/(\d+))"[^>]*>[\s\S]{0,80}?BEK\s+nr\s+(\d+)\s+af\s+(\d{1,2})/(\d{1,2})/(\d{4})',
-            re.IGNORECASE,
-        ),
-    ):
-        for m in pattern.finditer(html):
-            g = m.groups()
-            path = g[0]
-            # Pattern 1/2: (path, year, nr, day, month, year) = 6 groups
-            # Pattern 3: (path, year, nr, nr_text, day, month, year) = 7 groups
-            if len(g) == 7:
-                nr, day, month, year = g[3], g[4], g[5], g[6]
-            elif len(g) == 6:
-                nr, day, month, year = g[2], g[3], g[4], g[5]
-            else:
-                continue
-            full_url = base + path if path.startswith("/") else base + "/" + path
-            label = f"BEK nr {nr} af {day}/{month}/{year}"
-            date_tuple = (int(year), int(month), int(day))
-            matches.append((date_tuple, label, full_url))
-        if matches:
-            break
-
-    # Fallback: find all /eli/lta/ links and all "BEK nr NNN af D/M/YYYY" in page, match by NNN
-    if not matches:
-        link_nrs: dict[str, str] = {}  # nr -> full url
-        for path_m in re.finditer(r'href="(/eli/lta/(\d+)/(\d+))"', html):
-            path, _year, nr = path_m.group(1), path_m.group(2), path_m.group(3)
-            full_url = base + path if path.startswith("/") else base + "/" + path
-            link_nrs[nr] = full_url
-        for bek_m in re.finditer(
-            r"BEK\s+nr\s+(\d+)\s+af\s+(\d{1,2})/(\d{1,2})/(\d{4})",
-            html,
-            re.IGNORECASE,
-        ):
-            nr, day, month, year = bek_m.groups()
-            if nr in link_nrs:
-                label = f"BEK nr {nr} af {day}/{month}/{year}"
-                date_tuple = (int(year), int(month), int(day))
-                matches.append((date_tuple, label, link_nrs[nr]))
-
-    if not matches:
+    if "'" in html:
+        html = _SPACED_SINGLE_QUOTED_HREF_RE.sub(r' href="\1"', html)
+    # One pass over the /eli/lta/ links, one over "BEK nr NNN af D/M/YYYY"; join on NNN
+    links: dict[str, dict[str, str]] = {}  # nr -> {year: full url}
+    for path_m in _ELI_LTA_HREF_RE.finditer(html):
+        path, year, nr = path_m.groups()
+        full_url = base + path if path.startswith("/") else base + "/" + path
+        links.setdefault(nr, {})[year] = full_url
+    newest: tuple[tuple[int, int, int], str, str] | None = None
+    for bek_m in _BEK_FULL_DATE_RE.finditer(html):
+        nr, day, month, year = bek_m.groups()
+        by_year = links.get(nr)
+        if not by_year:
+            continue
+        # Same number in several years: prefer the link from the issue year
+        url = by_year.get(year) or next(reversed(by_year.values()))
+        date_tuple = (int(year), int(month), int(day))
+        # Ties go to the later occurrence
+        if newest is None or date_tuple >= newest[0]:
+            newest = (date_tuple, f"BEK nr {nr} af {day}/{month}/{year}", url)
+    if newest is None:
         return None, None
-    matches.sort(key=lambda x: x[0])
-    _, label, url = matches[-1]
+    _, label, url = newest
     return label, url
 
 
 # IAEA search: base URL and rate limit (avoid hammering)
 IAEA_SEARCH_BASE = "https://www.iaea.org/publications/search"
 _LAST_IAEA_SEARCH: float = 0
+_iaea_search_lock = threading.Lock()
 IAEA_SEARCH_DELAY_SEC = 2.0
 
 
-def _lookup_iaea_publication_url(query: str) -> str | None:
-    """Fetch IAEA publications search with query and return first publication page URL (https://www.iaea.org/publications/ID/slug), or None."""
+def _iaea_search_throttle(stop: threading.Event | None = None) -> bool:
+    """Wait so at least IAEA_SEARCH_DELAY_SEC have passed since the last IAEA search (thread-safe).
+    Returns False without taking a slot when stop is set before or while waiting.
+    """
     global _LAST_IAEA_SEARCH
-    now = time.monotonic()
-    if now - _LAST_IAEA_SEARCH < IAEA_SEARCH_DELAY_SEC:
-        time.sleep(IAEA_SEARCH_DELAY_SEC - (now - _LAST_IAEA_SEARCH))
-    _LAST_IAEA_SEARCH = time.monotonic()
+    if stop is not None and stop.is_set():
+        return False
+    with _iaea_search_lock:
+        now = time.monotonic()
+        wait = IAEA_SEARCH_DELAY_SEC - (now - _LAST_IAEA_SEARCH)
+        if stop is not None:
+            # wait() returns early (True) once a sibling lookup has found a match
+            if stop.is_set() or (wait > 0 and stop.wait(wait)):
+                return False
+        elif wait > 0:
+            time.sleep(wait)
+        _LAST_IAEA_SEARCH = time.monotonic()
+    return True
+
+
+def _lookup_iaea_publication_url(
+    query: str, *, stop: threading.Event | None = None
+) -> str | None:
+    """Fetch IAEA publications search with query and return first publication page URL (https://www.iaea.org/publications/ID/slug), or None.
+    When stop is set before or while waiting for the throttle, returns None without searching.
+    """
+    if not _iaea_search_throttle(stop):
+        return None
     search_query = (query or "").strip()[:80]
     if not search_query:
         return None
@@ -684,63 +992,49 @@ def _lookup_iaea_publication_url(query: str) -> str | None:
     except Exception:
         return None
     # Normalize single-quoted hrefs to double-quoted for one regex pass
-    html = re.sub(r"href='([^']+)'", r'href="\1"', html)
+    html = _SINGLE_QUOTED_HREF_RE.sub(r'href="\1"', html)
     # Match full URL or relative /publications/ID/slug
-    for m in re.finditer(
-        r'href="(https://www\.iaea\.org/publications/(\d+)/[^"]+)"',
-        html,
-    ):
+    for m in _IAEA_PUBLICATION_HREF_RE.finditer(html):
         return m.group(1)
-    for m in re.finditer(
-        r'href="(/publications/(\d+)/[^"]+)"',
-        html,
-    ):
+    for m in _IAEA_PUBLICATION_PATH_HREF_RE.finditer(html):
         return f"https://www.iaea.org{m.group(1)}"
     return None
 
 
+_DA_ASCII_TABLE = str.maketrans(
+    {"å": "a", "ø": "o", "æ": "ae", "Å": "A", "Ø": "O", "Æ": "Ae"}
+)
+
+
+# Source names and result titles repeat across Brave results and resolver calls
+@lru_cache(maxsize=2048)
 def _danish_to_ascii_search(s: str) -> str:
     """Replace Danish letters with ASCII equivalents for search queries to avoid encoding issues."""
-    if not s:
-        return s
-    s = s.strip()[:80]
-    for old, new in (
-        ("å", "a"),
-        ("ø", "o"),
-        ("æ", "ae"),
-        ("Å", "A"),
-        ("Ø", "O"),
-        ("Æ", "Ae"),
-    ):
-        s = s.replace(old, new)
-    return s
+    return s.strip()[:80].translate(_DA_ASCII_TABLE) if s else s
 
 
 def _brave_search(query: str, count: int = 10) -> list[dict[str, Any]]:
-    """Call Brave Search API; return list of result dicts with url/link and title. Returns [] on error or no key."""
+    """Call Brave Search API; return list of result dicts with url and title. Returns [] on error or no key."""
     api_key = (os.getenv("BRAVE_SEARCH_API_KEY") or "").strip()
     if not api_key:
         return []
     cache_key = (query, count)
-    with _brave_cache_lock:
-        cached = _brave_cache.get(cache_key)
+    cached = _brave_cache.get(cache_key)
     if cached is not None:
         return cached
-    api_url = f"https://api.search.brave.com/res/v1/web/search?q={urllib.parse.quote(query)}&count={count}"
-    req = urllib.request.Request(
-        api_url,
-        headers={
-            "Accept": "application/json",
-            "X-Subscription-Token": api_key,
-            "User-Agent": "RadiationSafetyRAG/1.0",
-        },
-    )
+    # result_filter=web: skip the news/video/infobox blocks we never read
+    api_url = f"https://api.search.brave.com/res/v1/web/search?q={urllib.parse.quote(query)}&count={count}&result_filter=web"
+    headers = {
+        "Accept": "application/json",
+        "X-Subscription-Token": api_key,
+        "User-Agent": USER_AGENT,
+    }
     _brave_throttle()
     try:
-        with urllib.request.urlopen(
-            req, timeout=REQUEST_TIMEOUT, context=ssl.create_default_context()
-        ) as resp:
-            data = json.load(resp)
+        resp = _HTTP.request("GET", api_url, headers=headers)
+        if resp.status != 200:
+            return []
+        data = json.loads(resp.data)
     except Exception:
         return []
     if not isinstance(data, dict):
@@ -749,14 +1043,33 @@ def _brave_search(query: str, count: int = 10) -> list[dict[str, Any]]:
     results = web.get("results") or web.get("web") or []
     if not isinstance(results, list):
         return []
+    # Keep only what callers read, so the run cache does not hold full result objects
+    results = [
+        {
+            "url": r.get("url") or r.get("link"),
+            "title": r.get("title") or r.get("name"),
+        }
+        for r in results[:count]
+        if isinstance(r, dict)
+    ]
     with _brave_cache_lock:
         _brave_cache[cache_key] = results
     return results
 
 
+_BRAVE_DEBUG_ENABLED = os.getenv("BRAVE_DEBUG", "").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+}
+_brave_log_lock = threading.Lock()
+_brave_log_fh: TextIO | None = None
+
+
 def _brave_debug_log(msg: str, **kwargs: object) -> None:
-    """Append one line to brave_search_debug.log for diagnosing Brave search. Only when BRAVE_DEBUG=1."""
-    if os.getenv("BRAVE_DEBUG", "").strip().lower() not in ("1", "true", "yes"):
+    """Append one line to brave_search_debug.log for diagnosing Brave search. Only when BRAVE_DEBUG=1 at import."""
+    global _brave_log_fh
+    if not _BRAVE_DEBUG_ENABLED:
         return
     try:
         line = (
@@ -766,8 +1079,14 @@ def _brave_debug_log(msg: str, **kwargs: object) -> None:
             )
             + "\n"
         )
-        with (PROJECT_ROOT / "brave_search_debug.log").open("a", encoding="utf-8") as f:
-            f.write(line)
+        with _brave_log_lock:
+            # One buffered handle for the process instead of open/close per line
+            if _brave_log_fh is None:
+                _brave_log_fh = (PROJECT_ROOT / "brave_search_debug.log").open(
+                    "a", encoding="utf-8", buffering=8192
+                )
+                atexit.register(_brave_log_fh.close)
+            _brave_log_fh.write(line)
     except Exception:
         pass
 
@@ -793,38 +1112,28 @@ def _resolve_danish_url_via_brave(
     results = _brave_search(q, count=15)
     _brave_debug_log("brave_results_count", count=len(results))
     title_norm = (_danish_to_ascii_search(source_name or "")).lower().strip()
-
-    def _is_historisk(result_title: str, result_url: str) -> bool:
-        """Exclude historical/archived versions; we want the current decree."""
-        t = (_danish_to_ascii_search((result_title or "").strip())).lower()
-        u = (result_url or "").lower()
-        return "historisk" in t or "historisk" in u
-
-    def _title_matches(result_title: str) -> bool:
+    # Per-query match rules, computed once instead of per result
+    title_suffix = title_norm[-40:].strip() if len(title_norm) > 25 else ""
+    if len(title_suffix) < 15:
+        title_suffix = ""
+    wants_stoffer = "radioaktive stoffer" in title_norm
+    wants_abne = "abne radioaktive kilder" in title_norm
+
+    def _title_matches(t: str) -> bool:
+        """t: result title already passed through _danish_to_ascii_search and lowercased."""
         if not title_norm:
             return True
-        t = (_danish_to_ascii_search((result_title or "").strip())).lower()
         if not t:
             return False
         if title_norm in t:
             return True
-        if len(title_norm) > 25:
-            suffix = title_norm[-40:].strip()
-            if len(suffix) >= 15 and suffix in t:
-                return True
+        if title_suffix and title_suffix in t:
+            return True
         # Same decree under a variant name: e.g. "Bekendtgørelse om radioaktive stoffer" vs "Bekendtgørelse om brug af radioaktive stoffer"
-        if (
-            "radioaktive stoffer" in title_norm
-            and "radioaktive stoffer" in t
-            and "transport" not in t
-        ):
+        if wants_stoffer and "radioaktive stoffer" in t and "transport" not in t:
             return True
         # "Brug af åbne radioaktive kilder" vs "Bekendtgørelse om anvendelse af åbne radioaktive kilder" (same decree)
-        if (
-            "abne radioaktive kilder" in title_norm
-            and "abne radioaktive kilder" in t
-            and "lukkede" not in t
-        ):
+        if wants_abne and "abne radioaktive kilder" in t and "lukkede" not in t:
             return True
         return False
 
@@ -839,7 +1148,9 @@ def _resolve_danish_url_via_brave(
         if not m:
             continue
         result_title = (r.get("title") or r.get("name") or "").strip()
-        if _is_historisk(result_title, url):
+        t = _danish_to_ascii_search(result_title).lower()
+        # Exclude historical/archived versions; we want the current decree
+        if "historisk" in t or "historisk" in url.lower():
             _brave_debug_log(
                 "brave_result",
                 url=url[:90],
@@ -848,7 +1159,7 @@ def _resolve_danish_url_via_brave(
                 skipped="historisk",
             )
             continue
-        matched = _title_matches(result_title)
+        matched = _title_matches(t)
         _brave_debug_log(
             "brave_result",
             url=url[:90],
@@ -887,20 +1198,38 @@ def _lookup_iaea_publication_url_via_brave(query: str) -> str | None:
     for r in _brave_search(q, count=10):
         if isinstance(r, dict):
             url = (r.get("url") or r.get("link") or "").strip()
-            if url and re.match(r"https?://www\.iaea\.org/publications/\d+/", url):
+            if url and _IAEA_PUBLICATION_URL_RE.match(url):
                 return url if url.startswith("http") else f"https://{url}"
     return None
 
 
+_IAEA_LOOKUP_MAX_WORKERS = 4
+
+
 def _lookup_iaea_publication_url_multi(queries: list[str]) -> str | None:
     """Try each query via IAEA search; if none found, try Brave Search (if key set) for first few terms. Returns first URL found."""
-    for q in queries:
-        if not (q or "").strip():
-            continue
-        url = _lookup_iaea_publication_url(q)
-        if url:
-            return url
-    # Fallback: Brave Search (site:iaea.org/publications) for first 3 non-empty terms
+    terms = [q for q in queries if (q or "").strip()]
+    if terms:
+        # Searches overlap (still spaced by the throttle); the first hit in query order
+        # wins and stops searches that have not been sent yet
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(
+            max_workers=min(_IAEA_LOOKUP_MAX_WORKERS, len(terms))
+        )
+        try:
+            lookups = [
+                executor.submit(_lookup_iaea_publication_url, q, stop=stop)
+                for q in terms
+            ]
+            for lookup in lookups:
+                url = lookup.result()
+                if url:
+                    return url
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    # Fallback: Brave Search (site:iaea.org/publications) for first 3 non-empty terms.
+    # Sequential on purpose: every Brave call spends paid quota.
     for q in queries[:3]:
         if not (q or "").strip():
             continue
@@ -910,84 +1239,156 @@ def _lookup_iaea_publication_url_multi(queries: list[str]) -> str | None:
     return None
 
 
+@_cached_per_run
 def _parse_iaea_superseded(html: str) -> tuple[str | None, str | None]:
     """Parse 'Superseded by: ...' and return (superseding_title, superseding_url)."""
     # Superseded by: <a href="...">Specific Safety Guide - SSG-20 (Rev. 1)</a>
-    m = re.search(
-        r'Superseded\s+by\s*:\s*<a\s+href="([^"]+)"[^>]*>([^<]+)</a>',
-        html,
-        re.IGNORECASE | re.DOTALL,
-    )
+    m = _IAEA_SUPERSEDED_LINK_RE.search(html)
     if m:
         url, title = m.group(1), m.group(2).strip()
         if url.startswith("/"):
             url = "https://www.iaea.org" + url
         return title, url
     # Fallback: Superseded by: Some text (maybe without link)
-    m = re.search(r"Superseded\s+by\s*:\s*([^\n<]+)", html, re.IGNORECASE)
+    m = _IAEA_SUPERSEDED_TEXT_RE.search(html)
     if m:
         return m.group(1).strip(), None
     return None, None
 
 
+# Per-folder file listings: (directory mtimes seen while walking, (name, path) of files).
+# A listing is reused while no directory in it changed; cleared per update run.
+_dir_listing_lock = threading.Lock()
+_dir_listing_cache: dict[
+    Path, tuple[tuple[tuple[str, int], ...], tuple[tuple[str, str], ...]]
+] = {}
+
+
+def _dir_mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _walk_files(
+    root: str, dirs: list[tuple[str, int]], files: list[tuple[str, str]]
+) -> None:
+    """Collect files under root via os.scandir (type info comes from readdir, unlike rglob).
+    Symlinked directories are not followed; unreadable directories are skipped.
+    """
+    # Stat before listing so a change during the scan invalidates the listing next time
+    mtime = _dir_mtime_ns(root)
+    if mtime is None:
+        return
+    dirs.append((root, mtime))
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    _walk_files(entry.path, dirs, files)
+                elif entry.is_file():
+                    files.append((entry.name, entry.path))
+    except OSError:
+        return
+
+
+def _list_files(root: Path) -> tuple[tuple[str, str], ...]:
+    """(name, path) of every file under root; re-walked only when a directory's mtime changed."""
+    cached = _dir_listing_cache.get(root)
+    if cached is not None and all(_dir_mtime_ns(d) == m for d, m in cached[0]):
+        return cached[1]
+    dirs: list[tuple[str, int]] = []
+    files: list[tuple[str, str]] = []
+    _walk_files(str(root), dirs, files)
+    listing = tuple(files)
+    with _dir_listing_lock:
+        _dir_listing_cache[root] = (tuple(dirs), listing)
+    return listing
+
+
 def get_local_pdf_path(source: DocumentSource) -> Path | None:
     """Return path to the local PDF for this source, or None if not found."""
     folder_path = DOCS_DIR / source.folder
     if not folder_path.exists():
         return None
-    pdfs = list(folder_path.rglob("*.pdf"))
+    pdfs = [(n, p) for n, p in _list_files(folder_path) if n.endswith(".pdf")]
     if source.filename_hint:
-        for p in sorted(pdfs):
-            if source.filename_hint in p.name:
-                return p
-        return None
+        matches = [Path(p) for n, p in pdfs if source.filename_hint in n]
+        return min(matches) if matches else None
     if len(pdfs) == 1:
-        return pdfs[0]
+        return Path(pdfs[0][1])
     return None
 
 
-def _get_current_version_from_file(source: DocumentSource) -> str | None:
-    """Infer current version from disk: version file (Danish), or file mtime (filename_hint)."""
-    cache_key = f"{DOCS_DIR}|{source.id}|{source.folder}|{source.filename_hint or ''}"
-    with _current_version_cache_lock:
-        if cache_key in _current_version_cache:
-            return _current_version_cache[cache_key]
-
+def _read_current_version_from_file(source: DocumentSource) -> str | None:
     folder_path = DOCS_DIR / source.folder
     if not folder_path.exists():
-        with _current_version_cache_lock:
-            _current_version_cache[cache_key] = None
         return None
     # Danish: ingestion writes {source_id}_version.txt with the label we ingested
     if source.folder == "Bekendtgørelse":
         version_file = folder_path / f"{source.id}_version.txt"
         if version_file.exists():
             try:
-                v = version_file.read_text(encoding="utf-8").strip()
-                with _current_version_cache_lock:
-                    _current_version_cache[cache_key] = v
-                return v
+                return version_file.read_text(encoding="utf-8").strip()
             except OSError:
                 pass
     # Fallback: match by filename_hint and use mtime as date
     if source.filename_hint:
-        for p in folder_path.rglob("*"):
-            if source.filename_hint in p.name:
-                mtime = datetime.fromtimestamp(p.stat().st_mtime)
-                v = mtime.strftime("%Y-%m-%d")
-                with _current_version_cache_lock:
-                    _current_version_cache[cache_key] = v
-                return v
-    with _current_version_cache_lock:
-        _current_version_cache[cache_key] = None
+        for name, path in _list_files(folder_path):
+            if source.filename_hint in name:
+                # File mtime is read fresh: in-place rewrites do not touch the folder
+                mtime = datetime.fromtimestamp(os.stat(path).st_mtime)
+                return mtime.strftime("%Y-%m-%d")
     return None
 
 
+def _get_current_version_from_file(source: DocumentSource) -> str | None:
+    """Infer current version from disk: version file (Danish), or file mtime (filename_hint)."""
+    cache_key = f"{DOCS_DIR}|{source.id}|{source.folder}|{source.filename_hint or ''}"
+    cached = _current_version_cache.get(cache_key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    # One disk lookup per key: concurrent callers wait on the key's lock, then re-check
+    with _current_version_cache_lock:
+        key_lock = _current_version_key_locks.setdefault(cache_key, threading.Lock())
+    with key_lock:
+        cached = _current_version_cache.get(cache_key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+        version = _read_current_version_from_file(source)
+        with _current_version_cache_lock:
+            _current_version_cache[cache_key] = version
+            _current_version_key_locks.pop(cache_key, None)
+    return version
+
+
+def _probe_validators(
+    url: str, etag: str | None, last_modified: str | None
+) -> tuple[int, str | None, str | None]:
+    """Conditional HEAD (GET without reading the body if HEAD is refused). Returns (status, ETag, Last-Modified)."""
+    headers = dict(_HTTP.headers)
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    resp = _HTTP.request("HEAD", url, headers=headers)
+    if resp.status in (405, 501):
+        resp = _HTTP.request("GET", url, headers=headers, preload_content=False)
+        resp.close()  # only the headers are needed; do not pull the document
+        resp.release_conn()
+    return resp.status, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+
 def check_one_source(
     source: DocumentSource,
     versions: dict[str, dict[str, str]],
+    *,
+    baselines: dict[str, dict[str, str]] | None = None,
 ) -> dict[str, Any]:
-    """Check a single source for updates. Returns dict for API response."""
+    """Check a single source for updates. Returns dict for API response.
+    baselines, when given, collects validators first seen for generic URLs (saved by check_updates).
+    """
     current = (
         versions.get(source.id, {}).get("version")
         or source.version
@@ -1134,26 +1535,34 @@ def check_one_source(
                 result["update_available"] = False
 
         else:
-            # Generic: HEAD request for direct PDF or last-modified
-            req = urllib.request.Request(
-                source.url,
-                method="HEAD",
-                headers={"User-Agent": "RadiationSafetyRAG/1.0"},
+            # Generic (e.g. direct PDF): conditional request against the validators
+            # recorded for the copy we have; 304 means unchanged
+            seen = versions.get(source.id, {})
+            seen_etag, seen_lm = (
+                seen.get("etag") or None,
+                seen.get("last_modified") or None,
             )
-            with urllib.request.urlopen(
-                req, timeout=REQUEST_TIMEOUT, context=ssl.create_default_context()
-            ) as resp:
-                lm = resp.headers.get("Last-Modified")
-                if lm:
-                    result["remote_version"] = lm
-                    result["remote_date"] = lm
-                result["download_url"] = source.url
-                if not current:
-                    result["update_available"] = True
-                elif lm:
-                    result["update_available"] = (
-                        True  # Conservative: assume update if we have a date
-                    )
+            status, etag, lm = _probe_validators(source.url, seen_etag, seen_lm)
+            if status >= 400:
+                raise ValueError(f"HTTP {status}: {source.url}")
+            if status == 304:
+                etag, lm = seen_etag, seen_lm
+            if lm:
+                result["remote_version"] = lm
+                result["remote_date"] = lm
+            result["download_url"] = source.url
+            if not current:
+                result["update_available"] = True
+            elif seen_etag or seen_lm:
+                result["update_available"] = (etag, lm) != (seen_etag, seen_lm)
+            elif etag or lm:
+                # First check since ingest (which resets the entry): what the server
+                # serves now is taken as the ingested copy
+                if baselines is not None:
+                    baselines[source.id] = {
+                        "etag": etag or "",
+                        "last_modified": lm or "",
+                    }
 
     except Exception as e:
         result["error"] = str(e)
@@ -1163,18 +1572,100 @@ def check_one_source(
     return result
 
 
+CHECK_MAX_WORKERS = 4
+CHECK_MAX_PER_HOST = 2
+
+
+def _parse_ttl_sec(env_var: str, default: float) -> float:
+    """Read env var as seconds; default when missing or invalid (never fails at import)."""
+    raw = (os.getenv(env_var) or "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+# check_updates reuses a source's last result this long while its registry entry,
+# stored version and local file are unchanged (dashboard refreshes); 0 disables.
+CHECK_RESULT_TTL_SECONDS = _parse_ttl_sec("DOCUMENT_CHECK_TTL_SECONDS", 3600.0)
+_check_result_cache_lock = threading.Lock()
+_check_result_cache: dict[str, tuple[tuple[Any, ...], float, dict[str, Any]]] = {}
+
+
+def _check_fingerprint(
+    source: DocumentSource, versions: dict[str, dict[str, str]]
+) -> tuple[Any, ...]:
+    """What a cached check result depends on locally: registry entry, stored version, local file."""
+    local_path = get_local_pdf_path(source)
+    try:
+        mtime_ns = local_path.stat().st_mtime_ns if local_path else None
+    except OSError:
+        mtime_ns = None
+    stored = versions.get(source.id, {}).get("version")
+    return (repr(source), stored, str(local_path), mtime_ns)
+
+
+def _hosts_round_robin(registry: list[DocumentSource]) -> tuple[list[int], list[str]]:
+    """(registry indexes interleaved across URL hosts, host per index) so workers spread over hosts."""
+    hosts = [urllib.parse.urlparse(s.url or "").netloc.lower() for s in registry]
+    by_host: dict[str, list[int]] = {}
+    for i, host in enumerate(hosts):
+        by_host.setdefault(host, []).append(i)
+    order = [
+        i for batch in zip_longest(*by_host.values()) for i in batch if i is not None
+    ]
+    return order, hosts
+
+
 def check_updates() -> list[dict[str, Any]]:
     """Load registry and version state, check each source (one Brave request per document, in parallel), return list of status dicts."""
     _reset_runtime_caches()
     registry = _load_registry()
     versions = _load_versions()
+    fingerprints = [_check_fingerprint(source, versions) for source in registry]
+    now = time.monotonic()
+    fresh: dict[int, dict[str, Any]] = {}
+    for i, source in enumerate(registry):
+        cached = _check_result_cache.get(source.id)
+        if (
+            cached is not None
+            and cached[0] == fingerprints[i]
+            and now - cached[1] < CHECK_RESULT_TTL_SECONDS
+        ):
+            fresh[i] = dict(cached[2])
+    if len(fresh) < len(registry):
+        # Only pay for warm-up when at least one source goes to the network
+        brave = (BRAVE_API_HOST,) if os.getenv("BRAVE_SEARCH_API_KEY") else ()
+        _warm_connections((*WARM_HOSTS, *brave))
     # One request per document; run checks in parallel with bounded concurrency to avoid rate limits.
-    max_workers = min(4, max(1, len(registry)))
-    results_by_index: dict[int, dict[str, Any]] = {}
+    # Pooled connections are shared per host; at most CHECK_MAX_PER_HOST checks hit one host at once.
+    max_workers = min(CHECK_MAX_WORKERS, max(1, len(registry)))
+    order, hosts = _hosts_round_robin(registry)
+    host_slots = {
+        host: threading.BoundedSemaphore(CHECK_MAX_PER_HOST) for host in set(hosts)
+    }
+
+    baselines: dict[str, dict[str, str]] = {}
+
+    def _check(i: int) -> dict[str, Any]:
+        source = registry[i]
+        with host_slots[hosts[i]] if hosts[i] else nullcontext():
+            result = check_one_source(source, versions, baselines=baselines)
+        if not result.get("error"):
+            with _check_result_cache_lock:
+                _check_result_cache[source.id] = (
+                    fingerprints[i],
+                    time.monotonic(),
+                    dict(result),
+                )
+        return result
+
+    results_by_index: dict[int, dict[str, Any]] = dict(fresh)
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         future_to_index = {
-            executor.submit(check_one_source, s, versions): i
-            for i, s in enumerate(registry)
+            executor.submit(_check, i): i for i in order if i not in fresh
         }
         for future in as_completed(future_to_index):
             i = future_to_index[future]
@@ -1187,6 +1678,12 @@ def check_updates() -> list[dict[str, Any]]:
                     "error": str(e),
                     "update_available": False,
                 }
+    if baselines:
+        # Re-read: versions may have changed on disk while the checks ran
+        latest = _load_versions()
+        for source_id, validators in baselines.items():
+            latest.setdefault(source_id, {}).update(validators)
+        _save_versions(latest)
     return [results_by_index[i] for i in range(len(registry))]
 
 
@@ -1222,10 +1719,36 @@ def update_source_identity(
     _save_versions(versions)
 
 
+_RESOLVE_MAX_WORKERS = 8
+
+
+def _resolve_danish_sources_via_eli(
+    sources: list[DocumentSource], versions: dict[str, dict[str, str]]
+) -> list[tuple[ResolvedUrl, dict[str, Any] | None]]:
+    """Resolve each source's newest ELI URL concurrently; results keep the input order."""
+
+    def resolve(source: DocumentSource) -> tuple[ResolvedUrl, dict[str, Any] | None]:
+        current_version = (
+            versions.get(source.id, {}).get("version")
+            or source.version
+            or _get_current_version_from_file(source)
+        )
+        return _resolve_danish_source_via_eli(
+            source, current_version=current_version, reject_older=False
+        )
+
+    if not sources:
+        return []
+    with ThreadPoolExecutor(
+        max_workers=min(_RESOLVE_MAX_WORKERS, len(sources))
+    ) as executor:
+        return list(executor.map(resolve, sources))
+
+
 def sync_danish_legislation(*, apply_updates: bool = False) -> dict[str, Any]:
     """Run Harvest + ELI incremental sync for Danish retsinformation sources."""
     _reset_runtime_caches()
-    registry = _load_registry()
+    registry = [s for s in _load_registry() if _is_retsinformation_danish_source(s)]
     versions = _load_versions()
     subscription_key = (os.getenv("RETSINFO_API_KEY") or "").strip() or None
     harvest_report = run_incremental_harvest(
@@ -1234,17 +1757,11 @@ def sync_danish_legislation(*, apply_updates: bool = False) -> dict[str, Any]:
     )
     items: list[dict[str, Any]] = []
     updated_count = 0
-    for source in registry:
-        if not _is_retsinformation_danish_source(source):
-            continue
-        current_version = (
-            versions.get(source.id, {}).get("version")
-            or source.version
-            or _get_current_version_from_file(source)
-        )
-        resolved, evidence = _resolve_danish_source_via_eli(
-            source, current_version=current_version, reject_older=False
-        )
+    # Resolution is network-bound and independent per source: overlap it, then
+    # apply registry/version writes one by one in registry order
+    for source, (resolved, evidence) in zip(
+        registry, _resolve_danish_sources_via_eli(registry, versions), strict=True
+    ):
         if not resolved.url:
             items.append(
                 {
@@ -1296,16 +1813,12 @@ def _update_registry_field(source_id: str, field: str, value: str) -> None:
     """Update one field for a source in document_sources.yaml."""
     if not REGISTRY_PATH.exists():
         return
-    with open(REGISTRY_PATH, encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+    data = _registry_data_for_update()
     for s in data.get("sources") or []:
         if isinstance(s, dict) and (s.get("id") or "").strip() == source_id.strip():
             s[field] = value.strip()
             break
-    with open(REGISTRY_PATH, "w", encoding="utf-8") as f:
-        yaml.dump(
-            data, f, default_flow_style=False, allow_unicode=True, sort_keys=False
-        )
+    _write_registry_data(data)
 
 
 def update_registry_version(source_id: str, version: str) -> None:
@@ -1368,10 +1881,7 @@ def append_source_to_registry(
     version: str | None = None,
 ) -> None:
     """Append a new source to document_sources.yaml. Ensures source_id is unique by appending -1, -2 if needed."""
-    data: dict[str, Any] = {}
-    if REGISTRY_PATH.exists():
-        with open(REGISTRY_PATH, encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+    data = _registry_data_for_update()
     sources: list[dict[str, Any]] = list(data.get("sources") or [])
     existing_ids = {s.get("id") for s in sources if isinstance(s, dict) and s.get("id")}
     sid = source_id
@@ -1379,7 +1889,6 @@ def append_source_to_registry(
     while sid in existing_ids:
         c += 1
         sid = f"{source_id}-{c}"
-        existing_ids.add(sid)
     entry = {
         "id": sid,
         "name": name,
@@ -1391,7 +1900,4 @@ def append_source_to_registry(
     sources.append(entry)
     data["sources"] = sources
     REGISTRY_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(REGISTRY_PATH, "w", encoding="utf-8") as f:
-        yaml.dump(
-            data, f, default_flow_style=False, allow_unicode=True, sort_keys=False
-        )
+    _write_registry_data(data)
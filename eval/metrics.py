@@ -209,27 +209,30 @@ def compute_all_metrics(
     context_used_for_generation: str = "",
     **kwargs: Any,
 ) -> dict[str, float]:
-    """Compute faithfulness, answer_relevance, context_precision, context_recall (0–1 each)."""
-    precision_fn = (
-        context_precision_per_chunk if use_per_chunk_precision else context_precision
+    """Compute faithfulness, answer_relevance, context_precision, context_recall (0–1 each).
+
+    faithfulness and answer_relevance share one generation-grader verdict, and
+    context_precision / context_recall share one sufficiency verdict when both
+    fall back to it, so each distinct grader input costs a single LLM call.
+    """
+    faith = faithfulness(
+        question,
+        generation,
+        documents,
+        llm=llm,
+        context_used_for_generation=context_used_for_generation,
     )
+    if use_per_chunk_precision:
+        precision = context_precision_per_chunk(question, documents, llm=llm)
+    else:
+        precision = context_precision(question, documents, llm=llm)
+    if key_facts is None and not use_per_chunk_precision:
+        recall = precision
+    else:
+        recall = context_recall(question, documents, key_facts=key_facts, llm=llm)
     return {
-        "faithfulness": faithfulness(
-            question,
-            generation,
-            documents,
-            llm=llm,
-            context_used_for_generation=context_used_for_generation,
-        ),
-        "answer_relevance": answer_relevance(
-            question,
-            generation,
-            documents,
-            llm=llm,
-            context_used_for_generation=context_used_for_generation,
-        ),
-        "context_precision": precision_fn(question, documents, llm=llm),
-        "context_recall": context_recall(
-            question, documents, key_facts=key_facts, llm=llm
-        ),
+        "faithfulness": faith,
+        "answer_relevance": faith,
+        "context_precision": precision,
+        "context_recall": recall,
     }
@@ -6,7 +6,8 @@ export interface SourceInfo {
 export interface QueryResponse {
   answer: string
   sources: SourceInfo[]
-  chat_history: [string, string][]  // [[q,a],[q,a],...]
+  new_turn: [string, string]  // [question, answer] of this turn
+  chat_history?: [string, string][]  // deprecated: only filled with ?include_history=true
   warning?: string | null
   used_web_search?: boolean
   used_web_search_label?: string | null  // in question's language
@@ -1,9 +1,46 @@
 /// <reference types="vitest/config" />
-import { defineConfig } from 'vite'
+import { readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs'
+import { join, resolve } from 'node:path'
+import { brotliCompressSync, constants as zlibConstants, gzipSync } from 'node:zlib'
+import { defineConfig, type Plugin } from 'vite'
 import react from '@vitejs/plugin-react'
 
+const PRECOMPRESS_EXTENSIONS = /\.(html|js|css|svg|json|txt|map)$/
+const PRECOMPRESS_MIN_BYTES = 1024
+
+/** Write .br and .gz next to text build outputs so the backend (and nginx gzip_static) serve them without compressing per request. */
+function precompress(): Plugin {
+  let outDir = 'dist'
+  const walk = (dir: string): string[] =>
+    readdirSync(dir).flatMap((name) => {
+      const path = join(dir, name)
+      return statSync(path).isDirectory() ? walk(path) : [path]
+    })
+  return {
+    name: 'precompress',
+    apply: 'build',
+    configResolved(config) {
+      outDir = resolve(config.root, config.build.outDir)
+    },
+    closeBundle() {
+      for (const file of walk(outDir)) {
+        if (!PRECOMPRESS_EXTENSIONS.test(file)) continue
+        const content = readFileSync(file)
+        if (content.length < PRECOMPRESS_MIN_BYTES) continue
+        writeFileSync(`${file}.gz`, gzipSync(content, { level: 9 }))
+        writeFileSync(
+          `${file}.br`,
+          brotliCompressSync(content, {
+            params: { [zlibConstants.BROTLI_PARAM_QUALITY]: zlibConstants.BROTLI_MAX_QUALITY },
+          }),
+        )
+      }
+    },
+  }
+}
+
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), precompress()],
   test: {
     environment: 'jsdom',
     setupFiles: ['./src/test/setup.ts'],
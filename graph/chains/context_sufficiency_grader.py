@@ -5,6 +5,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
+from graph.chains.structured import structured_chain
 from graph.llm_factory import get_llm
 
 
@@ -31,4 +32,4 @@ sufficiency_prompt = ChatPromptTemplate.from_messages(
 def get_context_sufficiency_grader(llm: BaseChatModel | None = None) -> Runnable:
     """Return context sufficiency grader. Uses get_llm() if llm is None."""
     model = llm or get_llm()
-    return sufficiency_prompt | model.with_structured_output(GradeSufficiency)
+    return structured_chain(sufficiency_prompt, model, GradeSufficiency)
@@ -5,6 +5,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
+from graph.chains.structured import structured_chain
 from graph.llm_factory import get_llm
 
 
@@ -58,4 +59,4 @@ prompt = ChatPromptTemplate.from_messages(
 def get_generation_grader(llm: BaseChatModel | None = None) -> Runnable:
     """Return a grader chain that produces GradeGeneration(passed, missing_info)."""
     model = llm or get_llm()
-    return prompt | model.with_structured_output(GradeGeneration)
+    return structured_chain(prompt, model, GradeGeneration)
@@ -5,6 +5,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 from pydantic import BaseModel, ConfigDict, Field
 
+from graph.chains.structured import structured_chain
 from graph.llm_factory import get_llm
 
 
@@ -31,4 +32,4 @@ hallucination_prompt = ChatPromptTemplate.from_messages(
 def get_hallucination_grader(llm: BaseChatModel | None = None) -> Runnable:
     """Return hallucination grader for the given LLM. Uses get_llm() if llm is None."""
     model = llm or get_llm()
-    return hallucination_prompt | model.with_structured_output(GradeHallucinations)
+    return structured_chain(hallucination_prompt, model, GradeHallucinations)
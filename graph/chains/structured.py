@@ -0,0 +1,38 @@
+"""Reuse structured-output grader chains per LLM instance."""
+
+import threading
+from collections import OrderedDict
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
+
+# with_structured_output builds a JSON schema and a new Runnable on every call.
+# Chat models are unhashable pydantic objects, so key on id(); the entry keeps the
+# model itself to rule out a reused id. Bounded because each entry keeps its model
+# (and API key) alive: a few graders for each of get_cached_llm's instances.
+_CHAINS_MAX_ENTRIES = 128
+_chains: OrderedDict[
+    tuple[int, int, type[BaseModel]], tuple[BaseChatModel, Runnable]
+] = OrderedDict()
+_chains_lock = threading.Lock()
+
+
+def structured_chain(
+    prompt: ChatPromptTemplate, model: BaseChatModel, schema: type[BaseModel]
+) -> Runnable:
+    """Return ``prompt | model.with_structured_output(schema)``, built once per model."""
+    key = (id(model), id(prompt), schema)
+    with _chains_lock:
+        hit = _chains.get(key)
+        if hit is not None and hit[0] is model:
+            _chains.move_to_end(key)
+            return hit[1]
+    chain = prompt | model.with_structured_output(schema)
+    with _chains_lock:
+        _chains[key] = (model, chain)
+        _chains.move_to_end(key)
+        while len(_chains) > _CHAINS_MAX_ENTRIES:
+            _chains.popitem(last=False)
+    return chain
@@ -24,9 +24,11 @@ def truncate_docs_for_grader(
     parts: list[str] = []
     total = 0
     for d in documents:
-        text = (d.page_content or "")[:max_chars_per_doc]
+        text = d.page_content
         if not text:
             continue
+        if len(text) > max_chars_per_doc:
+            text = text[:max_chars_per_doc]
         if total + len(text) + 2 > max_context_chars:
             remaining = max_context_chars - total - 20
             if remaining > 0:
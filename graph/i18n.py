@@ -1,5 +1,7 @@
 """Message strings in the language of the user's question (for warnings and labels)."""
 
+from functools import lru_cache
+
 # LangChain BraveSearch returns list of {title, link, snippet}; we use "link" for URL
 try:
     from langdetect import DetectorFactory, detect
@@ -9,6 +11,9 @@ except Exception:
     detect = None
 
 
+# One /query runs detection on the same question in several nodes and in the API;
+# langdetect is seeded (deterministic), so results are safe to memoize.
+@lru_cache(maxsize=1024)
 def detect_language(question: str) -> str:
     """Return ISO 639-1 code (e.g. 'en', 'de', 'da') from question text. Falls back to 'en'."""
     if not question or not question.strip():
@@ -1,6 +1,9 @@
 """LLM and embeddings factory based on LLM_PROVIDER env."""
 
+import hashlib
 import os
+import threading
+from collections import OrderedDict
 
 ALLOWED_PROVIDERS = frozenset({"mistral", "gemini", "openai", "ollama"})
 
@@ -96,6 +99,42 @@ def get_llm(
         return ChatMistralAI(temperature=0, api_key=key)
 
 
+_LLM_CACHE_MAX_ENTRIES = 64
+_llm_cache: OrderedDict[tuple[str, str, str], object] = OrderedDict()
+_llm_cache_lock = threading.Lock()
+
+
+def get_cached_llm(
+    provider: str | None = None,
+    api_key: str | None = None,
+    model_variant: str | None = None,
+) -> "object":  # BaseChatModel
+    """Like get_llm, but reuse one instance (and its HTTP connection pool) per provider/variant/key.
+
+    The cache key holds only a hash of the API key. Env-based settings are read
+    when an instance is first created, so changing them requires a restart.
+    """
+    key_hash = hashlib.blake2b((api_key or "").encode(), digest_size=16).hexdigest()
+    cache_key = ((provider or "").lower(), model_variant or "", key_hash)
+    with _llm_cache_lock:
+        llm = _llm_cache.get(cache_key)
+        if llm is not None:
+            _llm_cache.move_to_end(cache_key)
+            return llm
+    llm = get_llm(provider=provider, api_key=api_key, model_variant=model_variant)
+    with _llm_cache_lock:
+        _llm_cache[cache_key] = llm
+        while len(_llm_cache) > _LLM_CACHE_MAX_ENTRIES:
+            _llm_cache.popitem(last=False)
+    return llm
+
+
+def clear_llm_cache() -> None:
+    """Drop cached LLM instances (e.g. after rotating API keys)."""
+    with _llm_cache_lock:
+        _llm_cache.clear()
+
+
 def get_embedding_provider(llm_provider: str | None = None) -> str:
     """Return which embedding backend to use for retrieval.
 
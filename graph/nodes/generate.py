@@ -5,7 +5,7 @@ from typing import Any
 from langchain_core.runnables import RunnableConfig
 
 from graph.chains.generation import get_generation_chain
-from graph.llm_factory import get_llm
+from graph.llm_factory import get_cached_llm
 from graph.state import GraphState
 from graph.utils import throttle_llm_if_needed
 
@@ -37,7 +37,7 @@ def generate(state: GraphState, config: RunnableConfig | None = None) -> dict[st
     documents = state["documents"]
     chat_history = state.get("chat_history") or []
     cfg = config or {}
-    llm = state.get("llm") or get_llm()
+    llm = state.get("llm") or get_cached_llm()
     throttle_llm_if_needed()
     chain = get_generation_chain(llm)
 
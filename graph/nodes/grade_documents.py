@@ -6,9 +6,9 @@ from langchain_core.runnables import RunnableConfig
 
 from graph.chains.context_sufficiency_grader import get_context_sufficiency_grader
 from graph.chains.truncate import truncate_docs_for_grader
-from graph.llm_factory import get_llm
+from graph.llm_factory import get_cached_llm
 from graph.state import GraphState
-from graph.utils import throttle_llm_if_needed
+from graph.utils import invoke_grader_cached
 
 
 def grade_documents(
@@ -19,7 +19,7 @@ def grade_documents(
     documents = state["documents"]
     privacy_mode = state.get("privacy_mode", False)
     cfg = config or {}
-    llm = state.get("llm") or get_llm()
+    llm = state.get("llm") or get_cached_llm()
 
     if not documents:
         return {
@@ -29,11 +29,13 @@ def grade_documents(
         }
 
     truncated = truncate_docs_for_grader(documents)
-    throttle_llm_if_needed()
-    sufficiency = get_context_sufficiency_grader(llm)
-    sufficient = sufficiency.invoke(
+    grader_cache = state.get("grader_cache") or {}
+    sufficient = invoke_grader_cached(
+        grader_cache,
+        "context_sufficiency",
+        get_context_sufficiency_grader(llm),
         {"question": question, "context": truncated},
-        config=cfg,
+        cfg,
     )
     web_search = not sufficient.binary_score
 
@@ -45,4 +47,5 @@ def grade_documents(
         "documents": list(documents),
         "trusted_documents": list(documents),
         "web_search": web_search,
+        "grader_cache": grader_cache,
     }
@@ -10,9 +10,9 @@ from graph.chains.truncate import (
     MAX_CONTEXT_CHARS_GENERATION_GRADER,
     truncate_docs_for_grader,
 )
-from graph.llm_factory import get_llm
+from graph.llm_factory import get_cached_llm
 from graph.state import GraphState
-from graph.utils import throttle_llm_if_needed
+from graph.utils import invoke_grader_cached
 
 _SENTINEL = "retry"
 
@@ -31,7 +31,7 @@ def grade_generation(
     documents = state["documents"]
     generation = state["generation"]
     cfg = config or {}
-    llm = state.get("llm") or get_llm()
+    llm = state.get("llm") or get_cached_llm()
 
     context_used = state.get("context_used_for_generation")
     if context_used and context_used.strip():
@@ -45,15 +45,25 @@ def grade_generation(
     else:
         docs_str = "No documents"
 
-    throttle_llm_if_needed()
-    grader = get_generation_grader(llm)
-    score = grader.invoke(
+    grader_cache = state.get("grader_cache") or {}
+    score = invoke_grader_cached(
+        grader_cache,
+        "generation",
+        get_generation_grader(llm),
         {"documents": docs_str, "question": question, "generation": generation},
-        config=cfg,
+        cfg,
     )
 
     if score.passed:
-        return {"generation_passed_grading": True, "reflection": ""}
+        return {
+            "generation_passed_grading": True,
+            "reflection": "",
+            "grader_cache": grader_cache,
+        }
 
     reflection = score.missing_info.strip() or _SENTINEL
-    return {"generation_passed_grading": False, "reflection": reflection}
+    return {
+        "generation_passed_grading": False,
+        "reflection": reflection,
+        "grader_cache": grader_cache,
+    }
@@ -7,10 +7,14 @@ from langchain_core.runnables import RunnableConfig
 from graph.chains.context_sufficiency_grader import get_context_sufficiency_grader
 from graph.chains.missing_query_chain import invoke_missing_query_chain
 from graph.chains.truncate import truncate_docs_for_grader
-from graph.llm_factory import get_embedding_provider, get_llm
+from graph.llm_factory import get_cached_llm, get_embedding_provider
 from graph.nodes.retrieval_common import invoke_dual_retrievers, merge_unique_documents
 from graph.state import GraphState
-from graph.utils import chat_context_prefix, throttle_llm_if_needed
+from graph.utils import (
+    chat_context_prefix,
+    invoke_grader_cached,
+    throttle_llm_if_needed,
+)
 
 
 def retrieve_missing(
@@ -22,7 +26,7 @@ def retrieve_missing(
     trusted = list(state.get("trusted_documents") or [])
     chat_history = state.get("chat_history") or []
     cfg = config or {}
-    llm = state.get("llm") or get_llm()
+    llm = state.get("llm") or get_cached_llm()
 
     doc_context = "\n\n".join(d.page_content for d in existing) if existing else "None."
     context_str = (
@@ -44,13 +48,15 @@ def retrieve_missing(
     trusted_merged = list(trusted) + new_docs
 
     sufficient = False
+    grader_cache = state.get("grader_cache") or {}
     if merged:
         truncated = truncate_docs_for_grader(merged)
-        throttle_llm_if_needed()
-        sufficiency = get_context_sufficiency_grader(llm)
-        result = sufficiency.invoke(
+        result = invoke_grader_cached(
+            grader_cache,
+            "context_sufficiency",
+            get_context_sufficiency_grader(llm),
             {"question": question, "context": truncated},
-            config=cfg,
+            cfg,
         )
         sufficient = bool(result.binary_score)
 
@@ -58,6 +64,7 @@ def retrieve_missing(
         "documents": merged,
         "trusted_documents": trusted_merged,
         "sufficient_after_missing": sufficient,
+        "grader_cache": grader_cache,
     }
     # Only increment retrieval_count when in the initial flow (not retry-after-generation).
     if (state.get("retry_after_generation_count") or 0) == 0:
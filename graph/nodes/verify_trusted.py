@@ -17,10 +17,10 @@ from graph.i18n import (
     get_warning_not_verified_after_web,
     get_warning_not_verified_trusted_only,
 )
-from graph.llm_factory import get_llm
+from graph.llm_factory import get_cached_llm
 from graph.nodes.web_search import run_trusted_only_search
 from graph.state import GraphState
-from graph.utils import throttle_llm_if_needed
+from graph.utils import invoke_grader_cached
 
 
 def verify_trusted(
@@ -32,8 +32,9 @@ def verify_trusted(
     web_search_attempted = state.get("web_search_attempted", False)
     question = state.get("question") or ""
     cfg = config or {}
-    llm = state.get("llm") or get_llm()
+    llm = state.get("llm") or get_cached_llm()
     grader = get_hallucination_grader(llm)
+    grader_cache = state.get("grader_cache") or {}
 
     if not trusted_docs:
         lang = detect_language(question)
@@ -49,24 +50,32 @@ def verify_trusted(
         )
         if not ctx.strip():
             return False
-        throttle_llm_if_needed()
-        score = grader.invoke(
+        score = invoke_grader_cached(
+            grader_cache,
+            "hallucination",
+            grader,
             {"documents": ctx, "generation": generation},
-            config=cfg,
+            cfg,
         )
         return bool(score.binary_score)
 
     if is_supported(trusted_docs):
-        return {"trusted_verified": True}
+        return {"trusted_verified": True, "grader_cache": grader_cache}
 
     if web_search_attempted:
         supplemental = run_trusted_only_search(question, llm=llm, config=cfg)
         if supplemental:
             extra = Document(page_content=supplemental, metadata={})
             if is_supported(trusted_docs + [extra]):
-                return {"trusted_verified": True}
+                return {"trusted_verified": True, "grader_cache": grader_cache}
         lang = detect_language(question)
-        return {"retrieval_warning": get_warning_not_verified_after_web(lang)}
+        return {
+            "retrieval_warning": get_warning_not_verified_after_web(lang),
+            "grader_cache": grader_cache,
+        }
 
     lang = detect_language(question)
-    return {"retrieval_warning": get_warning_not_verified_trusted_only(lang)}
+    return {
+        "retrieval_warning": get_warning_not_verified_trusted_only(lang),
+        "grader_cache": grader_cache,
+    }
@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from datetime import date
 from typing import Any
 
+_SSL_CONTEXT = ssl.create_default_context()
+
 RELATION_KEYS = (
     "changed_by",
     "consolidated_by",
@@ -24,6 +26,7 @@ PREFERRED_FORWARD_KEYS = (
     "is_changed_by",
     "is_consolidated_by",
 )
+_ELI_LTA_RE = re.compile(r"/eli/lta/(\d+)/(\d+)(?:/|$|\?)")
 _ISSUE_DATE_RE = re.compile(
     r"BEK\s+nr\s+(\d+)\s+af\s+(\d{1,2})/(\d{1,2})/(\d{2,4})",
     re.IGNORECASE,
@@ -94,7 +97,7 @@ def _extract_label(meta: dict[str, Any]) -> str | None:
 
 
 def _extract_year_nr(url: str) -> tuple[int, int] | None:
-    m = re.search(r"/eli/lta/(\d+)/(\d+)(?:/|$|\?)", url or "")
+    m = _ELI_LTA_RE.search(url or "")
     if not m:
         return None
     return int(m.group(1)), int(m.group(2))
@@ -122,9 +125,7 @@ def _fetch_json(url: str) -> dict[str, Any] | None:
         url,
         headers={"Accept": "application/json", "User-Agent": "RadiationSafetyRAG/1.0"},
     )
-    with urllib.request.urlopen(
-        req, timeout=20, context=ssl.create_default_context()
-    ) as resp:
+    with urllib.request.urlopen(req, timeout=20, context=_SSL_CONTEXT) as resp:
         data = json.load(resp)
     if isinstance(data, dict):
         return data
@@ -17,6 +17,7 @@ from typing import Any
 HARVEST_API_BASE = "https://api.retsinformation.dk"
 HARVEST_MIN_SECONDS_BETWEEN_CALLS = 10.0
 ELI_UPDATE_FEED_URL = "https://www.retsinformation.dk/eli/eli-update-feed.atom"
+_SSL_CONTEXT = ssl.create_default_context()  # shared; loads the CA store once
 
 _harvest_lock = threading.Lock()
 _last_harvest_request: list[float] = [0.0]
@@ -62,9 +63,7 @@ def _json_get(url: str, headers: dict[str, str] | None = None) -> Any:
         },
     )
     _throttle_harvest_requests()
-    with urllib.request.urlopen(
-        req, timeout=30, context=ssl.create_default_context()
-    ) as resp:
+    with urllib.request.urlopen(req, timeout=30, context=_SSL_CONTEXT) as resp:
         return json.load(resp)
 
 
@@ -170,9 +169,7 @@ def fetch_eli_update_feed_entries(
             "User-Agent": "RadiationSafetyRAG/1.0",
         },
     )
-    with urllib.request.urlopen(
-        req, timeout=30, context=ssl.create_default_context()
-    ) as resp:
+    with urllib.request.urlopen(req, timeout=30, context=_SSL_CONTEXT) as resp:
         content = resp.read()
     root = ET.fromstring(content)
     atom_ns = {"atom": "http://www.w3.org/2005/Atom"}
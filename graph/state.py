@@ -1,6 +1,6 @@
 """Graph state for RAG pipeline."""
 
-from typing import Literal, NotRequired, TypedDict
+from typing import Any, Literal, NotRequired, TypedDict
 
 from langchain_core.documents import Document
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -54,5 +54,7 @@ class GraphState(TypedDict):
     # Written by GRADE_GENERATION node; read by route_after_grade_generation.
     # True = generation passed; False = needs retry/web-search/end.
     generation_passed_grading: NotRequired[bool]
+    # Grader results for this run keyed by (grader, inputs); see invoke_grader_cached.
+    grader_cache: NotRequired[dict[tuple, Any]]
     # True when running in Ollama privacy mode (fully local, no external API calls)
     privacy_mode: NotRequired[bool]
@@ -2,6 +2,9 @@
 
 import os
 import time
+from typing import Any
+
+from langchain_core.runnables import Runnable, RunnableConfig
 
 from graph.consts import env_bool
 
@@ -47,3 +50,25 @@ def throttle_llm_if_needed() -> None:
     delay = _parse_delay_sec("MISTRAL_MIN_DELAY_SEC")
     if delay > 0:
         time.sleep(delay)
+
+
+def invoke_grader_cached(
+    cache: dict[tuple, Any],
+    name: str,
+    grader: Runnable,
+    inputs: dict[str, str],
+    config: RunnableConfig | None = None,
+) -> Any:
+    """Invoke a grader once per identical inputs within one graph run.
+
+    cache is the run's state["grader_cache"]. Hits skip both the LLM call and
+    throttle_llm_if_needed (e.g. when RETRIEVE_MISSING adds only documents that
+    fall outside the truncated grader context).
+    """
+    key = (name, *sorted(inputs.items()))
+    if key in cache:
+        return cache[key]
+    throttle_llm_if_needed()
+    result = grader.invoke(inputs, config=config)
+    cache[key] = result
+    return result
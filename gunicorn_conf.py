@@ -0,0 +1,32 @@
+"""Gunicorn settings for the backend: Uvicorn worker(s) behind one master.
+
+Usage: gunicorn -c gunicorn_conf.py api.main:app
+
+uvicorn[standard] installs uvloop and httptools; the Uvicorn worker picks them
+automatically (loop/http "auto"). Runs a single worker: ingest locking and status
+and the in-memory rate limiter are process-local, so extra workers could ingest
+concurrently and each allow the full rate. (Cached answers and retrievers follow the
+on-disk index generation stamp across processes.) WEB_CONCURRENCY > 1 is refused
+until that state is shared too.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+try:
+    workers = int(os.getenv("WEB_CONCURRENCY") or 1)
+except ValueError:
+    workers = 1
+if workers > 1:
+    raise RuntimeError(
+        "WEB_CONCURRENCY > 1 is not supported: ingestion state and caches are "
+        "per process, so run a single worker."
+    )
+worker_class = "uvicorn_worker.UvicornWorker"
+# Import the app in the master so import errors fail at startup, not in the worker
+preload_app = True
+# RAG queries with LLM throttling can take well over gunicorn's 30 s default
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 10
+accesslog = "-"
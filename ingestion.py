@@ -60,6 +60,7 @@ DOCS_DIR = PROJECT_ROOT / "documents"
 _BACKUP_DIR = PROJECT_ROOT / "documents" / "backup" / "Bekendtgørelse"
 _CHROMA_DIR = PROJECT_ROOT / ".chroma"
 _MAX_BACKUPS_PER_SOURCE = 2
+_WHITESPACE_RE = re.compile(r"\s+")
 
 
 def rotate_backups(
@@ -144,7 +145,7 @@ def _xml_to_text(xml_path: Path) -> str:
         if elem.tail:
             parts.append(elem.tail)
     text = "".join(parts)
-    return re.sub(r"\s+", " ", text).strip()
+    return _WHITESPACE_RE.sub(" ", text).strip()
 
 
 def _load_retsinformation_xml(xml_path: Path, source_label: str) -> list[Document]:
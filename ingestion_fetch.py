@@ -24,6 +24,18 @@ _ALLOWED_HOSTS = frozenset(
 _TIMEOUT = 30
 _MAX_SIZE = 50 * 1024 * 1024  # 50 MB per PDF
 _MAX_XML_SIZE = 5 * 1024 * 1024  # 5 MB per XML document
+# Built once: creating a context loads the system CA store; it is safe to share.
+_SSL_CONTEXT = ssl.create_default_context()
+
+# IAEA publication page PDF links: absolute, MTCD/Publications path, same-origin path
+_PDF_HREF_RE = re.compile(r'href="(https?://[^"]+\.pdf[^"]*)"', re.IGNORECASE)
+_MTCD_PDF_HREF_RE = re.compile(
+    r'href="([^"]*MTCD/Publications/PDF/[^"]+\.pdf[^"]*)"', re.IGNORECASE
+)
+_RELATIVE_PDF_HREF_RE = re.compile(r'href="(/[^"]*\.pdf[^"]*)"', re.IGNORECASE)
+_BEK_LABEL_RE = re.compile(
+    r"BEK\s+nr\s+\d+\s+af\s+\d{1,2}/\d{1,2}/\d{4}", re.IGNORECASE
+)
 
 
 def _allowed(url: str) -> bool:
@@ -47,7 +59,7 @@ def _download_to_temp(url: str) -> Path | None:
     req = urllib.request.Request(url, headers={"User-Agent": "RadiationSafetyRAG/1.0"})
     try:
         with urllib.request.urlopen(
-            req, timeout=_TIMEOUT, context=ssl.create_default_context()
+            req, timeout=_TIMEOUT, context=_SSL_CONTEXT
         ) as resp:
             size = int(resp.headers.get("Content-Length") or 0)
             if size > _MAX_SIZE:
@@ -103,7 +115,7 @@ def _download_xml(url: str) -> Path | None:
     )
     try:
         with urllib.request.urlopen(
-            req, timeout=_TIMEOUT, context=ssl.create_default_context()
+            req, timeout=_TIMEOUT, context=_SSL_CONTEXT
         ) as resp:
             size = int(resp.headers.get("Content-Length") or 0)
             if size > _MAX_XML_SIZE:
@@ -130,26 +142,18 @@ def get_pdf_url_iaea(publication_page_url: str, html: str | None = None) -> str
         )
         try:
             with urllib.request.urlopen(
-                req, timeout=_TIMEOUT, context=ssl.create_default_context()
+                req, timeout=_TIMEOUT, context=_SSL_CONTEXT
             ) as resp:
                 html = resp.read(50000).decode("utf-8", errors="replace")
         except (urllib.error.HTTPError, urllib.error.URLError):
             return None
     # Match href to PDF (full URL or path to MTCD/Publications/PDF)
-    m = re.search(
-        r'href="(https?://[^"]+\.pdf[^"]*)"',
-        html,
-        re.IGNORECASE,
-    )
+    m = _PDF_HREF_RE.search(html)
     if m:
         url = m.group(1).split('"')[0].split(" ")[0]
         if "iaea" in url.lower():
             return url
-    m = re.search(
-        r'href="([^"]*MTCD/Publications/PDF/[^"]+\.pdf[^"]*)"',
-        html,
-        re.IGNORECASE,
-    )
+    m = _MTCD_PDF_HREF_RE.search(html)
     if m:
         path = m.group(1).strip()
         if not path.startswith("http"):
@@ -158,11 +162,7 @@ def get_pdf_url_iaea(publication_page_url: str, html: str | None = None) -> str
             )
         return path
     # Some pages use relative or same-origin PDF path
-    m = re.search(
-        r'href="(/[^"]*\.pdf[^"]*)"',
-        html,
-        re.IGNORECASE,
-    )
+    m = _RELATIVE_PDF_HREF_RE.search(html)
     if m:
         path = m.group(1).strip()
         return "https://www.iaea.org" + path
@@ -208,9 +208,7 @@ def _label_from_danish_xml(xml_path: Path) -> str | None:
     """Try to extract a BEK version label from Danish XML content (first 2k chars)."""
     try:
         text = xml_path.read_text(encoding="utf-8", errors="ignore")[:2048]
-        m = re.search(
-            r"BEK\s+nr\s+\d+\s+af\s+\d{1,2}/\d{1,2}/\d{4}", text, re.IGNORECASE
-        )
+        m = _BEK_LABEL_RE.search(text)
         if m:
             return m.group(0).strip()
     except Exception:
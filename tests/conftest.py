@@ -1,6 +1,6 @@
 """Pytest fixtures shared across tests."""
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
@@ -39,6 +39,7 @@ def mock_graph():
 
     graph = MagicMock()
     graph.invoke.side_effect = _invoke
+    graph.ainvoke = AsyncMock(side_effect=_invoke)
     return graph
 
 
@@ -48,6 +49,8 @@ def client(mock_graph):
     from api.main import app, app_state
 
     app_state["graph"] = mock_graph
+    app_state.pop("query_cache", None)
+    app_state["ingest_status"] = "idle"
     with TestClient(app) as c:
         c.headers.update({"X-Admin-Token": "test-admin-token"})
         yield c
@@ -60,6 +63,8 @@ def unauth_client(mock_graph):
     from api.main import app, app_state
 
     app_state["graph"] = mock_graph
+    app_state.pop("query_cache", None)
+    app_state["ingest_status"] = "idle"
     with TestClient(app) as c:
         yield c
     app_state["graph"] = None
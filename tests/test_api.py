@@ -1,7 +1,7 @@
 """API endpoint tests."""
 
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -37,19 +37,62 @@ def test_metrics_returns_prometheus_style(client: TestClient):
     assert "# TYPE radiationsafety_graph_loaded gauge" in text
 
 
+def test_health_etag_revalidation(client: TestClient):
+    """Health sends an ETag for graph state and answers matching polls with 304."""
+    first = client.get("/health")
+    etag = first.headers.get("ETag")
+    assert etag == '"1"'
+    assert first.headers.get("Cache-Control") == "no-cache"
+    second = client.get("/health", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    stale = client.get("/health", headers={"If-None-Match": '"0"'})
+    assert stale.status_code == 200
+
+
 def test_query_returns_answer(client: TestClient):
-    """Query endpoint returns answer, sources, and chat_history."""
+    """Query endpoint returns answer, sources, and the new turn (not the full history)."""
     res = client.post("/query", json={"question": "What is radiation protection?"})
     assert res.status_code == 200
     data = res.json()
     assert "answer" in data
     assert "sources" in data
-    assert "chat_history" in data
     assert isinstance(data["sources"], list)
-    assert isinstance(data["chat_history"], list)
     assert "Test answer from mocked graph" in data["answer"]
-    assert len(data["chat_history"]) == 1
-    assert data["chat_history"][0][0] == "What is radiation protection?"
+    assert data["new_turn"] == ["What is radiation protection?", data["answer"]]
+    assert data["chat_history"] == []
+
+
+def test_query_include_history_returns_full_chat_history(client: TestClient):
+    """?include_history=true keeps the legacy full chat_history echo."""
+    res = client.post(
+        "/query?include_history=true",
+        json={
+            "question": "And for apprentices?",
+            "chat_history": [["What is the dose limit?", "20 mSv"]],
+        },
+    )
+    assert res.status_code == 200
+    history = res.json()["chat_history"]
+    assert len(history) == 2
+    assert history[0] == ["What is the dose limit?", "20 mSv"]
+    assert history[1][0] == "And for apprentices?"
+
+
+def test_config_reports_server_llm_key_from_startup(mock_graph, monkeypatch):
+    """/config reflects LLM keys present in the environment when the app started."""
+    from api.main import app, app_state
+
+    monkeypatch.delenv("MISTRAL_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("GOOGLE_API_KEY", "server-key")
+    app_state["graph"] = mock_graph
+    with TestClient(app) as c:
+        assert c.get("/api/config").json() == {"server_has_llm_key": True}
+    monkeypatch.setenv("GOOGLE_API_KEY", " ")
+    with TestClient(app) as c:
+        assert c.get("/api/config").json() == {"server_has_llm_key": False}
+    app_state["graph"] = None
 
 
 def test_query_requires_question(client: TestClient):
@@ -58,6 +101,21 @@ def test_query_requires_question(client: TestClient):
     assert res.status_code == 422
 
 
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"question": "x" * 10_001},
+        {"question": "q", "chat_history": [["q", "a"]] * 21},
+        {"question": "q", "chat_history": [["q", "a" * 20_001]]},
+        {"question": "q", "api_keys": {"openai": "k" * 257}},
+    ],
+)
+def test_query_rejects_oversized_input(client: TestClient, body: dict):
+    """Input limits are enforced during request parsing (422), before the graph runs."""
+    res = client.post("/query", json=body)
+    assert res.status_code == 422
+
+
 def test_query_empty_question(client: TestClient):
     """Query accepts empty string question (validation may vary)."""
     res = client.post("/query", json={"question": ""})
@@ -94,6 +152,123 @@ def test_query_api_key_error_when_openai_selected_no_key(
     assert "API key" in data["detail"]
 
 
+def test_openapi_lists_each_route_once(client: TestClient):
+    """Root-level aliases still work but only /api routes appear in the schema."""
+    paths = client.get("/openapi.json").json()["paths"]
+    assert "/api/query" in paths
+    assert "/query" not in paths
+    assert client.get("/health").status_code == 200
+
+
+def test_root_serves_preloaded_index_html(client: TestClient, monkeypatch):
+    """Root serves the index.html bytes loaded at startup and revalidates via ETag."""
+    import api.main
+
+    monkeypatch.setattr(api.main, "_INDEX_HTML_BYTES", b"<html>app</html>")
+    res = client.get("/")
+    assert res.status_code == 200
+    assert res.text == "<html>app</html>"
+    assert res.headers.get("cache-control") == "no-cache"
+    etag = res.headers["etag"]
+    cached = client.get("/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    monkeypatch.setattr(api.main, "_INDEX_HTML_BYTES", b"<html>new build</html>")
+    assert client.get("/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_root_shows_instructions_when_frontend_not_built(
+    client: TestClient, monkeypatch
+):
+    """Without a frontend build, root serves the static instructions page."""
+    import api.main
+
+    monkeypatch.setattr(api.main, "_INDEX_HTML_BYTES", None)
+    res = client.get("/")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/html")
+    assert "npm run build" in res.text
+
+
+def test_root_serves_precompressed_index_html(client: TestClient, monkeypatch):
+    """Root sends the build's precompressed index.html when the client accepts it."""
+    import gzip
+
+    import api.main
+
+    html = b"<html>" + b"app " * 500 + b"</html>"
+    monkeypatch.setattr(api.main, "_INDEX_HTML_BYTES", html)
+    monkeypatch.setattr(
+        api.main, "_INDEX_HTML_PRECOMPRESSED", {"gzip": gzip.compress(html)}
+    )
+    res = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert res.headers.get("content-encoding") == "gzip"
+    assert res.content == html
+    plain = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert plain.headers.get("content-encoding") is None
+    assert plain.content == html
+
+
+def test_static_assets_prefer_precompressed_files(tmp_path: Path):
+    """Hashed assets are served from .gz siblings (not recompressed) and cached."""
+    import gzip
+
+    from fastapi import FastAPI
+    from fastapi.middleware.gzip import GZipMiddleware
+
+    from api.main import _ImmutableStaticFiles
+
+    js = b"console.log('radiation safety');" * 100
+    (tmp_path / "app-abc123.js").write_bytes(js)
+    (tmp_path / "app-abc123.js.gz").write_bytes(gzip.compress(js))
+    static_app = FastAPI()
+    static_app.add_middleware(GZipMiddleware, minimum_size=1000)
+    static_app.mount("/assets", _ImmutableStaticFiles(directory=str(tmp_path)))
+    with TestClient(static_app) as c:
+        res = c.get("/assets/app-abc123.js", headers={"Accept-Encoding": "gzip"})
+        plain = c.get("/assets/app-abc123.js", headers={"Accept-Encoding": "br"})
+    assert res.status_code == 200
+    assert res.headers["content-encoding"] == "gzip"
+    assert "javascript" in res.headers["content-type"]
+    assert res.content == js
+    assert "immutable" in res.headers["cache-control"]
+    assert plain.headers.get("content-encoding") is None
+    assert plain.content == js
+
+
+def test_spa_mount_serves_files_and_falls_back_to_index(tmp_path: Path, monkeypatch):
+    """Top-level build files are served as-is; client routes get index.html, api/* 404s."""
+    from fastapi import FastAPI
+
+    import api.main
+    from api.main import _SpaStaticFiles
+
+    (tmp_path / "favicon.svg").write_text("<svg/>")
+    (tmp_path / "settings").write_text("not the SPA")
+    monkeypatch.setattr(api.main, "_INDEX_HTML_BYTES", b"<html>spa</html>")
+    spa_app = FastAPI()
+    spa_app.mount("/", _SpaStaticFiles(directory=str(tmp_path), html=True))
+    with TestClient(spa_app) as c:
+        icon = c.get("/favicon.svg")
+        route = c.get("/documents/settings")
+        extensionless = c.get("/settings")
+        api_miss = c.get("/api/unknown")
+        head = c.head("/documents/settings")
+        posted = c.post("/documents/settings")
+        revalidated = c.get(
+            "/favicon.svg", headers={"If-None-Match": icon.headers["etag"]}
+        )
+    assert icon.status_code == 200
+    assert icon.text == "<svg/>"
+    assert revalidated.status_code == 304
+    assert route.status_code == 200
+    assert route.text == "<html>spa</html>"
+    assert extensionless.text == "<html>spa</html>"
+    assert api_miss.status_code == 404
+    assert head.status_code == 200
+    assert posted.status_code == 405
+
+
 def test_query_non_question_short_circuit(client: TestClient):
     """Thank you / acknowledgments bypass graph and return friendly response."""
     res = client.post("/query", json={"question": "Thank you"})
@@ -101,15 +276,306 @@ def test_query_non_question_short_circuit(client: TestClient):
     data = res.json()
     assert "You're welcome" in data["answer"]
     assert data["sources"] == []
-    assert len(data["chat_history"]) == 1
-    assert data["chat_history"][0][0] == "Thank you"
+    assert data["new_turn"] == ["Thank you", data["answer"]]
+
+
+def test_query_large_answer_is_gzip_compressed(client: TestClient):
+    """Large JSON answers are gzip-encoded when the client accepts it."""
+    from api.main import app_state
+
+    long_answer = "Dose limits apply to occupational exposure. " * 100
+    mock = MagicMock()
+    mock.ainvoke = AsyncMock(
+        return_value={
+            "generation": long_answer,
+            "documents": [],
+            "chat_history": [],
+            "retrieval_warning": None,
+        }
+    )
+    app_state["graph"] = mock
+    res = client.post(
+        "/query",
+        json={"question": "What are the dose limits?"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert res.status_code == 200
+    assert res.headers.get("content-encoding") == "gzip"
+    assert res.json()["answer"] == long_answer
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("  Thanks ", True),
+        ("Got it", True),
+        ("tschüss", True),
+        ("?!...", True),
+        ("___", True),
+        ("ok thanks, and the dose limit?", False),
+        ("What is the annual dose limit?", False),
+        ("Strålebeskyttelse", False),
+    ],
+)
+def test_is_non_question(text: str, expected: bool):
+    """Acknowledgements and punctuation-only input are detected as non-questions."""
+    from api.main import _is_non_question
+
+    assert _is_non_question(text) is expected
+
+
+def test_resolve_model_and_key(monkeypatch):
+    """Unknown models fall back to gemini; keys are picked for the resolved provider."""
+    import api.main
+
+    monkeypatch.setattr(api.main, "_DEFAULT_PROVIDER", "mistral")
+    resolve = api.main._resolve_model_and_key
+    assert resolve(None, None) == ("mistral", None)
+    assert resolve("OpenAI", {"openai": "sk-test"}) == ("openai", "sk-test")
+    assert resolve("unknown", {"gemini": "g-key"}) == ("gemini", "g-key")
+    assert resolve("gemini", {"gemini": ""}) == ("gemini", None)
+
+
+def test_query_repeated_question_served_from_cache(client: TestClient, mock_graph):
+    """Identical standalone questions hit the response cache instead of the graph."""
+    first = client.post("/query", json={"question": "What is the dose limit?"})
+    second = client.post("/query", json={"question": "  what is the DOSE limit "})
+    assert first.headers.get("X-Cache") == "MISS"
+    assert second.headers.get("X-Cache") == "HIT"
+    assert second.json()["answer"] == first.json()["answer"]
+    assert mock_graph.ainvoke.await_count == 1
+
+
+def test_query_cache_scoped_per_client_api_key(client: TestClient, mock_graph):
+    """Answers produced with a client key are not served to other keys or keyless callers."""
+
+    def ask(api_keys: dict[str, str] | None):
+        body: dict = {"question": "What is the dose limit?", "model": "mistral"}
+        if api_keys:
+            body["api_keys"] = api_keys
+        return client.post("/query", json=body).headers.get("X-Cache")
+
+    assert ask({"mistral": "key-a"}) == "MISS"
+    assert ask({"mistral": "key-b"}) == "MISS"
+    assert ask({"mistral": "key-a"}) == "HIT"
+    assert mock_graph.ainvoke.await_count == 2
+
+
+def test_query_cache_bypassed_for_follow_ups(client: TestClient, mock_graph):
+    """Questions with chat history always run the graph."""
+    body = {
+        "question": "And for apprentices?",
+        "chat_history": [["What is the dose limit?", "20 mSv"]],
+    }
+    client.post("/query", json=body)
+    res = client.post("/query", json=body)
+    assert res.headers.get("X-Cache") is None
+    assert mock_graph.ainvoke.await_count == 2
+
+
+def test_query_cache_semantic_lookup_respects_threshold_and_scope():
+    """Semantic lookup returns close matches within the same scope only."""
+    from api.query_cache import QueryCache
+
+    cache = QueryCache(max_entries=2)
+    cache.put("a", "answer-a", scope="gemini:", embedding=[1.0, 0.0])
+    assert cache.get_similar([0.99, 0.05], scope="gemini:", threshold=0.95) == (
+        "answer-a"
+    )
+    assert cache.get_similar([0.0, 1.0], scope="gemini:", threshold=0.95) is None
+    assert cache.get_similar([1.0, 0.0], scope="ollama:", threshold=0.95) is None
+    cache.put("b", "answer-b", scope="gemini:")
+    cache.put("c", "answer-c", scope="gemini:")
+    assert cache.get("a") is None
+    assert len(cache) == 2
+
+
+def test_query_sources_deduplicated_in_retrieval_order(client: TestClient):
+    """Sources are unique per (source, document_type) and keep first-seen order."""
+    from langchain_core.documents import Document
+
+    from api.main import app_state
+
+    docs = [
+        Document(
+            page_content="a", metadata={"source": "GSR Part 3", "document_type": "iaea"}
+        ),
+        Document(
+            page_content="b", metadata={"source": "BEK 669", "document_type": "dk_law"}
+        ),
+        Document(
+            page_content="c", metadata={"source": "GSR Part 3", "document_type": "iaea"}
+        ),
+        Document(page_content="d", metadata={}),
+    ]
+    mock = MagicMock()
+    mock.ainvoke = AsyncMock(
+        return_value={"generation": "Answer", "documents": docs, "chat_history": []}
+    )
+    app_state["graph"] = mock
+    res = client.post("/query", json={"question": "Which documents apply?"})
+    assert res.status_code == 200
+    assert res.json()["sources"] == [
+        {"source": "GSR Part 3", "document_type": "iaea"},
+        {"source": "BEK 669", "document_type": "dk_law"},
+        {"source": "retrieved", "document_type": None},
+    ]
+
+
+def test_query_sources_capped(client: TestClient):
+    """At most _MAX_SOURCES unique sources are returned, in retrieval order."""
+    from langchain_core.documents import Document
+
+    from api.main import _MAX_SOURCES, app_state
+
+    docs = [
+        Document(page_content=str(i), metadata={"source": f"doc-{i}"})
+        for i in range(_MAX_SOURCES + 5)
+    ]
+    mock = MagicMock()
+    mock.ainvoke = AsyncMock(
+        return_value={"generation": "Answer", "documents": docs, "chat_history": []}
+    )
+    app_state["graph"] = mock
+    res = client.post("/query", json={"question": "List all documents"})
+    sources = res.json()["sources"]
+    assert len(sources) == _MAX_SOURCES
+    assert sources[0]["source"] == "doc-0"
+
+
+async def test_query_concurrent_identical_questions_share_one_graph_run(
+    client: TestClient,
+):
+    """Concurrent identical questions are coalesced into a single graph invocation."""
+    import asyncio
+
+    import httpx
+
+    from api.main import app, app_state
+
+    calls = 0
+
+    async def _slow_invoke(inputs, config=None):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"generation": "Shared answer", "documents": [], "chat_history": []}
+
+    mock = MagicMock()
+    mock.ainvoke = AsyncMock(side_effect=_slow_invoke)
+    app_state["graph"] = mock
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        responses = await asyncio.gather(
+            *(ac.post("/query", json={"question": "What is ALARA?"}) for _ in range(3))
+        )
+    assert [r.json()["answer"] for r in responses] == ["Shared answer"] * 3
+    assert calls == 1
+
+
+async def test_query_concurrent_questions_with_different_keys_run_separately(
+    client: TestClient,
+):
+    """Coalescing never shares a graph run between different client API keys."""
+    import asyncio
+
+    import httpx
+
+    from api.main import app, app_state
+
+    seen_llms: list[object] = []
+
+    async def _slow_invoke(inputs, config=None):
+        seen_llms.append(inputs["llm"])
+        await asyncio.sleep(0.05)
+        return {"generation": "Answer", "documents": [], "chat_history": []}
+
+    mock = MagicMock()
+    mock.ainvoke = AsyncMock(side_effect=_slow_invoke)
+    app_state["graph"] = mock
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        await asyncio.gather(
+            *(
+                ac.post(
+                    "/query",
+                    json={
+                        "question": "What is ALARA?",
+                        "model": "mistral",
+                        "api_keys": {"mistral": key},
+                    },
+                )
+                for key in ("key-a", "key-b", "key-a")
+            )
+        )
+    assert len(seen_llms) == 2
+    assert seen_llms[0] is not seen_llms[1]
+
+
+async def test_query_limits_concurrent_graph_runs_per_provider(
+    client: TestClient, monkeypatch
+):
+    """Distinct questions beyond LLM_MAX_CONCURRENCY_<PROVIDER> wait for a free slot."""
+    import asyncio
+
+    import httpx
+
+    from api.main import app, app_state
+
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY_GEMINI", "2")
+    app_state.pop("llm_semaphores", None)
+    running = peak = 0
+
+    async def _slow_invoke(inputs, config=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return {"generation": "Answer", "documents": [], "chat_history": []}
+
+    mock = MagicMock()
+    mock.ainvoke = AsyncMock(side_effect=_slow_invoke)
+    app_state["graph"] = mock
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        responses = await asyncio.gather(
+            *(
+                ac.post("/query", json={"question": f"What is dose limit {i}?"})
+                for i in range(5)
+            )
+        )
+    app_state.pop("llm_semaphores", None)
+    assert all(r.status_code == 200 for r in responses)
+    assert mock.ainvoke.await_count == 5
+    assert peak == 2
+
+
+@pytest.mark.parametrize(
+    ("error", "status"),
+    [
+        ("429 Too Many Requests", 429),
+        ("RESOURCE_EXHAUSTED: try later", 429),
+        ("Monthly QUOTA exceeded", 429),
+        ("connection reset", 500),
+    ],
+)
+def test_query_maps_provider_errors(client: TestClient, error: str, status: int):
+    """Provider quota errors become 429 regardless of case; others become 500."""
+    from api.main import app_state
+
+    mock = MagicMock()
+    mock.ainvoke = AsyncMock(side_effect=RuntimeError(error))
+    app_state["graph"] = mock
+    res = client.post("/query", json={"question": "What is ALARA?"})
+    assert res.status_code == status
 
 
 def test_query_returns_warning_when_set(client: TestClient):
     """Query endpoint returns warning when retrieval_warning is set."""
     from api.main import app, app_state
 
-    mock = __import__("unittest.mock", fromlist=["MagicMock"]).MagicMock()
+    mock = MagicMock()
 
     def _invoke(inputs, config=None):
         return {
@@ -122,7 +588,7 @@ def test_query_returns_warning_when_set(client: TestClient):
             "retrieval_warning": "Die Websuche konnte keine ausreichend guten Quellen liefern.",
         }
 
-    mock.invoke.side_effect = _invoke
+    mock.ainvoke = AsyncMock(side_effect=_invoke)
     app_state["graph"] = mock
     with TestClient(app) as c:
         res = c.post("/query", json={"question": "test"})
@@ -234,6 +700,22 @@ def test_public_routes_stay_accessible_without_admin_token(unauth_client: TestCl
     assert query.status_code == 200
 
 
+def test_query_disables_tracing_only_for_client_keys(client: TestClient):
+    """LangSmith tracing is switched off when the client sends its own API keys."""
+    with patch("api.main.ls.tracing_context") as tracing_context:
+        client.post("/query", json={"question": "What is radiation safety?"})
+        tracing_context.assert_not_called()
+        client.post(
+            "/query",
+            json={
+                "question": "What is a dosimeter?",
+                "model": "mistral",
+                "api_keys": {"mistral": "test-key"},
+            },
+        )
+    tracing_context.assert_called_once_with(enabled=False)
+
+
 def test_query_rate_limit_returns_429(client: TestClient, monkeypatch):
     """Query endpoint returns 429 when in-memory rate limit is exceeded."""
     from api.main import app_state
@@ -408,7 +890,7 @@ def test_metrics_count_query_web_search_attempts(client: TestClient):
     from api.main import app_state
 
     app_state["request_metrics"]["query_web_search_attempts"] = 0
-    mock = __import__("unittest.mock", fromlist=["MagicMock"]).MagicMock()
+    mock = MagicMock()
 
     def _invoke(inputs, config=None):
         question = inputs.get("question", "")
@@ -422,7 +904,7 @@ def test_metrics_count_query_web_search_attempts(client: TestClient):
             "retrieval_warning": None,
         }
 
-    mock.invoke.side_effect = _invoke
+    mock.ainvoke = AsyncMock(side_effect=_invoke)
     app_state["graph"] = mock
     client.post("/query", json={"question": "Need latest guidance"})
     res = client.get("/metrics")
@@ -440,7 +922,7 @@ def test_metrics_include_query_outcome_labels(client: TestClient):
     from api.main import app_state
 
     app_state["request_metrics"]["query_outcomes_total"] = {}
-    mock = __import__("unittest.mock", fromlist=["MagicMock"]).MagicMock()
+    mock = MagicMock()
 
     def _invoke(inputs, config=None):
         question = inputs.get("question", "")
@@ -456,7 +938,7 @@ def test_metrics_include_query_outcome_labels(client: TestClient):
             "trusted_verified": True,
         }
 
-    mock.invoke.side_effect = _invoke
+    mock.ainvoke = AsyncMock(side_effect=_invoke)
     app_state["graph"] = mock
     client.post("/query", json={"question": "Need guidance"})
     res = client.get("/metrics")
@@ -476,6 +958,71 @@ def test_ingest_returns_accepted(client: TestClient):
     assert data.get("status") == "accepted"
 
 
+def test_ingest_rejects_second_trigger_while_running(client: TestClient):
+    """A second POST ingest before the first task finishes returns 409."""
+    with patch("api.main._run_ingest"):
+        first = client.post("/api/ingest")
+        second = client.post("/api/ingest")
+    assert first.status_code == 202
+    assert second.status_code == 409
+    assert client.get("/api/ingest/status").json()["status"] == "running"
+
+
+def test_run_ingest_clears_query_cache(tmp_path):
+    """Answers cached before re-ingestion are dropped once ingestion completes."""
+    import asyncio
+
+    from api.main import _run_ingest, app_state
+    from api.query_cache import QueryCache
+
+    cache = QueryCache()
+    cache.put("key", "stale answer", scope="gemini:")
+    app_state["query_cache"] = cache
+    app_state["ingest_status"] = "running"
+    try:
+        with (
+            patch.dict("sys.modules", {"ingestion": MagicMock()}),
+            patch("api.main._ingest_executor", return_value=None),
+            patch("api.main._INDEX_GENERATION_PATH", tmp_path / "index_generation"),
+        ):
+            asyncio.run(_run_ingest())
+    finally:
+        app_state.pop("query_cache", None)
+    assert len(cache) == 0
+    assert app_state["ingest_status"] == "idle"
+    assert (tmp_path / "index_generation").exists()
+
+
+def test_index_generation_change_clears_caches_in_other_processes(tmp_path):
+    """A stamp written by another process's ingest drops this process's caches once."""
+    from api.main import _sync_index_generation, app_state
+    from api.query_cache import QueryCache
+
+    stamp = tmp_path / "index_generation"
+    ingestion = MagicMock()
+    cache = QueryCache()
+    cache.put("key", "stale answer", scope="gemini:")
+    app_state["query_cache"] = cache
+    app_state["index_generation"] = None
+    try:
+        with (
+            patch.dict("sys.modules", {"ingestion": ingestion}),
+            patch("api.main._INDEX_GENERATION_PATH", stamp),
+        ):
+            _sync_index_generation()
+            assert len(cache) == 1
+            stamp.write_text("1", encoding="utf-8")
+            _sync_index_generation()
+            assert len(cache) == 0
+            cache.put("key", "fresh answer", scope="gemini:")
+            _sync_index_generation()
+            assert len(cache) == 1
+    finally:
+        app_state.pop("query_cache", None)
+        app_state["index_generation"] = None
+    ingestion.clear_retrievers_cache.assert_called_once()
+
+
 def test_documents_set_source_url_rejects_disallowed_url(client: TestClient):
     """PATCH source URL returns 400 when URL is not from iaea.org or retsinformation.dk."""
     res = client.patch(
@@ -518,6 +1065,43 @@ def test_documents_set_source_url_ok(client: TestClient):
     )
 
 
+def test_documents_add_pdf_rejects_bad_upload_without_touching_existing(
+    client: TestClient, tmp_path: Path, monkeypatch
+):
+    """Non-PDF or oversized uploads get 400 and leave an existing file in place."""
+    import api.main
+
+    monkeypatch.setattr(api.main, "_PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(api.main, "_MAX_PDF_UPLOAD_BYTES", 64)
+    existing = tmp_path / "documents" / "IAEA" / "doc.pdf"
+    existing.parent.mkdir(parents=True)
+    existing.write_bytes(b"%PDF-1.4 original")
+    for content in (b"<html>not a pdf</html>", b"%PDF-1.4 " + b"x" * 100):
+        res = client.post(
+            "/api/documents/add-pdf",
+            data={"folder": "IAEA"},
+            files={"file": ("doc.pdf", content, "application/pdf")},
+        )
+        assert res.status_code == 400
+    assert existing.read_bytes() == b"%PDF-1.4 original"
+    assert sorted(p.name for p in existing.parent.iterdir()) == ["doc.pdf"]
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        ("Bek 669 (2019).pdf", "Bek 669 2019.pdf"),
+        ("strålebeskyttelse_v2.pdf", "strålebeskyttelse_v2.pdf"),
+        ("../../etc/passwd", "....etcpasswd"),
+    ],
+)
+def test_upload_filename_sanitizing_keeps_unicode_letters(filename, expected):
+    """Unsafe characters are dropped; letters incl. æøå and "._- " are kept."""
+    from api.main import _UNSAFE_FILENAME_RE
+
+    assert _UNSAFE_FILENAME_RE.sub("", filename) == expected
+
+
 def test_documents_get_source_file_not_found(client: TestClient):
     """GET source file returns 404 when source_id is not in registry."""
     with patch("document_updates._load_registry", return_value=[]):
@@ -565,6 +1149,32 @@ def test_documents_get_source_file_ok(client: TestClient, tmp_path: Path):
     assert res.status_code == 200
     assert res.headers.get("content-type", "").startswith("application/pdf")
     assert res.content == b"%PDF-1.4 minimal"
+    assert res.headers["content-length"] == str(len(b"%PDF-1.4 minimal"))
+    assert res.headers.get("etag")
+
+
+def test_documents_get_source_file_is_not_gzipped(client: TestClient, tmp_path: Path):
+    """PDF downloads are sent uncompressed with their real Content-Length."""
+    from document_updates import DocumentSource
+
+    pdf = tmp_path / "large.pdf"
+    pdf.write_bytes(b"%PDF-1.4 " + b"stream " * 1000)
+    source = DocumentSource(
+        id="iaea-1",
+        name="Doc",
+        url="https://iaea.org/x",
+        folder="IAEA",
+        filename_hint=None,
+    )
+    with patch("document_updates._load_registry", return_value=[source]):
+        with patch("document_updates.get_local_pdf_path", return_value=pdf):
+            res = client.get(
+                "/api/documents/source/iaea-1/file",
+                headers={"Accept-Encoding": "gzip"},
+            )
+    assert res.status_code == 200
+    assert res.headers.get("content-encoding") is None
+    assert res.headers["content-length"] == str(pdf.stat().st_size)
 
 
 def test_documents_sync_danish(client: TestClient):
@@ -1,10 +1,24 @@
 """Tests for build_document_sources module."""
 
-from unittest.mock import patch
+import json
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pypdf import PdfWriter
 
 import build_document_sources as bds
 
 
+def _write_pdf(path, metadata):
+    writer = PdfWriter()
+    writer.add_blank_page(200, 200)
+    writer.add_metadata(metadata)
+    writer.write(str(path))
+    return path
+
+
 def test_build_sources_empty_when_no_docs(tmp_path):
     """When documents dirs are missing or empty, build_sources returns empty or only existing registry."""
     with patch.object(bds, "DOCS_DIR", tmp_path):
@@ -36,3 +50,360 @@ def test_extract_iaea_search_terms_nonexistent(tmp_path):
     assert any(
         "1380" in t or "tecdoc" in t.lower() or "iaea" in t.lower() for t in terms
     ) or "iaea tecdoc 1380" in [t.lower() for t in terms]
+
+
+@pytest.mark.parametrize("use_pdfium", [True, False])
+def test_pdf_metadata_feeds_title_and_search_terms(tmp_path, use_pdfium):
+    """Title comes from PDF metadata; subject identifiers become search terms (PDFium or pypdf)."""
+    if use_pdfium and bds.pypdfium2 is None:
+        pytest.skip("pypdfium2 not installed")
+    pdf = _write_pdf(
+        tmp_path / "guide.pdf",
+        {"/Title": "Radiation Protection Guide", "/Subject": "STI/PUB/1234"},
+    )
+    with patch.object(bds, "pypdfium2", bds.pypdfium2 if use_pdfium else None):
+        title, _version = bds._extract_pdf_title_and_version(pdf)
+        terms = bds._extract_iaea_search_terms(pdf)
+    assert title == "Radiation Protection Guide"
+    assert terms[:2] == ["STI/PUB/1234", "STI PUB 1234"]
+
+
+def test_pdf_parsed_once_for_title_and_search_terms(tmp_path):
+    """Title/version and IAEA search terms for the same unchanged PDF share one parse."""
+    pdf = _write_pdf(tmp_path / "cached.pdf", {"/Title": "Cached Guide"})
+    with patch.object(bds, "_read_pdf_uncached", wraps=bds._read_pdf_uncached) as read:
+        bds._extract_pdf_title_and_version(pdf)
+        bds._extract_pdf_title_and_version(pdf)
+        bds._extract_iaea_search_terms(pdf)
+    assert read.call_count == 1
+
+
+def test_search_terms_stat_and_parse_pdf_once(tmp_path):
+    """_extract_iaea_search_terms derives title/version from the same single read."""
+    pdf = _write_pdf(tmp_path / "guide.pdf", {"/Title": "Occupational Exposure"})
+    with (
+        patch.object(bds, "_pdf_cache_key", wraps=bds._pdf_cache_key) as stat,
+        patch.object(bds, "_read_pdf_uncached", wraps=bds._read_pdf_uncached) as read,
+    ):
+        terms = bds._extract_iaea_search_terms(pdf)
+    assert stat.call_count == 1
+    assert read.call_count == 1
+    assert "Occupational Exposure" in terms
+
+
+def test_danish_version_file_builds_eli_url(tmp_path):
+    """'BEK nr NNN af DD/MM/YYYY' in a *_version.txt maps to the ELI URL."""
+    bek = tmp_path / "Bekendtgørelse"
+    bek.mkdir()
+    (bek / "radioaktivitet_version.txt").write_text(
+        "BEK nr 669 af 01/07/2019", encoding="utf-8"
+    )
+    with patch.object(bds, "DOCS_DIR", tmp_path):
+        (source,) = bds._discover_danish_from_version_files()
+    assert source["url"] == "https://www.retsinformation.dk/eli/lta/2019/669"
+    assert source["name"] == "Radioaktivitetsbekendtgørelsen"
+
+
+def test_danish_pdf_covered_by_version_file_is_not_parsed(tmp_path):
+    """A {source_id}.pdf next to {source_id}_version.txt is skipped without opening it."""
+    bek = tmp_path / "Bekendtgørelse"
+    bek.mkdir()
+    (bek / "sst-kilder_version.txt").write_text("v1", encoding="utf-8")
+    _write_pdf(bek / "sst-kilder.pdf", {"/Title": "Åbne radioaktive kilder"})
+    _write_pdf(bek / "other.pdf", {"/Title": "Anden bekendtgørelse"})
+    with (
+        patch.object(bds, "DOCS_DIR", tmp_path),
+        patch.object(
+            bds,
+            "_extract_pdf_title_and_version",
+            wraps=bds._extract_pdf_title_and_version,
+        ) as extract,
+    ):
+        sources = bds._discover_danish_pdfs()
+    assert [s["filename_hint"] for s in sources] == ["other.pdf"]
+    assert extract.call_count == 1
+
+
+def test_build_sources_reads_version_files_once(tmp_path):
+    """build_sources hands its version-file discovery to the Danish PDF pass."""
+    bek = tmp_path / "Bekendtgørelse"
+    bek.mkdir()
+    (bek / "dk-a_version.txt").write_text("v1", encoding="utf-8")
+    with (
+        patch.object(bds, "DOCS_DIR", tmp_path),
+        patch.object(
+            bds,
+            "_discover_danish_from_version_files",
+            wraps=bds._discover_danish_from_version_files,
+        ) as discover,
+    ):
+        sources = bds.build_sources(confirm_urls=False)
+    assert discover.call_count == 1
+    assert [s["id"] for s in sources] == ["dk-a"]
+
+
+def test_prefetch_parses_pdfs_in_worker_processes(tmp_path):
+    """Discovery prefetches PDFs in parallel; the parent then reads them from cache."""
+    paths = [
+        _write_pdf(tmp_path / f"doc{i}.pdf", {"/Title": f"Guide {i}"}) for i in range(4)
+    ]
+    with patch.object(bds.os, "cpu_count", return_value=2):
+        bds._prefetch_pdf_reads(paths)
+    with patch.object(bds, "_read_pdf_uncached") as read:
+        titles = [bds._extract_pdf_title_and_version(p)[0] for p in paths]
+    read.assert_not_called()
+    assert titles == [f"Guide {i}" for i in range(4)]
+
+
+def test_build_sources_confirms_urls_concurrently(tmp_path):
+    """URL confirmations overlap in a thread pool instead of running one by one."""
+    bek = tmp_path / "Bekendtgørelse"
+    bek.mkdir()
+    for sid in ("dk-a", "dk-b"):
+        (bek / f"{sid}_version.txt").write_text("v1", encoding="utf-8")
+    barrier = threading.Barrier(2, timeout=5)
+
+    def confirm(source):
+        barrier.wait()
+        source["url"] = f"https://example.org/{source['id']}"
+
+    with (
+        patch.object(bds, "DOCS_DIR", tmp_path),
+        patch.object(bds, "_load_existing_registry", return_value=[]),
+        patch.object(bds, "_confirm_danish_url", side_effect=confirm),
+    ):
+        sources = bds.build_sources()
+    assert [(s["id"], s["url"]) for s in sources] == [
+        ("dk-a", "https://example.org/dk-a"),
+        ("dk-b", "https://example.org/dk-b"),
+    ]
+
+
+def test_scanned_first_page_falls_back_to_metadata_or_stem():
+    """Near-empty page-0 text (scanned PDFs) skips the version regexes."""
+    scan = Path("IAEA_scan-2020.pdf")
+    assert bds._title_and_version(scan, {}, "  SSG-3 \n") == (
+        "IAEA scan 2020",
+        "IAEA scan 2020",
+    )
+    assert bds._title_and_version(scan, {"title": "Scanned report"}, "") == (
+        "Scanned report",
+        "Scanned report",
+    )
+
+
+def test_merge_url_and_version_uses_registry_index():
+    """Registry entries are matched by id first, then by stripped name."""
+    by_id, by_name = bds._index_registry(
+        [
+            {"id": "a", "name": "Guide A", "url": "https://a", "version": "v1"},
+            {"id": "b", "name": " Guide B ", "url": "https://b"},
+            "not-a-dict",
+        ]
+    )
+    by_id_hit = bds._merge_url_and_version({"id": "a", "_path": "x"}, by_id, by_name)
+    assert by_id_hit == {"id": "a", "url": "https://a", "version": "v1"}
+    by_name_hit = bds._merge_url_and_version(
+        {"id": "new", "name": "Guide B"}, by_id, by_name
+    )
+    assert by_name_hit["url"] == "https://b"
+    miss = bds._merge_url_and_version({"id": "c", "name": "C"}, by_id, by_name)
+    assert "url" not in miss
+
+
+def test_iter_pdfs_walks_subfolders(tmp_path):
+    """_iter_pdfs finds PDFs recursively and ignores other files."""
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.pdf").write_bytes(b"")
+    (tmp_path / "sub" / "b.pdf").write_bytes(b"")
+    (tmp_path / "notes.txt").write_text("x", encoding="utf-8")
+    assert sorted(bds._iter_pdfs(tmp_path)) == sorted(tmp_path.rglob("*.pdf"))
+    assert list(bds._iter_pdfs(tmp_path / "missing")) == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Safety Reports Series No. 7",
+        "IAEA-TECDOC-1234 ... Safety Reports Series No. 5",
+        "see No. SSG-3 (Rev. 1) for guidance",
+        "Specific Safety Requirements SSR-2/1 (Rev. 1)",
+        "IAEA Safety 12 and SSG-46",
+        "no identifiers here at all",
+    ],
+)
+def test_fused_version_regex_keeps_pattern_priority(text):
+    """The single-scan search returns what the ordered per-pattern loop would."""
+    expected = next(
+        (m.group(0) for p in bds._IAEA_VERSION_PATTERNS if (m := p.search(text))),
+        None,
+    )
+    m = bds._search_iaea_version(text)
+    assert (m.group(0) if m else None) == expected
+
+
+def test_page0_text_is_capped(tmp_path):
+    """Only the top of the cover page is kept for the version/search-term regexes."""
+    reader = MagicMock(metadata=None)
+    reader.pages = [MagicMock()]
+    reader.pages[0].extract_text.return_value = "x" * 10_000
+    with patch.object(bds, "PdfReader", return_value=reader):
+        _metadata, text = bds._read_pdf_with_pypdf(tmp_path / "big.pdf")
+    assert len(text) == bds._PAGE0_TEXT_MAX_CHARS
+
+
+def test_registry_yaml_round_trip(tmp_path):
+    """write_document_sources_yaml output loads back through _load_existing_registry."""
+    sources = [{"id": "dk-a", "name": "Bekendtgørelse om røntgen", "url": None}]
+    out = tmp_path / "document_sources.yaml"
+    bds.write_document_sources_yaml(sources, out)
+    assert "Bekendtgørelse om røntgen" in out.read_text(encoding="utf-8")
+    with patch.object(bds, "REGISTRY_PATH", out):
+        assert bds._load_existing_registry() == sources
+
+
+def test_build_sources_merges_only_kept_ids(tmp_path):
+    """Duplicate Danish ids are dropped before the registry merge; IAEA merges on the suffixed id."""
+    bek = tmp_path / "Bekendtgørelse"
+    bek.mkdir()
+    (bek / "dk-a_version.txt").write_text("v1", encoding="utf-8")
+    iaea = [
+        {"id": "iaea-guide", "name": "Guide", "folder": "IAEA"},
+        {"id": "iaea-guide", "name": "Guide", "folder": "IAEA"},
+    ]
+    registry = [{"id": "iaea-guide-1", "url": "https://example.org/second"}]
+    with (
+        patch.object(bds, "DOCS_DIR", tmp_path),
+        patch.object(bds, "_load_existing_registry", return_value=registry),
+        patch.object(
+            bds, "_discover_danish_pdfs", return_value=[{"id": "dk-a", "name": "Dup"}]
+        ),
+        patch.object(bds, "_discover_iaea_pdfs", return_value=iaea),
+        patch.object(
+            bds, "_merge_url_and_version", wraps=bds._merge_url_and_version
+        ) as merge,
+    ):
+        sources = bds.build_sources(confirm_urls=False)
+    assert merge.call_count == 3
+    assert [(s["id"], s["url"]) for s in sources] == [
+        ("dk-a", None),
+        ("iaea-guide", None),
+        ("iaea-guide-1", "https://example.org/second"),
+    ]
+
+
+def test_search_terms_word_phrase_for_descriptive_titles(tmp_path):
+    """A long title adds its first words as an extra phrase; a short one does not."""
+    pdf = _write_pdf(
+        tmp_path / "titled.pdf",
+        {"/Title": "Radiation Protection of the Public and the Environment"},
+    )
+    assert "Radiation Protection the Public and" in bds._extract_iaea_search_terms(pdf)
+    short = _write_pdf(tmp_path / "short.pdf", {"/Title": "Rad Pro Act"})
+    assert bds._extract_iaea_search_terms(short) == ["Rad Pro Act"]
+
+
+def test_search_terms_stop_at_publication_id(tmp_path):
+    """An STI/PUB id ends term extraction; other term lists are capped."""
+    pdf = _write_pdf(
+        tmp_path / "pub.pdf",
+        {"/Title": "Occupational Radiation Protection", "/Subject": "STI/PUB/1785"},
+    )
+    assert bds._extract_iaea_search_terms(pdf) == ["STI/PUB/1785", "STI PUB 1785"]
+    many = _write_pdf(
+        tmp_path / "many.pdf",
+        {
+            "/Title": "Radiation Protection of the Public and the Environment",
+            "/Subject": "IAEA-TECDOC-1380 SSG-8 SSR-6 GSR-3 ISBN 92-0-123456-7",
+        },
+    )
+    assert len(bds._extract_iaea_search_terms(many)) == bds._MAX_IAEA_SEARCH_TERMS
+
+
+def test_confirm_danish_url_follows_newest_version():
+    """_confirm_danish_url swaps in the newest retsinformation URL and its label."""
+    source = {"id": "dk-a", "url": "https://www.retsinformation.dk/eli/lta/2019/669"}
+    newest = "https://www.retsinformation.dk/eli/lta/2024/100"
+    with (
+        patch.object(bds.document_updates, "_fetch_url", return_value="<html/>"),
+        patch.object(
+            bds.document_updates,
+            "_parse_retsinformation",
+            return_value=("BEK nr 100 af 01/01/2024", newest),
+        ),
+    ):
+        bds._confirm_danish_url(source)
+    assert source == {
+        "id": "dk-a",
+        "url": newest,
+        "version": "BEK nr 100 af 01/01/2024",
+    }
+
+
+def test_pdf_extract_cache_persists_between_runs(tmp_path):
+    """A rerun with unchanged PDFs reads them from documents/.pdf_extract_cache.json."""
+    (tmp_path / "IAEA").mkdir()
+    _write_pdf(tmp_path / "IAEA" / "guide.pdf", {"/Title": "Persisted Guide"})
+    with (
+        patch.object(bds, "DOCS_DIR", tmp_path),
+        patch.object(bds, "_load_existing_registry", return_value=[]),
+    ):
+        first = bds.build_sources(confirm_urls=False)
+        assert (tmp_path / ".pdf_extract_cache.json").exists()
+        bds._pdf_read_cache.clear()
+        bds._title_and_version_cached.cache_clear()
+        with patch.object(bds, "_read_pdf_uncached") as read:
+            second = bds.build_sources(confirm_urls=False)
+    read.assert_not_called()
+    assert second == first
+    assert first[0]["name"] == "Persisted Guide"
+
+
+def test_pdf_extract_cache_keeps_whole_corpus_and_checks_version(tmp_path):
+    """Every unchanged PDF is persisted; a different cache version is ignored."""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"doc-{i}.pdf"
+        path.write_bytes(b"%PDF")
+        paths.append(path)
+    bds._pdf_read_cache.clear()
+    with patch.object(bds, "DOCS_DIR", tmp_path):
+        for i, path in enumerate(paths):
+            key = bds._pdf_cache_key(path)
+            assert key is not None
+            bds._store_pdf_read(key, {"title": f"T{i}"}, "")
+        paths[2].unlink()
+        bds._save_pdf_extract_cache()
+        assert len(bds._pdf_read_cache) == 2
+        saved = json.loads((tmp_path / ".pdf_extract_cache.json").read_text())
+        assert saved["version"] == bds._pdf_extract_cache_version()
+        assert len(saved["pdfs"]) == 2
+
+        bds._pdf_read_cache.clear()
+        with patch.object(bds, "_PDF_EXTRACT_CACHE_FORMAT", -1):
+            bds._load_pdf_extract_cache()
+        assert not bds._pdf_read_cache
+        bds._load_pdf_extract_cache()
+        assert len(bds._pdf_read_cache) == 2
+    bds._pdf_read_cache.clear()
+
+
+def test_iaea_lookups_shared_between_sources(tmp_path):
+    """Sources yielding the same search terms trigger a single IAEA lookup per run."""
+    iaea = [
+        {"id": "iaea-a", "name": "Guide", "folder": "IAEA", "version": "SSG-8"},
+        {"id": "iaea-b", "name": "Guide", "folder": "IAEA_other", "version": "SSG-8"},
+    ]
+    with (
+        patch.object(bds, "DOCS_DIR", tmp_path),
+        patch.object(bds, "_load_existing_registry", return_value=[]),
+        patch.object(bds, "_discover_iaea_pdfs", return_value=iaea),
+        patch.object(
+            bds.document_updates,
+            "_lookup_iaea_publication_url_multi",
+            return_value="https://www.iaea.org/publications/1/guide",
+        ) as lookup,
+    ):
+        sources = bds.build_sources()
+    lookup.assert_called_once_with(["SSG-8", "Guide"])
+    assert {s["url"] for s in sources} == {"https://www.iaea.org/publications/1/guide"}
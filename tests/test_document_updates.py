@@ -1,12 +1,24 @@
 """Tests for document_updates module."""
 
 import json
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 import document_updates as du
 
 
+@pytest.fixture(autouse=True)
+def _isolated_http_cache(tmp_path, monkeypatch):
+    """Keep the persistent conditional-GET cache out of the project root; no pre-warming."""
+    monkeypatch.setattr(du, "HTTP_CACHE_PATH", tmp_path / "_http_cache.sqlite")
+    monkeypatch.setattr(du, "_warm_connections", lambda hosts=du.WARM_HOSTS: None)
+    monkeypatch.setattr(du, "_check_result_cache", {})
+
+
 def test_load_registry_from_example():
     """Registry loads from example YAML when document_sources.yaml is missing."""
     with patch.object(du, "REGISTRY_PATH", Path("/nonexistent")):
@@ -101,12 +113,9 @@ def test_lookup_iaea_publication_url_via_brave_returns_first_publication_url():
             },
         }
     ).encode("utf-8")
-    mock_resp = MagicMock()
-    mock_resp.read.return_value = body
-    mock_resp.__enter__ = MagicMock(return_value=mock_resp)
-    mock_resp.__exit__ = MagicMock(return_value=None)
+    mock_resp = MagicMock(status=200, data=body)
     with patch.dict("os.environ", {"BRAVE_SEARCH_API_KEY": "test-key"}):
-        with patch("document_updates.urllib.request.urlopen", return_value=mock_resp):
+        with patch.object(du._HTTP, "request", return_value=mock_resp):
             url = du._lookup_iaea_publication_url_via_brave("STI/PUB/1678")
     assert url == "https://www.iaea.org/publications/10677/risk-informed-approach"
 
@@ -146,12 +155,28 @@ def test_parse_retsinformation_fallback_by_nr():
     assert "1385" in url
 
 
+def test_parse_retsinformation_single_quotes_and_repeated_number():
+    """Single-quoted hrefs are normalised; a number reused across years joins on the issue year."""
+    html = """
+    <a href='/eli/lta/2019/670'>BEK nr 670 af 01/07/2019</a>
+    <a href='/eli/lta/2024/670'>BEK nr 670 af 02/02/2024</a>
+    """
+    label, url = du._parse_retsinformation(
+        html, "https://www.retsinformation.dk/eli/lta/2019/670"
+    )
+    assert label == "BEK nr 670 af 02/02/2024"
+    assert url == "https://www.retsinformation.dk/eli/lta/2024/670"
+
+
 def test_allowed_url():
     """Only allowlisted hosts are allowed."""
     assert du._allowed_url("https://www.retsinformation.dk/eli/lta/2019/670") is True
     assert du._allowed_url("https://www.iaea.org/publications/123") is True
     assert du._allowed_url("https://www.sst.dk/media/foo/bar.pdf") is True
     assert du._allowed_url("https://evil.com/foo") is False
+    assert du._allowed_url("http://retsinformation.dk/eli/lta/2019/670") is True
+    assert du._allowed_url("https://evil.dk/?q=retsinformation") is False
+    assert du._allowed_url("https://www.iaea.org@evil.com/foo") is False
 
 
 def test_is_sst_source():
@@ -405,6 +430,25 @@ def test_get_current_version_from_file_bekendtgoerelse(tmp_path):
     assert version == "BEK nr 1385 af 18/11/2025"
 
 
+def test_get_current_version_from_file_caches_missing_version(tmp_path):
+    """A source without a version file is looked up on disk once per run."""
+    du._reset_runtime_caches()
+    (tmp_path / "Bekendtgørelse").mkdir()
+    source = du.DocumentSource(
+        id="dk-none",
+        name="x",
+        url="",
+        folder="Bekendtgørelse",
+        filename_hint=None,
+    )
+    with patch.object(du, "DOCS_DIR", tmp_path):
+        assert du._get_current_version_from_file(source) is None
+        (tmp_path / "Bekendtgørelse" / "dk-none_version.txt").write_text("v2")
+        assert du._get_current_version_from_file(source) is None
+        du._reset_runtime_caches()
+        assert du._get_current_version_from_file(source) == "v2"
+
+
 def test_update_registry_url(tmp_path):
     """update_registry_url updates the source url in document_sources.yaml."""
     yaml_path = tmp_path / "document_sources.yaml"
@@ -451,3 +495,597 @@ sources:
         data = yaml.safe_load(f)
     versions = [s.get("version") for s in data["sources"] if s.get("id") == "dk-1"]
     assert versions == ["BEK nr 1385 af 18/11/2025"]
+
+
+def test_fetch_url_reuses_pooled_connection_and_caches():
+    """_fetch_url goes through the shared pool, releases the connection and caches the body."""
+    du._reset_runtime_caches()
+    resp = MagicMock(status=200, headers={"Content-Length": "5"})
+    resp.read.side_effect = [b"<html", b""]
+    url = "https://www.retsinformation.dk/eli/lta/2019/669"
+    with patch.object(du._HTTP, "request", return_value=resp) as request:
+        assert du._fetch_url(url) == "<html"
+        assert du._fetch_url(url) == "<html"
+    request.assert_called_once_with(
+        "GET", url, headers=du._HTTP.headers, preload_content=False
+    )
+    resp.release_conn.assert_called_once()
+
+
+def test_fetch_url_http_error_drains_connection():
+    """4xx/5xx responses raise ValueError after draining the body back to the pool."""
+    du._reset_runtime_caches()
+    resp = MagicMock(status=404, headers={})
+    url = "https://www.iaea.org/publications/0/missing"
+    with patch.object(du._HTTP, "request", return_value=resp):
+        with pytest.raises(ValueError, match="HTTP 404"):
+            du._fetch_url(url)
+    resp.drain_conn.assert_called_once()
+    resp.release_conn.assert_called_once()
+
+
+def test_probing_picks_newest_live_year():
+    """Year probes run together; the newest year answering the HEAD wins."""
+    current_year = du.date.today().year
+    live = {current_year - 2, current_year - 4}
+
+    def head_ok(url):
+        return int(url.split("/")[-2]) in live
+
+    with (
+        patch.object(du, "_head_ok", side_effect=head_ok),
+        patch.object(du, "_resolve_danish_url_to_newest", return_value=(None, None)),
+    ):
+        label, url = du._resolve_danish_url_by_probing(669)
+    assert url == f"https://www.retsinformation.dk/eli/lta/{current_year - 2}/669"
+    assert label == f"BEK nr 669 (probing {current_year - 2})"
+
+
+def test_resolve_danish_sources_concurrently_in_order():
+    """ELI resolution overlaps across sources and results keep registry order."""
+    sources = [
+        du.DocumentSource(
+            id=f"dk-{nr}",
+            name=f"BEK {nr}",
+            url=f"https://www.retsinformation.dk/eli/lta/2019/{nr}",
+            folder="Bekendtgørelse",
+            filename_hint=None,
+        )
+        for nr in (670, 671)
+    ]
+    barrier = threading.Barrier(2, timeout=5)
+
+    def resolve(source, **kwargs):
+        barrier.wait()
+        return du.ResolvedUrl(source.id, source.url), None
+
+    with patch.object(du, "_resolve_danish_source_via_eli", side_effect=resolve):
+        results = du._resolve_danish_sources_via_eli(
+            sources, {"dk-670": {"version": "v"}}
+        )
+    assert [r.label for r, _evidence in results] == ["dk-670", "dk-671"]
+
+
+def test_brave_throttle_reserves_slots_and_sleeps_outside_lock(monkeypatch):
+    """Back-to-back Brave calls get staggered slots; sleeping never holds the lock."""
+    monkeypatch.setattr(du, "_brave_tokens", du.BRAVE_BURST)
+    monkeypatch.setattr(du, "_brave_tokens_at", 1000.0)
+    sleeps: list[float] = []
+
+    def fake_sleep(seconds):
+        assert not du._brave_throttle_lock.locked()
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(du.time, "monotonic", lambda: 1000.0)
+    monkeypatch.setattr(du.time, "sleep", fake_sleep)
+    for _ in range(3):
+        du._brave_throttle()
+    delay = du.BRAVE_REQUEST_DELAY_SECONDS
+    assert sleeps == [pytest.approx(delay), pytest.approx(2 * delay)]
+
+
+def test_load_registry_raw_reparses_only_when_file_changes(tmp_path):
+    """Unchanged registry reuses the cached parse; edits are picked up; results are copies."""
+    registry = tmp_path / "document_sources.yaml"
+    registry.write_text(
+        "sources:\n  - id: a\n    name: A\n    url: null\n", encoding="utf-8"
+    )
+    with (
+        patch.object(du, "REGISTRY_PATH", registry),
+        patch.object(du.yaml, "load", wraps=du.yaml.load) as safe_load,
+    ):
+        first = du.load_registry_raw()
+        first[0]["name"] = "mutated"
+        assert du.load_registry_raw()[0]["name"] == "A"
+        assert safe_load.call_count == 1
+        registry.write_text(
+            "sources:\n  - id: a\n    name: A\n  - id: b\n    name: B\n",
+            encoding="utf-8",
+        )
+        assert [s["id"] for s in du.load_registry_raw()] == ["a", "b"]
+        assert safe_load.call_count == 2
+
+
+def test_save_versions_invalidates_cached_versions(tmp_path):
+    """_load_versions sees what _save_versions just wrote, even within one mtime tick."""
+    with patch.object(du, "VERSIONS_PATH", tmp_path / "versions.json"):
+        assert du._load_versions() == {}
+        du._save_versions({"a": {"version": "1"}})
+        versions = du._load_versions()
+        versions["a"]["version"] = "changed"
+        assert du._load_versions() == {"a": {"version": "1"}}
+
+
+def test_fetch_url_revalidates_with_etag_and_reuses_body_on_304():
+    """A later run sends the stored validators; 304 returns the stored body without reading."""
+    url = "https://www.retsinformation.dk/eli/lta/2019/669"
+    fresh = MagicMock(
+        status=200, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"}
+    )
+    fresh.read.side_effect = [b"<html>v1", b""]
+    not_modified = MagicMock(status=304, headers={})
+    du._reset_runtime_caches()
+    with patch.object(du._HTTP, "request", return_value=fresh):
+        assert du._fetch_url(url) == "<html>v1"
+    du._reset_runtime_caches()
+    with patch.object(du._HTTP, "request", return_value=not_modified) as request:
+        assert du._fetch_url(url) == "<html>v1"
+    headers = request.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024"
+    assert headers["User-Agent"] == du.USER_AGENT
+    not_modified.read.assert_not_called()
+    not_modified.release_conn.assert_called_once()
+
+
+def test_http_cache_evicts_rows_idle_past_max_age(monkeypatch):
+    """Storing a response drops rows not stored or revalidated within the max age."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(du.time, "time", lambda: now[0])
+    du._http_cache_put("https://www.iaea.org/old", '"a"', None, "old")
+    du._http_cache_put("https://www.iaea.org/kept", '"b"', None, "kept")
+    now[0] += du.HTTP_CACHE_MAX_AGE_SEC - 10
+    du._http_cache_touch("https://www.iaea.org/kept")
+    now[0] += 20
+    du._http_cache_put("https://www.iaea.org/new", '"c"', None, "new")
+    assert du._http_cache_get("https://www.iaea.org/old") is None
+    assert du._http_cache_get("https://www.iaea.org/kept") == ('"b"', None, "kept")
+    assert du._http_cache_get("https://www.iaea.org/new") == ('"c"', None, "new")
+
+
+def test_fetch_url_aborts_oversized_body_while_streaming(monkeypatch):
+    """Without Content-Length the body is read in chunks and cut off past MAX_BODY_SIZE."""
+    du._reset_runtime_caches()
+    monkeypatch.setattr(du, "MAX_BODY_SIZE", 10)
+    resp = MagicMock(status=200, headers={})
+    resp.read.side_effect = [b"123456", b"789012", b"never read"]
+    url = "https://www.iaea.org/publications/1/big"
+    with patch.object(du._HTTP, "request", return_value=resp):
+        with pytest.raises(ValueError, match="too large"):
+            du._fetch_url(url)
+    assert resp.read.call_count == 2
+    resp.read.assert_called_with(du.READ_CHUNK_SIZE)
+    resp.close.assert_called_once()
+
+
+def test_resolve_danish_url_via_brave_title_rules():
+    """Historisk results are skipped; variant decree names match, transport ones do not."""
+    results = [
+        {
+            "url": "https://www.retsinformation.dk/eli/lta/2024/900",
+            "title": "Historisk: Bekendtgørelse om radioaktive stoffer",
+        },
+        {
+            "url": "https://www.retsinformation.dk/eli/lta/2023/800",
+            "title": "Bekendtgørelse om transport af radioaktive stoffer",
+        },
+        {
+            "url": "https://www.retsinformation.dk/eli/lta/2019/670",
+            "title": "Bekendtgørelse om brug af radioaktive stoffer",
+        },
+    ]
+    with patch.object(du, "_brave_search", return_value=results):
+        url = du._resolve_danish_url_via_brave("Bekendtgørelse om radioaktive stoffer")
+    assert url == "https://www.retsinformation.dk/eli/lta/2019/670"
+
+
+def test_resolve_danish_source_memoised_per_run():
+    """A second resolve of the same source reuses the result until the run caches reset."""
+    du._reset_runtime_caches()
+    source = du.DocumentSource(
+        id="dk-670",
+        name="Bekendtgørelse om radioaktive stoffer",
+        url="https://www.retsinformation.dk/eli/lta/2019/670",
+        folder="Bekendtgørelse",
+        filename_hint=None,
+    )
+    found = ("BEK nr 670", "https://www.retsinformation.dk/eli/lta/2024/670")
+    with patch.object(
+        du, "_resolve_danish_url_by_search", return_value=found
+    ) as search:
+        first = du._resolve_danish_source(source)
+        assert du._resolve_danish_source(source) is first
+        du._resolve_danish_source(source, current_version="BEK nr 670 af 1/1/2019")
+        assert search.call_count == 2
+        du._reset_runtime_caches()
+        du._resolve_danish_source(source)
+        assert search.call_count == 3
+    assert first == du.ResolvedUrl(*found)
+
+
+def test_lookup_iaea_multi_overlaps_searches_and_keeps_query_order():
+    """Searches run together; an earlier query's hit wins over a faster later one."""
+    barrier = threading.Barrier(2, timeout=5)
+    stops: list[threading.Event] = []
+
+    def lookup(query, *, stop=None):
+        stops.append(stop)
+        barrier.wait()
+        return f"https://www.iaea.org/publications/{query}"
+
+    with patch.object(du, "_lookup_iaea_publication_url", side_effect=lookup):
+        url = du._lookup_iaea_publication_url_multi(["1", "", "2"])
+    assert url == "https://www.iaea.org/publications/1"
+    assert all(stop.is_set() for stop in stops)
+
+
+def test_iaea_throttle_does_not_reserve_slots_once_stopped(monkeypatch):
+    """Cancelled lookups neither wait out nor take a throttle slot."""
+    monkeypatch.setattr(du, "IAEA_SEARCH_DELAY_SEC", 5.0)
+    last = time.monotonic()
+    monkeypatch.setattr(du, "_LAST_IAEA_SEARCH", last)
+    stop = threading.Event()
+    stop.set()
+    assert du._iaea_search_throttle(stop) is False
+    assert du._lookup_iaea_publication_url("SSG-20", stop=stop) is None
+    stop.clear()
+    threading.Timer(0.05, stop.set).start()
+    started = time.monotonic()
+    assert du._iaea_search_throttle(stop) is False
+    assert time.monotonic() - started < 2
+    assert du._LAST_IAEA_SEARCH == last
+
+
+def test_head_ok_follows_redirects_and_requires_2xx():
+    """A redirect that ends in 404 (or an unfollowed 3xx) does not count as live."""
+    with patch.object(du._HTTP, "request") as request:
+        request.return_value = MagicMock(status=404)
+        assert du._head_ok("https://www.retsinformation.dk/eli/lta/2024/1") is False
+        assert "redirect" not in request.call_args.kwargs
+        request.return_value = MagicMock(status=301)
+        assert du._head_ok("https://www.retsinformation.dk/eli/lta/2024/1") is False
+        request.return_value = MagicMock(status=200)
+        assert du._head_ok("https://www.retsinformation.dk/eli/lta/2024/1") is True
+
+
+def test_brave_debug_log_writes_through_one_handle(tmp_path, monkeypatch):
+    """Debug lines share one buffered handle; nothing is written when disabled."""
+    monkeypatch.setattr(du, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(du, "_BRAVE_DEBUG_ENABLED", False)
+    du._brave_debug_log("off")
+    assert not (tmp_path / "brave_search_debug.log").exists()
+    monkeypatch.setattr(du, "_BRAVE_DEBUG_ENABLED", True)
+    monkeypatch.setattr(du, "_brave_log_fh", None)
+    du._brave_debug_log("first", n=1)
+    handle = du._brave_log_fh
+    du._brave_debug_log("second", n=2)
+    assert du._brave_log_fh is handle
+    handle.close()
+    lines = (tmp_path / "brave_search_debug.log").read_text().splitlines()
+    assert [json.loads(line)["msg"] for line in lines] == ["first", "second"]
+
+
+def test_extract_bek_number_reads_version_file_only_when_needed():
+    """Registry version numbers win without touching disk; names prefer 'nr N' over 'bek-N'."""
+    source = du.DocumentSource(
+        id="bek-1",
+        name="Bekendtgørelse nr 670",
+        url="",
+        folder="Bekendtgørelse",
+        filename_hint=None,
+        version="BEK nr 1385 af 18/11/2025",
+    )
+    with patch.object(du, "_get_current_version_from_file") as from_file:
+        assert du._extract_bek_number(source) == 1385
+        from_file.assert_not_called()
+        from_file.return_value = None
+        source.version = None
+        assert du._extract_bek_number(source) == 670
+        from_file.assert_called_once_with(source)
+
+
+def test_danish_to_ascii_search_folds_letters_and_memoises():
+    """Danish letters fold to ASCII in one translate pass; repeated titles hit the cache."""
+    du._danish_to_ascii_search.cache_clear()
+    assert du._danish_to_ascii_search("  Åbne kilder, Ærø og Øst ") == (
+        "Abne kilder, Aero og Ost"
+    )
+    du._danish_to_ascii_search("  Åbne kilder, Ærø og Øst ")
+    assert du._danish_to_ascii_search.cache_info().hits == 1
+    assert du._danish_to_ascii_search("") == ""
+
+
+def test_brave_search_requests_web_only_and_trims_results():
+    """Only web results are requested; cached results keep just url/title, at most count."""
+    du._reset_runtime_caches()
+    body = json.dumps(
+        {
+            "web": {
+                "results": [
+                    {"url": f"https://example.org/{i}", "title": f"T{i}", "extra": {}}
+                    for i in range(3)
+                ]
+            }
+        }
+    ).encode("utf-8")
+    with (
+        patch.dict("os.environ", {"BRAVE_SEARCH_API_KEY": "test-key"}),
+        patch.object(du, "_brave_throttle"),
+        patch.object(
+            du._HTTP, "request", return_value=MagicMock(status=200, data=body)
+        ) as request,
+    ):
+        results = du._brave_search("radioaktive stoffer", count=2)
+    assert "result_filter=web" in request.call_args.args[1]
+    assert results == [
+        {"url": "https://example.org/0", "title": "T0"},
+        {"url": "https://example.org/1", "title": "T1"},
+    ]
+
+
+def test_warm_connections_heads_each_host_and_ignores_failures(monkeypatch):
+    """Pre-warming HEADs every host once and never raises; pooled sockets use keepalive."""
+    monkeypatch.undo()  # drop the autouse no-op
+    with patch.object(
+        du._HTTP, "request", side_effect=[None, du.urllib3.exceptions.HTTPError()]
+    ) as request:
+        du._warm_connections(("www.retsinformation.dk", "www.iaea.org"))
+    hosts = sorted(call.args[1] for call in request.call_args_list)
+    assert hosts == ["https://www.iaea.org/", "https://www.retsinformation.dk/"]
+    assert (du.socket.SOL_SOCKET, du.socket.SO_KEEPALIVE, 1) in du._SOCKET_OPTIONS
+
+
+def test_get_local_pdf_path_scans_nested_folders(tmp_path):
+    """PDFs in subfolders are found; the first path in sorted order wins for a hint."""
+    folder = tmp_path / "IAEA"
+    (folder / "b").mkdir(parents=True)
+    (folder / "a").mkdir()
+    (folder / "b" / "SSG-20.pdf").write_bytes(b"%PDF")
+    (folder / "a" / "SSG-20 Rev 1.pdf").write_bytes(b"%PDF")
+    (folder / "notes.txt").write_text("x")
+    source = du.DocumentSource(
+        id="iaea-ssg-20",
+        name="SSG-20",
+        url="",
+        folder="IAEA",
+        filename_hint="SSG-20",
+    )
+    with patch.object(du, "DOCS_DIR", tmp_path):
+        assert du.get_local_pdf_path(source) == folder / "a" / "SSG-20 Rev 1.pdf"
+        (folder / "a" / "SSG-20 Rev 1.pdf").unlink()
+        source.filename_hint = None
+        assert du.get_local_pdf_path(source) == folder / "b" / "SSG-20.pdf"
+
+
+def test_list_files_reuses_listing_until_a_folder_changes(tmp_path):
+    """The walk is repeated only when some directory in the tree changed."""
+    du._reset_runtime_caches()
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.pdf").write_bytes(b"%PDF")
+    with patch.object(du.os, "scandir", wraps=du.os.scandir) as scandir:
+        assert [n for n, _p in du._list_files(tmp_path)] == ["a.pdf"]
+        du._list_files(tmp_path)
+        assert scandir.call_count == 2  # root + sub, once
+        (tmp_path / "sub" / "b.pdf").write_bytes(b"%PDF")
+        names = sorted(n for n, _p in du._list_files(tmp_path))
+    assert names == ["a.pdf", "b.pdf"]
+    assert scandir.call_count == 4
+
+
+def test_current_version_from_file_read_once_under_concurrency():
+    """Threads asking for the same source share one disk lookup."""
+    du._reset_runtime_caches()
+    source = du.DocumentSource(
+        id="dk-radio", name="x", url="", folder="Bekendtgørelse", filename_hint=None
+    )
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_read(_source):
+        started.set()
+        release.wait(5)
+        return "BEK nr 1385 af 18/11/2025"
+
+    with patch.object(
+        du, "_read_current_version_from_file", side_effect=slow_read
+    ) as read:
+        results: list[str | None] = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(du._get_current_version_from_file(source))
+            )
+            for _ in range(4)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for t in threads[1:]:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join(5)
+    assert read.call_count == 1
+    assert results == ["BEK nr 1385 af 18/11/2025"] * 4
+
+
+def test_check_updates_spreads_hosts_and_keeps_registry_order(monkeypatch):
+    """Checks are dispatched round-robin over hosts; results come back in registry order."""
+    urls = [
+        "https://www.retsinformation.dk/eli/lta/2019/670",
+        "https://www.retsinformation.dk/eli/lta/2019/671",
+        "https://www.iaea.org/publications/1/a",
+        "",
+    ]
+    registry = [
+        du.DocumentSource(
+            id=f"s{i}", name=f"s{i}", url=u, folder="IAEA", filename_hint=None
+        )
+        for i, u in enumerate(urls)
+    ]
+    order, _hosts = du._hosts_round_robin(registry)
+    assert order == [0, 2, 3, 1]
+    monkeypatch.setattr(du, "_load_registry", lambda: registry)
+    monkeypatch.setattr(du, "_load_versions", dict)
+    monkeypatch.setattr(
+        du, "check_one_source", lambda source, versions, **kw: {"id": source.id}
+    )
+    results = du.check_updates()
+    assert [r["id"] for r in results] == ["s0", "s1", "s2", "s3"]
+    assert not any(r.get("error") for r in results)
+
+
+def test_check_updates_reuses_results_for_unchanged_sources(monkeypatch, tmp_path):
+    """Within the TTL an unchanged source is not re-checked; a version change forces it."""
+    registry = [
+        du.DocumentSource(
+            id="a",
+            name="A",
+            url="https://www.iaea.org/a",
+            folder="IAEA",
+            filename_hint=None,
+        ),
+        du.DocumentSource(
+            id="b",
+            name="B",
+            url="https://www.iaea.org/b",
+            folder="IAEA",
+            filename_hint=None,
+        ),
+    ]
+    versions: dict[str, dict[str, str]] = {}
+    calls: list[str] = []
+
+    def fake_check(source, versions, **kw):
+        calls.append(source.id)
+        if source.id == "b":
+            return {"id": "b", "error": "timeout"}
+        return {"id": source.id, "error": None}
+
+    monkeypatch.setattr(du, "DOCS_DIR", tmp_path)
+    monkeypatch.setattr(du, "_load_registry", lambda: registry)
+    monkeypatch.setattr(du, "_load_versions", lambda: versions)
+    monkeypatch.setattr(du, "check_one_source", fake_check)
+    du.check_updates()
+    du.check_updates()
+    assert sorted(calls) == ["a", "b", "b"]
+    versions["a"] = {"version": "2"}
+    du.check_updates()
+    assert calls.count("a") == 2
+    monkeypatch.setattr(du, "CHECK_RESULT_TTL_SECONDS", 0)
+    du.check_updates()
+    assert calls.count("a") == 3
+
+
+def test_check_updates_warms_connections_only_on_cache_miss(monkeypatch, tmp_path):
+    """A run answered entirely from the TTL cache opens no connections."""
+    registry = [
+        du.DocumentSource(
+            id="a",
+            name="A",
+            url="https://www.iaea.org/a",
+            folder="IAEA",
+            filename_hint=None,
+        )
+    ]
+    warmed: list[tuple[str, ...]] = []
+    monkeypatch.setattr(du, "DOCS_DIR", tmp_path)
+    monkeypatch.setattr(du, "_load_registry", lambda: registry)
+    monkeypatch.setattr(du, "_load_versions", lambda: {})
+    monkeypatch.setattr(
+        du, "check_one_source", lambda source, versions, **kw: {"id": source.id}
+    )
+    monkeypatch.setattr(du, "_warm_connections", lambda hosts: warmed.append(hosts))
+    du.check_updates()
+    assert len(warmed) == 1
+    assert du.check_updates() == [{"id": "a"}]
+    assert len(warmed) == 1
+
+
+def test_check_ttl_env_falls_back_on_invalid_values(monkeypatch):
+    """A malformed DOCUMENT_CHECK_TTL_SECONDS keeps the default instead of failing."""
+    monkeypatch.setenv("DOCUMENT_CHECK_TTL_SECONDS", "1h")
+    assert du._parse_ttl_sec("DOCUMENT_CHECK_TTL_SECONDS", 3600.0) == 3600.0
+    monkeypatch.setenv("DOCUMENT_CHECK_TTL_SECONDS", "0")
+    assert du._parse_ttl_sec("DOCUMENT_CHECK_TTL_SECONDS", 3600.0) == 0.0
+
+
+def test_check_one_source_generic_uses_conditional_validators():
+    """Generic URLs: first check records validators, 304 means no update, changes flag one."""
+    du._reset_runtime_caches()
+    source = du.DocumentSource(
+        id="pdf-1",
+        name="Direct PDF",
+        url="https://www.sst.dk/media/doc.pdf",
+        folder="IAEA",
+        filename_hint=None,
+        version="v1",
+    )
+    lm = "Mon, 01 Jan 2024 00:00:00 GMT"
+    first = MagicMock(status=200, headers={"ETag": '"a"', "Last-Modified": lm})
+    baselines: dict[str, dict[str, str]] = {}
+    with patch.object(du._HTTP, "request", return_value=first):
+        result = du.check_one_source(source, {}, baselines=baselines)
+    assert result["update_available"] is False
+    assert baselines == {"pdf-1": {"etag": '"a"', "last_modified": lm}}
+
+    versions = {"pdf-1": {"version": "v1", **baselines["pdf-1"]}}
+    with patch.object(
+        du._HTTP, "request", return_value=MagicMock(status=304, headers={})
+    ) as request:
+        result = du.check_one_source(source, versions)
+    assert result["update_available"] is False
+    assert result["remote_version"] == lm
+    sent = request.call_args.kwargs["headers"]
+    assert sent["If-None-Match"] == '"a"' and sent["If-Modified-Since"] == lm
+
+    changed = MagicMock(status=200, headers={"ETag": '"b"', "Last-Modified": lm})
+    with patch.object(du._HTTP, "request", return_value=changed):
+        assert du.check_one_source(source, versions)["update_available"] is True
+
+
+def test_page_parsers_memoised_per_run_for_real_pages():
+    """Parsing the same sizeable page twice reuses the result; tiny pages skip the cache."""
+    du._reset_runtime_caches()
+    html = (
+        "<p>Superseded by: "
+        '<a href="/publications/14812/ssg-20-rev-1">SSG-20 (Rev. 1)</a></p>'
+        + " " * du._PARSE_CACHE_MIN_CHARS
+    )
+    first = du._parse_iaea_superseded(html)
+    assert first == (
+        "SSG-20 (Rev. 1)",
+        "https://www.iaea.org/publications/14812/ssg-20-rev-1",
+    )
+    assert du._parse_iaea_superseded(html) is first
+    du._parse_iaea_superseded("<p>short</p>")
+    assert len(du._parse_cache) == 1
+    du._reset_runtime_caches()
+    assert not du._parse_cache
+
+
+def test_registry_writes_reuse_the_cached_parse(tmp_path):
+    """Field updates and appends parse the file once; the written data becomes the cache."""
+    registry = tmp_path / "document_sources.yaml"
+    registry.write_text(
+        "sources:\n  - id: a\n    name: A\n    url: null\n", encoding="utf-8"
+    )
+    with (
+        patch.object(du, "REGISTRY_PATH", registry),
+        patch.object(du.yaml, "load", wraps=du.yaml.load) as load,
+    ):
+        du.update_registry_version("a", "v2")
+        du.append_source_to_registry("a", "Another A")
+        raw = du.load_registry_raw()
+    assert load.call_count == 1
+    assert [(s["id"], s.get("version")) for s in raw] == [("a", "v2"), ("a-1", None)]
+    on_disk = du.yaml.safe_load(registry.read_text(encoding="utf-8"))
+    assert [s["id"] for s in on_disk["sources"]] == ["a", "a-1"]
@@ -141,6 +141,27 @@ def test_compute_all_metrics_returns_four_scores(sample_docs):
             assert all(0 <= v <= 1 for v in out.values())
 
 
+def test_compute_all_metrics_calls_each_grader_once(sample_docs):
+    """Metrics sharing a grader verdict reuse one LLM call instead of repeating it."""
+    with patch("eval.metrics.get_generation_grader") as gm:
+        with patch("eval.metrics.get_context_sufficiency_grader") as sm:
+            gen_grader = MagicMock()
+            gen_grader.invoke.return_value = _mock_grade_gen(passed=True)
+            gm.return_value = gen_grader
+            suff_grader = MagicMock()
+            suff_grader.invoke.return_value = _mock_grade_suff(False)
+            sm.return_value = suff_grader
+            out = compute_all_metrics("Q?", "Answer.", sample_docs, llm=MagicMock())
+    assert gen_grader.invoke.call_count == 1
+    assert suff_grader.invoke.call_count == 1
+    assert out == {
+        "faithfulness": 1.0,
+        "answer_relevance": 1.0,
+        "context_precision": 0.0,
+        "context_recall": 0.0,
+    }
+
+
 def test_context_precision_per_chunk_returns_mean_precision_at_k(sample_docs):
     """Per-chunk precision: mock LLM returns 1,0,1 for 3 chunks -> precision@1=1, @3=2/3, mean=(1+2/3)/2."""
     from langchain_core.messages import AIMessage
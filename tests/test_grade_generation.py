@@ -28,6 +28,31 @@ def test_grade_generation_passed_false_carries_missing_info():
     assert score.missing_info == "dose limits table Annex 2 GSR-3"
 
 
+def test_get_generation_grader_reuses_structured_chain_per_model():
+    """The structured-output wrapper is built once per LLM instance."""
+    from graph.chains.generation_grader import get_generation_grader
+
+    llm = MagicMock()
+    first = get_generation_grader(llm)
+    assert get_generation_grader(llm) is first
+    llm.with_structured_output.assert_called_once_with(GradeGeneration)
+    assert get_generation_grader(MagicMock()) is not first
+
+
+def test_structured_chain_cache_is_bounded(monkeypatch):
+    """Old models are evicted so the cache does not keep every model (and key) alive."""
+    import graph.chains.structured as structured
+    from graph.chains.generation_grader import get_generation_grader
+
+    monkeypatch.setattr(structured, "_CHAINS_MAX_ENTRIES", 2)
+    monkeypatch.setattr(structured, "_chains", structured.OrderedDict())
+    models = [MagicMock() for _ in range(3)]
+    for llm in models:
+        get_generation_grader(llm)
+    assert len(structured._chains) == 2
+    assert all(entry[0] is not models[0] for entry in structured._chains.values())
+
+
 def test_grade_generation_missing_info_defaults_to_empty():
     """missing_info has a default of empty string so callers need not supply it."""
     score = GradeGeneration(passed=True)
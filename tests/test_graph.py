@@ -256,3 +256,40 @@ def test_generation_retry_route_matrix(enabled, attempted, retry_count, expected
         )
         == expected
     )
+
+
+def test_truncate_docs_for_grader_skips_empty_docs_and_caps_total():
+    """Empty docs are skipped; each doc and the joined context are capped."""
+    from graph.chains.truncate import truncate_docs_for_grader
+
+    docs = [
+        Document(page_content=""),
+        Document(page_content="a" * 50),
+        Document(page_content="b" * 50),
+    ]
+    assert truncate_docs_for_grader(docs, max_chars_per_doc=10) == (
+        "a" * 10 + "\n\n" + "b" * 10
+    )
+    capped = truncate_docs_for_grader(docs, max_chars_per_doc=50, max_context_chars=80)
+    assert capped == "a" * 50 + "\n\n" + "b" * 8 + "..."
+
+
+def test_invoke_grader_cached_reuses_verdict_for_identical_inputs():
+    """Identical grader inputs within a run hit the LLM (and throttle) once."""
+    from unittest.mock import MagicMock
+
+    from graph.utils import invoke_grader_cached
+
+    grader = MagicMock()
+    grader.invoke.side_effect = lambda inputs, config=None: inputs["generation"]
+    cache: dict = {}
+    inputs = {"documents": "dose limits", "generation": "20 mSv"}
+    with patch("graph.utils.throttle_llm_if_needed") as throttle:
+        assert invoke_grader_cached(cache, "g", grader, dict(inputs)) == "20 mSv"
+        assert invoke_grader_cached(cache, "g", grader, dict(inputs)) == "20 mSv"
+        other = {**inputs, "generation": "50 mSv"}
+        assert invoke_grader_cached(cache, "g", grader, other) == "50 mSv"
+        invoke_grader_cached(cache, "other", grader, dict(inputs))
+
+    assert grader.invoke.call_count == 3
+    assert throttle.call_count == 3
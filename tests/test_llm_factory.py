@@ -4,7 +4,13 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from graph.llm_factory import APIKeyError, get_embedding_provider, get_llm
+from graph.llm_factory import (
+    APIKeyError,
+    clear_llm_cache,
+    get_cached_llm,
+    get_embedding_provider,
+    get_llm,
+)
 
 
 def test_get_llm_returns_gemini_by_default(monkeypatch):
@@ -82,3 +88,26 @@ def test_get_embeddings_returns_gemini_by_default(monkeypatch):
     assert (
         cls.__name__ == "GoogleGenerativeAIEmbeddings"
     ), f"expected GoogleGenerativeAIEmbeddings, got {cls.__name__}"
+
+
+def test_get_cached_llm_reuses_instance_per_provider_variant_and_key(monkeypatch):
+    """Cached factory returns the same client for identical settings only."""
+    monkeypatch.setattr(
+        "graph.llm_factory.get_llm", lambda **kwargs: MagicMock(**kwargs)
+    )
+    clear_llm_cache()
+    first = get_cached_llm(provider="openai", api_key="key-a", model_variant="gpt-4o")
+    assert (
+        get_cached_llm(provider="openai", api_key="key-a", model_variant="gpt-4o")
+        is first
+    )
+    assert (
+        get_cached_llm(provider="openai", api_key="key-b", model_variant="gpt-4o")
+        is not first
+    )
+    assert get_cached_llm(provider="openai", api_key="key-a") is not first
+    clear_llm_cache()
+    assert (
+        get_cached_llm(provider="openai", api_key="key-a", model_variant="gpt-4o")
+        is not first
+    )
@@ -89,7 +89,7 @@ def _patch_retrieve_missing_deps(missing_query: str = "query"):
             ),
         ),
         patch("graph.nodes.retrieve_missing.throttle_llm_if_needed"),
-        patch("graph.nodes.retrieve_missing.get_llm", return_value=MagicMock()),
+        patch("graph.nodes.retrieve_missing.get_cached_llm", return_value=MagicMock()),
     ]
 
 